@@ -4,4 +4,12 @@ from .user import User
 from .workfile import Workfile
 from .workspace import Workspace
 from .datasource import DataSource
+from .workflowgraph import WorkflowGraph
+from .flowresult import FlowResult
 from .exception import *
+
+try:
+    from .asyncclient import AsyncAPIClient
+except (ImportError, SyntaxError):
+    # aiohttp is not installed, or Python is too old for asyncio.
+    pass
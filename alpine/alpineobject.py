@@ -1,10 +1,12 @@
 from __future__ import unicode_literals
 from __future__ import absolute_import
 
+import copy
 import json
 import logging
 import logging.config
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 
 class AlpineObject(object):
@@ -18,6 +20,12 @@ class AlpineObject(object):
     _alpine_api_version = "v1"
     _min_alpine_version = "6.2"
 
+    #
+    # per-request headers, the session headers are never changed so that a client can be shared by threads
+    #
+    _json_headers = {"Content-Type": "application/json"}
+    _form_headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
     def __init__(self, base_url=None, session=None, token=None):
         self.base_url = base_url
         self.session = session
@@ -38,6 +46,191 @@ class AlpineObject(object):
         """
         return str("{0}?session_id={1}".format(url, self.token))
 
+    def _get_cached(self, key):
+        """
+        Used internally by the read-only `get` methods to look up a response in the session's response cache.
+
+        :param tuple key: Entity type followed by the values identifying the entity.
+        :return: A copy of the cached response, or None if caching is off or the response isn't cached.
+        """
+        response_cache = getattr(self.session, "response_cache", None)
+        if response_cache is None:
+            return None
+        value = response_cache.get(key)
+        if value is not None:
+            self.logger.debug("Using cached response for {0}".format(key))
+            value = copy.deepcopy(value)
+        return value
+
+    def _set_cached(self, key, value):
+        """
+        Used internally by the read-only `get` methods to store a response in the session's response cache.
+        A copy is stored so that callers are free to modify the returned value.
+
+        :param tuple key: Entity type followed by the values identifying the entity.
+        :param value: Response to store.
+        :return: The response.
+        """
+        response_cache = getattr(self.session, "response_cache", None)
+        if response_cache is not None:
+            response_cache.set(key, copy.deepcopy(value))
+        return value
+
+    def _invalidate_cached(self, *prefixes):
+        """
+        Used internally by the methods that change records, to evict the cached responses and list pages they
+        make stale.
+
+        :param prefixes: Key prefixes (tuples) of the entries to evict, e.g. ("workspace", "1672") for one
+                         workspace or ("workfile", "list", "1672") for the workfile list pages of a workspace.
+        :return: None
+        """
+        response_cache = getattr(self.session, "response_cache", None)
+        if response_cache is not None:
+            for prefix in prefixes:
+                response_cache.invalidate(*prefix)
+
+    def _find_id(self, index_key, name, iter_records, get_records, name_field="name"):
+        """
+        Used internally by the `get_id` methods to find the ID of a named record in a listing. When the session
+        keeps a name-to-ID index, the whole listing is indexed once and later lookups don't touch the network.
+        A name missing from a cached index triggers one rebuild, since it may have been created by someone else.
+
+        :param tuple index_key: Entity type and scope of the listing, e.g. ("workfile", "1672").
+        :param str name: Name to look up.
+        :param iter_records: Callable returning a generator over the listing, used without an index.
+        :param get_records: Callable returning the whole listing, used to build the index.
+        :param str name_field: Record field holding the name.
+        :return: ID of the first record with that name, or None if there is none.
+        """
+        id_index = getattr(self.session, "id_index", None)
+        if id_index is None:
+            for record in iter_records():
+                if record[name_field] == name:
+                    return record['id']
+            return None
+
+        index = id_index.get(index_key)
+        if index is None or name not in index:
+            self.logger.debug("Building the name-to-ID index for {0}".format(index_key))
+            index = {}
+            for record in get_records():
+                index.setdefault(record[name_field], record['id'])
+            id_index.set(index_key, index)
+        return index.get(name)
+
+    def _invalidate_id_index(self, *prefix):
+        """
+        Used internally by the methods that create, delete or rename records, to drop the name-to-ID indexes
+        they make stale.
+
+        :param prefix: Entity type, optionally followed by scope, of the indexes to drop.
+        :return: None
+        """
+        id_index = getattr(self.session, "id_index", None)
+        if id_index is not None:
+            id_index.invalidate(*prefix)
+
+    def _get_page(self, url, payload, page, use_params=True, cache_key=None):
+        """
+        Used internally to fetch a single page of a paginated list.
+
+        :param str url: An Alpine API URL, including the session token.
+        :param dict payload: Query values shared by every page.
+        :param int page: Page number to fetch, starting at 1.
+        :param bool use_params: Send the payload as URL parameters, else as a JSON body.
+        :param tuple cache_key: Entity type, "list" and scope of the listing, e.g. ("workfile", "list", "1672").
+                                Pages are kept in the response cache under this prefix. None skips the cache.
+        :return: Decoded page response including the 'pagination' and 'response' keys.
+        :rtype: dict
+        """
+        page_payload = dict(payload, page=page)
+        if cache_key is not None:
+            cache_key = cache_key + (json.dumps(page_payload, sort_keys=True),)
+            cached_page = self._get_cached(cache_key)
+            if cached_page is not None:
+                return cached_page
+
+        if use_params:
+            response = self.session.get(url, params=page_payload, headers=self._json_headers, verify=False)
+        else:
+            response = self.session.get(url, data=json.dumps(page_payload), headers=self._json_headers, verify=False)
+        page_response = response.json()
+
+        if cache_key is not None:
+            self._set_cached(cache_key, page_response)
+        return page_response
+
+    def _iter_pages(self, url, payload, use_params=True, prefetch=False, cache_key=None):
+        """
+        Used internally to walk a paginated list one page at a time. Pages are only requested as the caller
+        consumes the records, so stopping early skips the remaining pages.
+
+        :param str url: An Alpine API URL, including the session token.
+        :param dict payload: Query values shared by every page, typically including 'per_page'.
+        :param bool use_params: Send the payload as URL parameters, else as a JSON body.
+        :param bool prefetch: Fetch the next page in the background while the records of the current page
+                              are being consumed.
+        :param tuple cache_key: Response cache prefix of the listing, see `_get_page`.
+        :return: Generator of records.
+        :rtype: generator of dict
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page_response = self._get_page(url, payload, 1, use_params, cache_key)
+            while True:
+                page_total = page_response['pagination']['total']
+                page_current = page_response['pagination']['page']
+                next_page = None
+                if page_current < page_total and executor is not None:
+                    next_page = executor.submit(self._get_page, url, payload, page_current + 1, use_params,
+                                                cache_key)
+
+                for record in page_response['response']:
+                    yield record
+
+                if page_current >= page_total:
+                    break
+                elif next_page is not None:
+                    page_response = next_page.result()
+                else:
+                    page_response = self._get_page(url, payload, page_current + 1, use_params, cache_key)
+        finally:
+            if executor is not None:
+                # Don't wait for a read-ahead page nobody will consume.
+                executor.shutdown(wait=False)
+
+    def _get_all_pages(self, url, payload, use_params=True, cache_key=None):
+        """
+        Used internally to fetch every page of a paginated list. The first page tells us the page total, the
+        remaining pages are then fetched concurrently and merged back in page order.
+
+        :param str url: An Alpine API URL, including the session token.
+        :param dict payload: Query values shared by every page, typically including 'per_page'.
+        :param bool use_params: Send the payload as URL parameters, else as a JSON body.
+        :param tuple cache_key: Response cache prefix of the listing, see `_get_page`.
+        :return: Records of all the pages.
+        :rtype: list of dict
+        """
+        first_page = self._get_page(url, payload, 1, use_params, cache_key)
+        page_total = first_page['pagination']['total']
+        records = first_page['response']
+
+        remaining_pages = list(range(2, page_total + 1))
+        max_workers = min(getattr(self.session, "max_page_workers", 1), len(remaining_pages))
+        if max_workers <= 1:
+            for page in remaining_pages:
+                records.extend(self._get_page(url, payload, page, use_params, cache_key)['response'])
+        else:
+            self.logger.debug("Fetching {0} remaining pages of {1} with {2} workers"
+                              .format(len(remaining_pages), url, max_workers))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pages = executor.map(lambda page: self._get_page(url, payload, page, use_params, cache_key),
+                                     remaining_pages)
+                for page_response in pages:
+                    records.extend(page_response['response'])
+        return records
+
     @staticmethod
     def _setup_logging(default_configuration_setting_file='logging.json',
                        default_level=logging.INFO,
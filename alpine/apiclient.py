@@ -1,9 +1,9 @@
 import os
 import sys
-
-import requests
+from concurrent.futures import ThreadPoolExecutor
 
 from .alpineobject import AlpineObject
+from .session import AlpineSession
 from .job import Job
 from .user import User
 from .workfile import Workfile
@@ -22,6 +22,16 @@ class APIClient(AlpineObject):
         >>> import alpine as AlpineAPI
         >>> session = alpine.APIClient(host, port, username, password)
 
+    Once logged in, a client is thread-safe: every request carries its own headers and the session headers are
+    never changed, so a single client can be shared by a pool of threads. Only `login` and `logout`, which
+    replace the token and the API objects, should not run concurrently with other calls.
+
+    Example::
+
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> with ThreadPoolExecutor(max_workers=8) as executor:
+        >>>     workspaces = list(executor.map(session.workspace.get, workspace_ids))
+
     """
 
     user = None
@@ -31,7 +41,10 @@ class APIClient(AlpineObject):
     job = None
 
     def __init__(self, host=None, port=None, username=None, password=None, is_secure=False, validate_certs=False,
-                 ca_certs=None, token=None, logging_level='WARN'):
+                 ca_certs=None, token=None, logging_level='WARN', max_page_workers=4, id_cache_ttl=60,
+                 id_cache_size=256, response_cache_ttl=None, response_cache_size=512, pool_connections=10,
+                 pool_maxsize=10, pool_block=False, warm_connections=0, results_cache_dir=None,
+                 results_cache_size=1024 ** 3, local_store_path=None):
         """
         Sets internal values for Alpine API session. If username and password are supplied then a login is
         attempted. This is useful to check Alpine URL and user login parameters.
@@ -46,6 +59,39 @@ class APIClient(AlpineObject):
         :param str token: Alpine API authentication token.
         :param str logging_level: Use to set the logging level.
         See https://docs.python.org/2/howto/logging.html#logging-levels.
+        :param int max_page_workers: Maximum number of pages fetched concurrently by the `get_list` methods.
+                                     Use 1 to fetch pages one at a time.
+        :param float id_cache_ttl: Number of seconds the name-to-ID index built by the `get_id` methods is kept.
+                                   Creating, deleting or renaming through this client refreshes it right away.
+                                   Use 0 to disable the index and scan the listing on every call.
+        :param int id_cache_size: Maximum number of name-to-ID indexes kept, one per entity type and scope.
+        :param response_cache_ttl: Opt-in caching of the read-only calls `User.get`, `Workspace.get`,
+                                   `Workfile.get`, `Job.get`, `DataSource.get`, `get_version` and `get_license`, and
+                                   of the pages of the `get_list` and `iter_list` calls. Changes made through this
+                                   client evict or refresh the entries and list pages they affect.
+                                   Either a number of seconds for every entity type, or a dict of seconds per entity
+                                   type such as {"workspace": 10, "version": 3600, "default": 30}. List pages use
+                                   the TTL of their entity type, with "member" and "database" for workspace members
+                                   and databases. None, the default, disables caching.
+        :param int response_cache_size: Maximum number of cached responses, least recently used are evicted first.
+        :param int pool_connections: Number of hosts whose connection pools are kept.
+        :param int pool_maxsize: Maximum number of keep-alive connections kept per host. Raise it to at least the
+                                 number of threads sharing the client, so connections are reused instead of
+                                 re-established.
+        :param bool pool_block: When all `pool_maxsize` connections are busy, wait for one to be free instead of
+                                opening a throwaway connection.
+        :param int warm_connections: Number of keep-alive connections opened right after login, so that the first
+                                     burst of concurrent calls doesn't pay a TCP and TLS handshake each. At most
+                                     `pool_maxsize` connections are kept.
+        :param str results_cache_dir: Opt-in on-disk cache of the results downloaded by
+                                      `Workfile.Process.download_results`. The results of a finished run never
+                                      change, so later downloads of the same run are read from this directory
+                                      instead of Alpine. None, the default, disables the cache.
+        :param int results_cache_size: Maximum number of bytes of compressed results kept in `results_cache_dir`,
+                                       least recently read are deleted first.
+        :param str local_store_path: Path of the SQLite database where the client remembers the runs reused by
+                                     `Workfile.Process.run(memoize=True)`, shared by the clients using the same
+                                     path. None, the default, keeps them in memory for the lifetime of the client.
         :return: None.
         """
 
@@ -65,23 +111,35 @@ class APIClient(AlpineObject):
         else:
             self.host = "{0}:{1}".format(host, port)
 
-        self.session = requests.Session()  # instantiate a session for requests
+        # instantiate a session for requests
+        self.session = AlpineSession(max_page_workers=max_page_workers, id_cache_ttl=id_cache_ttl,
+                                     id_cache_size=id_cache_size, response_cache_ttl=response_cache_ttl,
+                                     response_cache_size=response_cache_size, pool_connections=pool_connections,
+                                     pool_maxsize=pool_maxsize, pool_block=pool_block,
+                                     results_cache_dir=results_cache_dir, results_cache_size=results_cache_size,
+                                     local_store_path=local_store_path)
 
         self.base_url = "{0}://{1}/api".format(self.protocol, self.host)
 
         self.ca_certs = ca_certs
         self.validate_certs = validate_certs
+        # Connections are pooled per TLS setting, calls that leave out `verify` share the pool of the login.
+        self.session.verify = validate_certs
         self.user_id = None
+        self.warm_connections = warm_connections
         if username and password:
             self.login(username, password)
 
-    def login(self, username, password):
+    def login(self, username, password, warm_connections=None):
         """
         Attempts to log in to Alpine with provided username and password. Typically login is handled at
-        session creation time.
+        session creation time. The login connection is kept in the session's connection pool for the calls
+        that follow.
 
         :param str username: Username to log in with.
         :param str password: Password to log in with.
+        :param int warm_connections: Number of pooled connections to open after a successful login, see
+                                     `warm_up`. Defaults to the value given when creating the client.
         :return: Logged-in user's metadata.
         :rtype: dict
 
@@ -101,14 +159,12 @@ class APIClient(AlpineObject):
         key_path = os.path.join(os.path.abspath(os.path.dirname(sys.argv[0])),
                                 "../host_deploy/resource/ssl/certificates/test.key")
 
-        self.session.headers.update({"Content-Type": "application/x-www-form-urlencoded"})
-
         if self.protocol == 'http':
             login_response = self.session.post(url, data=body)
         else:
-            login_response = self.session.post(url, data=body,
-                                               verify=self.validate_certs, cert=(cert_path, key_path),
-                                               headers={'Connection': 'close'})
+            # Set on the session rather than on the request, so the calls that follow reuse the login connection.
+            self.session.cert = (cert_path, key_path)
+            login_response = self.session.post(url, data=body, verify=self.validate_certs)
         if login_response.status_code == 201:
             response = login_response.json()
             self.token = response['response']['session_id']
@@ -120,6 +176,10 @@ class APIClient(AlpineObject):
             self.workspace = Workspace(self.base_url, self.session, self.token)
             self.workfile = Workfile(self.base_url, self.session, self.token)
             self.job = Job(self.base_url, self.session, self.token)
+            if warm_connections is None:
+                warm_connections = self.warm_connections
+            if warm_connections:
+                self.warm_up(warm_connections)
             return login_response.json()['response']['user']
 
         else:
@@ -218,9 +278,13 @@ class APIClient(AlpineObject):
             '6.2.0.0.1-b8c02ca46'
 
         """
+        cached_version = self._get_cached(("version",))
+        if cached_version is not None:
+            return cached_version
+
         url = "{0}/VERSION".format(self.base_url)
         response = self.session.get(url)
-        return response.content.strip().decode('utf-8')
+        return self._set_cached(("version",), response.content.strip().decode('utf-8'))
 
     def get_license(self):
         """
@@ -234,9 +298,95 @@ class APIClient(AlpineObject):
             >>> license_info = session.get_license()
 
         """
+        cached_license = self._get_cached(("license",))
+        if cached_license is not None:
+            return cached_license
+
         url = self.base_url + "/license"
         response = self.session.get(url)
         try:
-            return response.json()['response']
+            return self._set_cached(("license",), response.json()['response'])
         except:
             return {}
+
+    def warm_up(self, count):
+        """
+        Opens keep-alive connections to Alpine ahead of time, so that concurrent calls made afterwards find a warm
+        connection in the pool instead of each doing a TCP and, for HTTPS, a TLS handshake. The connections are
+        opened concurrently with lightweight version requests. Connections that fail to open are only logged.
+
+        :param int count: Number of connections to open. Capped to the pool size of the client.
+        :return: Number of connections opened.
+        :rtype: int
+
+        Example::
+
+            >>> session.warm_up(8)
+            8
+
+        """
+        count = min(count, getattr(self.session, "pool_maxsize", count))
+        if count <= 0:
+            return 0
+
+        url = "{0}/VERSION".format(self.base_url)
+
+        def open_connection(i):
+            # Streamed responses hold on to their connection until closed, so every request gets its own.
+            try:
+                return self.session.get(url, stream=True)
+            except Exception as err:
+                self.logger.debug("Failed to open a pooled connection: {0}".format(err))
+                return None
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            responses = list(executor.map(open_connection, range(0, count)))
+
+        opened = 0
+        for response in responses:
+            if response is not None:
+                # Reading the body hands the connection back to the pool.
+                response.content
+                response.close()
+                opened += 1
+        self.logger.debug("Opened {0} pooled connections to {1}".format(opened, self.host))
+        return opened
+
+    def get_connection_stats(self):
+        """
+        Returns the connection reuse counters of the client's connection pools.
+
+        :return: Number of connections opened, requests sent and requests that reused a connection, in total and
+                 per host.
+        :rtype: dict
+
+        Example::
+
+            >>> session.get_connection_stats()
+            {'connections': 4, 'requests': 212, 'reused': 208,
+             'hosts': {'http://10.0.0.205:8080': {'connections': 4, 'requests': 212, 'reused': 208}}}
+
+        """
+        return self.session.get_connection_stats()
+
+    def get_cache_stats(self):
+        """
+        Returns the hit and miss counters of the client-side caches. A cache that is turned off is reported as None.
+
+        :return: Counters of the name-to-ID index ('id_index'), of the response cache ('response_cache') and of the
+                 on-disk results cache ('results_cache').
+        :rtype: dict
+
+        Example::
+
+            >>> session.get_cache_stats()
+            {'id_index': {'hits': 12, 'misses': 3, 'size': 2},
+             'response_cache': {'hits': 240, 'misses': 18, 'size': 18},
+             'results_cache': None}
+
+        """
+        stats = {}
+        for name in ("id_index", "response_cache", "results_cache"):
+            cache = getattr(self.session, name, None)
+            stats[name] = cache.get_stats() if cache is not None else None
+        return stats
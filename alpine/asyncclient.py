@@ -0,0 +1,694 @@
+"""
+An asyncio counterpart of :class:`APIClient`, built on aiohttp. It needs Python 3.6 or above and the aiohttp
+package, installed with `pip install alpine[async]`.
+"""
+from __future__ import absolute_import
+
+import asyncio
+import json
+import time
+from urllib.parse import urlparse
+from urllib.parse import urljoin
+
+import aiohttp
+
+from .alpineobject import AlpineObject
+from .datasource import DataSource
+from .exception import *
+from .flowresult import FlowResult
+from .polling import PollSchedule, RunHistory
+from .workfile import Workfile
+
+
+class AsyncResponse(object):
+    """
+    The parts of an HTTP response the API objects use, read in full before the aiohttp response is released.
+    """
+
+    def __init__(self, status_code, reason, content):
+        self.status_code = status_code
+        self.reason = reason
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncAlpineObject(AlpineObject):
+    """
+    Base Class of the asyncio Alpine API objects. The `session` is an aiohttp.ClientSession.
+    """
+
+    def __init__(self, base_url=None, session=None, token=None, max_page_workers=4):
+        super(AsyncAlpineObject, self).__init__(base_url, session, token)
+        self.max_page_workers = max_page_workers
+
+    @staticmethod
+    def _format_params(params):
+        """
+        Used internally to convert query values the way requests does, since aiohttp rejects None and bool values.
+
+        :param dict params: Query values.
+        :return: Query values without None values and with other values as strings.
+        :rtype: dict
+        """
+        if params is None:
+            return None
+        return dict((key, str(value)) for key, value in params.items() if value is not None)
+
+    async def _request(self, method, url, params=None, data=None, headers=None, timeout=None):
+        """
+        Used internally to send a request and read its whole response.
+
+        :param str method: HTTP method.
+        :param str url: URL of the request.
+        :param dict params: Query values.
+        :param data: Request body, a str or a dict of form values.
+        :param dict headers: Request headers.
+        :param float timeout: Number of seconds before the request is abandoned.
+        :return: The response.
+        :rtype: AsyncResponse
+        """
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        async with self.session.request(method, url, params=self._format_params(params), data=data,
+                                        headers=headers, timeout=request_timeout) as response:
+            content = await response.read()
+            return AsyncResponse(response.status, response.reason, content)
+
+    async def _get_page(self, url, payload, page, use_params=True):
+        page_payload = dict(payload, page=page)
+        if use_params:
+            response = await self._request("GET", url, params=page_payload, headers=self._json_headers)
+        else:
+            response = await self._request("GET", url, data=json.dumps(page_payload), headers=self._json_headers)
+        return response.json()
+
+    async def _iter_pages(self, url, payload, use_params=True):
+        page_current = 0
+        while True:
+            page_response = await self._get_page(url, payload, page_current + 1, use_params)
+            page_total = page_response['pagination']['total']
+            page_current = page_response['pagination']['page']
+            for record in page_response['response']:
+                yield record
+            if page_current >= page_total:
+                break
+
+    async def _get_all_pages(self, url, payload, use_params=True):
+        first_page = await self._get_page(url, payload, 1, use_params)
+        page_total = first_page['pagination']['total']
+        records = first_page['response']
+
+        semaphore = asyncio.Semaphore(max(1, self.max_page_workers))
+
+        async def get_page(page):
+            async with semaphore:
+                return await self._get_page(url, payload, page, use_params)
+
+        pages = await asyncio.gather(*[get_page(page) for page in range(2, page_total + 1)])
+        for page_response in pages:
+            records.extend(page_response['response'])
+        return records
+
+    async def _get_entity(self, url, not_found):
+        r = await self._request("GET", url, headers=self._json_headers)
+        entity_response = r.json()
+        try:
+            if entity_response['response']:
+                return entity_response
+            else:
+                raise not_found
+        except Exception:
+            raise not_found
+
+
+class AsyncUser(AsyncAlpineObject):
+    """
+    asyncio counterpart of :class:`User`.
+    """
+
+    async def get(self, user_id):
+        """
+        Get a user's metadata. See :meth:`User.get`.
+        """
+        url = self._add_token_to_url("{0}/users/{1}".format(self.base_url, user_id))
+        user_response = await self._get_entity(url, UserNotFoundException("User ID: <{0}> not found".format(user_id)))
+        return user_response['response']
+
+    async def get_list(self, per_page=100):
+        """
+        Get a list of all users' metadata. See :meth:`User.get_list`.
+        """
+        url = self._add_token_to_url("{0}/users".format(self.base_url))
+        return await self._get_all_pages(url, {"per_page": per_page})
+
+    def iter_list(self, per_page=100):
+        """
+        Iterate over all users' metadata with `async for`. See :meth:`User.iter_list`.
+        """
+        url = self._add_token_to_url("{0}/users".format(self.base_url))
+        return self._iter_pages(url, {"per_page": per_page})
+
+    async def get_id(self, username):
+        """
+        Gets the ID of the user. See :meth:`User.get_id`.
+        """
+        async for user_info in self.iter_list():
+            if user_info['username'] == username:
+                return user_info['id']
+        raise UserNotFoundException("User {0} not found".format(username))
+
+
+class AsyncWorkspace(AsyncAlpineObject):
+    """
+    asyncio counterpart of :class:`Workspace`.
+    """
+
+    member = None
+
+    def __init__(self, base_url=None, session=None, token=None, max_page_workers=4):
+        super(AsyncWorkspace, self).__init__(base_url, session, token, max_page_workers)
+        self.member = self.Member(base_url, session, token, max_page_workers)
+
+    @staticmethod
+    def _list_payload(user_id, active, per_page):
+        return {"user_id": user_id,
+                "active": "true" if active is True else None,
+                "per_page": per_page,
+                }
+
+    async def get(self, workspace_id):
+        """
+        Gets a workspace's metadata. See :meth:`Workspace.get`.
+        """
+        url = self._add_token_to_url("{0}/workspaces/{1}".format(self.base_url, workspace_id))
+        workspace_response = await self._get_entity(
+            url, WorkspaceNotFoundException("Workspace ID: <{0}> not found".format(workspace_id)))
+        return workspace_response['response']
+
+    async def get_list(self, user_id=None, active=None, per_page=50):
+        """
+        Gets a list of metadata for each workspace. See :meth:`Workspace.get_list`.
+        """
+        url = self._add_token_to_url("{0}/workspaces".format(self.base_url))
+        return await self._get_all_pages(url, self._list_payload(user_id, active, per_page))
+
+    def iter_list(self, user_id=None, active=None, per_page=50):
+        """
+        Iterate over the metadata of each workspace with `async for`. See :meth:`Workspace.iter_list`.
+        """
+        url = self._add_token_to_url("{0}/workspaces".format(self.base_url))
+        return self._iter_pages(url, self._list_payload(user_id, active, per_page))
+
+    async def get_id(self, workspace_name, user_id=None):
+        """
+        Get the ID of the workspace. See :meth:`Workspace.get_id`.
+        """
+        async for workspace in self.iter_list(user_id):
+            if workspace['name'] == workspace_name:
+                return workspace['id']
+        raise WorkspaceNotFoundException("The workspace with name '{0}' is not found for user ID: <{1}>".format(
+            workspace_name, user_id))
+
+    class Member(AsyncAlpineObject):
+        """
+        asyncio counterpart of :class:`Workspace.Member`.
+        """
+
+        async def get_list(self, workspace_id, per_page=100):
+            """
+            Gets metadata about all the users who are members of the workspace. See :meth:`Workspace.Member.get_list`.
+            """
+            # Check that workspace exists.
+            await AsyncWorkspace(self.base_url, self.session, self.token).get(workspace_id)
+
+            url = self._add_token_to_url("{0}/workspaces/{1}/members".format(self.base_url, workspace_id))
+            return await self._get_all_pages(url, {"per_page": per_page}, use_params=False)
+
+
+class AsyncWorkfile(AsyncAlpineObject):
+    """
+    asyncio counterpart of :class:`Workfile`. The subclass `Process` runs workflows.
+    """
+
+    process = None
+
+    def __init__(self, base_url=None, session=None, token=None, max_page_workers=4):
+        super(AsyncWorkfile, self).__init__(base_url, session, token, max_page_workers)
+        self.process = self.Process(base_url, session, token, max_page_workers)
+
+    @staticmethod
+    def _list_payload(per_page):
+        return {"no_published_worklets": True,
+                "order": "file_name",
+                "per_page": per_page,
+                }
+
+    async def get(self, workfile_id):
+        """
+        Returns metadata for a workfile. See :meth:`Workfile.get`.
+        """
+        url = self._add_token_to_url("{0}/workfiles/{1}".format(self.base_url, workfile_id))
+        return await self._get_entity(url,
+                                      WorkfileNotFoundException("Workfile ID: <{0}> not found".format(workfile_id)))
+
+    async def get_list(self, workspace_id, per_page=100):
+        """
+        Returns all workfiles in a workspace. See :meth:`Workfile.get_list`.
+        """
+        url = self._add_token_to_url("{0}/workspaces/{1}/workfiles".format(self.base_url, workspace_id))
+        return await self._get_all_pages(url, self._list_payload(per_page), use_params=False)
+
+    def iter_list(self, workspace_id, per_page=100):
+        """
+        Iterate over all workfiles in a workspace with `async for`. See :meth:`Workfile.iter_list`.
+        """
+        url = self._add_token_to_url("{0}/workspaces/{1}/workfiles".format(self.base_url, workspace_id))
+        return self._iter_pages(url, self._list_payload(per_page), use_params=False)
+
+    async def get_id(self, workfile_name, workspace_id):
+        """
+        Returns the ID of a workfile in a workspace. See :meth:`Workfile.get_id`.
+        """
+        async for workfile in self.iter_list(workspace_id):
+            if workfile['file_name'] == workfile_name:
+                return workfile['id']
+        raise WorkfileNotFoundException("The workfile with name '{0}' is not found in workspace ID: <{1}>"
+                                        .format(workfile_name, workspace_id))
+
+    class Process(AsyncAlpineObject):
+        """
+        asyncio counterpart of :class:`Workfile.Process`.
+        """
+
+        find_operator = staticmethod(Workfile.Process.find_operator)
+        get_metadata = staticmethod(Workfile.Process.get_metadata)
+
+        def __init__(self, base_url=None, session=None, token=None, max_page_workers=4):
+            super(AsyncWorkfile.Process, self).__init__(base_url, session, token, max_page_workers)
+            self.chorus_domain = '{uri.scheme}://{uri.netloc}/'.format(uri=urlparse(self.base_url))
+            self.alpine_base_url = urljoin(self.chorus_domain,
+                                           "alpinedatalabs/api/{0}/json".format(self._alpine_api_version))
+            self.run_history = RunHistory()
+
+        def _alpine_headers(self):
+            return {"x-token": self.token, "Content-Type": "application/json"}
+
+        async def run(self, workflow_id, variables=None):
+            """
+            Run a workflow, optionally including a list of workflow variables. See :meth:`Workfile.Process.run`.
+            """
+            url = "{0}/workflows/{1}/run".format(self.alpine_base_url, workflow_id)
+            querystring = {"saveResult": "true"}
+            if variables is None:
+                workflow_variables = None
+            else:
+                for variable in variables:
+                    if not all(key in variable for key in ("name", "value")):
+                        raise WorkflowVariableException("Workflow variable item <{0}> doesn't contain the "
+                                                        "expected keys 'name' and 'value'.".format(variable))
+                workflow_variables = '{{"meta": {{"version": 1}}, "variables": {0}}}' \
+                    .format(json.dumps(variables))
+
+            response = await self._request("POST", url, params=querystring, data=workflow_variables,
+                                           headers=self._alpine_headers(), timeout=30)
+            self.logger.debug(response.content)
+
+            if response.status_code == 200:
+                process_id = response.json()['meta']['processId']
+                self.logger.debug("Workflow ID: <{0}> started with process ID: <{1}>".format(workflow_id, process_id))
+                return process_id
+            else:
+                raise RunFlowFailureException(
+                    "Running workflow ID: <{0}> failed with status code {1}".format(workflow_id, response.status_code))
+
+        async def query_status(self, process_id):
+            """
+            Returns the status of a running workflow. See :meth:`Workfile.Process.query_status`.
+            """
+            url = "{0}/processes/{1}/query".format(self.alpine_base_url, process_id)
+            response = await self._request("GET", url, headers=self._alpine_headers(), timeout=60)
+            self.logger.debug(response.text)
+
+            in_progress_states = ["IN_PROGRESS", "NODE_STARTED", "STARTED", "NODE_FINISHED"]
+            if response.status_code == 200:
+                try:
+                    if response.json()['meta']['state'] in in_progress_states:
+                        return "WORKING"
+                except ValueError:
+                    if response.text == 'Workflow not started or already stopped.\n' or \
+                                    response.text == "invalid processID or workflow already stopped.\n":
+                        return "FINISHED"
+                    else:
+                        return "FAILED"
+            else:
+                raise RunFlowFailureException("Workflow process ID: <{0}> not found".format(process_id))
+
+        async def download_results(self, workflow_id, process_id, lazy=False):
+            """
+            Downloads a workflow run result. See :meth:`Workfile.Process.download_results`.
+            """
+            url = "{0}/workflows/{1}/results/{2}".format(self.alpine_base_url, workflow_id, process_id)
+            response = await self._request("GET", url, headers=self._alpine_headers())
+
+            if response.status_code == 200:
+                if response.content == b"\"\"":
+                    raise ResultsNotFoundException("Could not find run results for process ID: <{0}>"
+                                                   .format(process_id))
+                elif lazy:
+                    return FlowResult(response.json())
+                else:
+                    return json.loads(response.json())
+            else:
+                raise ResultsNotFoundException("Download results failed with status {0}: {1}"
+                                               .format(response.status_code, response.reason))
+
+        async def stop(self, process_id):
+            """
+            Attempts to stop a running workflow. See :meth:`Workfile.Process.stop`.
+            """
+            url = "{0}/processes/{1}/stop".format(self.alpine_base_url, process_id)
+            response = await self._request("POST", url, headers=self._alpine_headers(), timeout=60)
+            self.logger.debug(response.text)
+            if response.status_code == 200:
+                if response.json()['status'] == "Flow stopped.\n":
+                    return "STOPPED"
+                else:
+                    return "STOP FAILED"
+            else:
+                raise StopFlowFailureException("Stopping the workflow failed with status {0}: {1}"
+                                               .format(response.status_code, response.reason))
+
+        async def wait_until_finished(self, workflow_id, process_id, query_time=10, timeout=3600,
+                                      initial_query_time=0.5, expected_duration=None, results_timeout=30):
+            """
+            Waits for a running workflow to finish without blocking the event loop.
+            See :meth:`Workfile.Process.wait_until_finished`.
+            """
+            query_time = max(1, query_time)
+            if expected_duration is None:
+                expected_duration = self.run_history.expected_duration(workflow_id)
+            schedule = PollSchedule(initial_delay=initial_query_time, max_delay=query_time,
+                                    expected_duration=expected_duration)
+            start = time.time()
+
+            working_at = None
+            workflow_status = await self.query_status(process_id)
+            while workflow_status == "WORKING":
+                wait_total = time.time() - start
+                if wait_total >= timeout:
+                    stop_status = await self.stop(process_id)
+                    raise RunFlowTimeoutException(
+                        "The Workflow with process ID: <{0}> has exceeded a runtime of {1} seconds."
+                        " It now has status '{2}'.".format(process_id, timeout, stop_status))
+                working_at = time.time()
+                await asyncio.sleep(min(schedule.next_delay(wait_total), max(0, timeout - wait_total)))
+                workflow_status = await self.query_status(process_id)
+
+            if working_at is not None:
+                # The run ended between the last two queries.
+                self.run_history.record(workflow_id, (working_at + time.time()) / 2 - start)
+
+            results_schedule = PollSchedule(initial_delay=0.1, max_delay=2)
+            deadline = time.time() + results_timeout
+            while True:
+                try:
+                    final_results = await self.download_results(workflow_id, process_id)
+                    break
+                except ResultsNotFoundException:
+                    if workflow_status == "FAILED":
+                        # The results of a failed run may never be published.
+                        raise RunFlowFailureException("The Workflow with process ID: <{0}> failed."
+                                                      .format(process_id))
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise
+                    await asyncio.sleep(min(results_schedule.next_delay(0), remaining))
+            return self.get_metadata(final_results)['status']
+
+
+class AsyncJob(AsyncAlpineObject):
+    """
+    asyncio counterpart of :class:`Job`.
+    """
+
+    async def get(self, workspace_id, job_id):
+        """
+        Get one job's metadata. See :meth:`Job.get`.
+        """
+        url = self._add_token_to_url("{0}/workspaces/{1}/jobs/{2}".format(self.base_url, workspace_id, job_id))
+        job_response = await self._get_entity(url, JobNotFoundException("Job ID: <{0}> not found".format(job_id)))
+        return job_response['response']
+
+    async def get_list(self, workspace_id, per_page=50):
+        """
+        Get a list of all jobs in a workspace. See :meth:`Job.get_list`.
+        """
+        url = self._add_token_to_url("{0}/workspaces/{1}/jobs".format(self.base_url, workspace_id))
+        return await self._get_all_pages(url, {"per_page": per_page}, use_params=False)
+
+    def iter_list(self, workspace_id, per_page=50):
+        """
+        Iterate over all jobs in a workspace with `async for`. See :meth:`Job.iter_list`.
+        """
+        url = self._add_token_to_url("{0}/workspaces/{1}/jobs".format(self.base_url, workspace_id))
+        return self._iter_pages(url, {"per_page": per_page}, use_params=False)
+
+    async def get_id(self, workspace_id, job_name):
+        """
+        Gets the job ID. See :meth:`Job.get_id`.
+        """
+        async for job_info in self.iter_list(workspace_id):
+            if job_info['name'] == job_name:
+                return job_info['id']
+        raise JobNotFoundException("Job {0} not found".format(job_name))
+
+    async def run(self, job_id):
+        """
+        Run a job. See :meth:`Job.run`.
+        """
+        url = "{0}/jobs/{1}/run?saveResult=true".format(self.base_url, job_id)
+        response = await self._request("POST", url, headers={"x-token": self.token,
+                                                              "Content-Type": "application/json"}, timeout=30)
+        self.logger.debug(response.content)
+        if response.status_code == 202:
+            job = response.json()['response']
+            self.logger.debug("Job with ID: <{0}> run started".format(job['id']))
+            return job
+        else:
+            raise RunJobFailureException("Running job with ID: <{0}> failed with status code {1}".
+                                         format(job_id, response.status_code))
+
+
+class AsyncDataSource(AsyncAlpineObject):
+    """
+    asyncio counterpart of :class:`DataSource`.
+    """
+
+    @property
+    def dsType(self):
+        return DataSource.DSType()
+
+    async def get(self, ds_id, type):
+        """
+        Get one data source's metadata. See :meth:`DataSource.get`.
+        """
+        if type == "Database":
+            url = "{0}/data_sources/{1}".format(self.base_url, ds_id)
+        elif type == "Hadoop":
+            url = "{0}/hdfs_data_sources/{1}".format(self.base_url, ds_id)
+        else:
+            raise Exception("the data source type should be either {0} or {1}"
+                            .format("Database", "Hadoop")
+                            )
+        url = self._add_token_to_url(url)
+        ds_response = await self._get_entity(
+            url, DataSourceNotFoundException("{0} data source ID: <{1}> not found".format(type, ds_id)))
+        return ds_response['response']
+
+    async def get_list(self, type=None, per_page=100):
+        """
+        Get a list of metadata for all data sources. See :meth:`DataSource.get_list`.
+        """
+        return [datasource_info async for datasource_info in self.iter_list(type, per_page)]
+
+    async def iter_list(self, type=None, per_page=100):
+        """
+        Iterate over the metadata of all data sources with `async for`. See :meth:`DataSource.iter_list`.
+        """
+        payload = {"all": True, "per_page": per_page}
+        for ds_type, ds_path in (("Database", "data_sources"), ("Hadoop", "hdfs_data_sources")):
+            if type is not None and type != ds_type:
+                continue
+            url = self._add_token_to_url("{0}/{1}".format(self.base_url, ds_path))
+            try:
+                async for datasource_info in self._iter_pages(url, payload):
+                    yield datasource_info
+            except Exception as ex:
+                self.logger.warn("Failed to get {0} data sources, the error is: {1}".format(ds_type, ex))
+
+    async def get_id(self, name, type=None):
+        """
+        Gets the ID of the data source. See :meth:`DataSource.get_id`.
+        """
+        async for ds_info in self.iter_list(type):
+            if ds_info['name'] == name:
+                return ds_info['id']
+        raise DataSourceNotFoundException("{0} data source with name '{1}' not found".format(type, name))
+
+    async def get_database_list(self, data_source_id, per_page=100):
+        """
+        Return a list of metadata for all databases in a data source. See :meth:`DataSource.get_database_list`.
+        """
+        url = self._add_token_to_url("{0}/data_sources/{1}/databases".format(self.base_url, data_source_id))
+        return await self._get_all_pages(url, {"all": True, "per_page": per_page})
+
+
+class AsyncAPIClient(AsyncAlpineObject):
+    """
+    asyncio counterpart of :class:`APIClient`, so that many listing, run and poll operations can share one event
+    loop instead of a thread each. It offers the read and run operations of `.user`, `.workspace`,
+    `.workspace.member`, `.workfile`, `.workfile.process`, `.job` and `.datasource`, as coroutines with the
+    same arguments as their :class:`APIClient` counterparts; the iter_list methods are async generators.
+    Creating, updating and deleting records remains on :class:`APIClient`.
+
+    Example::
+
+        >>> async with AsyncAPIClient(host, port, username, password) as session:
+        >>>     process_ids = await asyncio.gather(*[session.workfile.process.run(workflow_id)
+        >>>                                          for workflow_id in workflow_ids])
+
+    """
+
+    user = None
+    datasource = None
+    workspace = None
+    workfile = None
+    job = None
+
+    def __init__(self, host=None, port=None, username=None, password=None, is_secure=False, validate_certs=False,
+                 token=None, logging_level='WARN', max_page_workers=4, max_connections=100):
+        """
+        Sets internal values for the Alpine API session. The login happens when entering the `async with` block,
+        or by awaiting :meth:`login`.
+
+        :param str host: Hostname or IP address of the Alpine server.
+        :param str port: Port number for Alpine.
+        :param str username: Username to log in with.
+        :param str password: Password to log in with.
+        :param bool is_secure: True for HTTPS, else false.
+        :param bool validate_certs: Verify the TLS certificate of the server.
+        :param str token: Alpine API authentication token.
+        :param str logging_level: Use to set the logging level.
+        :param int max_page_workers: Maximum number of pages fetched concurrently by the `get_list` methods.
+        :param int max_connections: Maximum number of simultaneous connections to Alpine.
+        :return: None.
+        """
+        super(AsyncAPIClient, self).__init__(token=token, max_page_workers=max_page_workers)
+        self._setup_logging(default_level=logging_level)
+        self.protocol = 'https' if is_secure else 'http'
+        if not port or port == 80:
+            self.host = host
+        else:
+            self.host = "{0}:{1}".format(host, port)
+        self.base_url = "{0}://{1}/api".format(self.protocol, self.host)
+        self.validate_certs = validate_certs
+        self.max_connections = max_connections
+        self.user_id = None
+        self._username = username
+        self._password = password
+
+    async def __aenter__(self):
+        if self._username and self._password:
+            await self.login(self._username, self._password)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.token is not None and self.session is not None:
+            await self.logout()
+        await self.close()
+
+    def _open_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ssl=None if self.validate_certs else False)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def close(self):
+        """
+        Closes the underlying connections.
+
+        :return: None.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def login(self, username, password):
+        """
+        Attempts to log in to Alpine with provided username and password. See :meth:`APIClient.login`.
+        """
+        self._open_session()
+        url = "{0}/sessions?session_id=NULL".format(self.base_url)
+        login_response = await self._request("POST", url, data={"username": username, "password": password})
+        if login_response.status_code == 201:
+            response = login_response.json()
+            self.token = response['response']['session_id']
+            self.user_id = response['response']['user']['id']
+            self.logger.debug("Successfully logged in with username '{0}'".format(username))
+            api_args = (self.base_url, self.session, self.token, self.max_page_workers)
+            self.user = AsyncUser(*api_args)
+            self.datasource = AsyncDataSource(*api_args)
+            self.workspace = AsyncWorkspace(*api_args)
+            self.workfile = AsyncWorkfile(*api_args)
+            self.job = AsyncJob(*api_args)
+            return response['response']['user']
+        else:
+            raise LoginFailureException("Login failed with status code: <{0}>.".format(login_response.status_code))
+
+    async def logout(self):
+        """
+        Attempts to log out the current user. See :meth:`APIClient.logout`.
+        """
+        url = "{0}/sessions?session_id={1}".format(self.base_url, self.token)
+        logout_response = await self._request("DELETE", url)
+        self.logger.debug("Received response code {0} with reason {1}".format(logout_response.status_code,
+                                                                              logout_response.reason))
+        self.token = None
+        self.user = None
+        self.datasource = None
+        self.workspace = None
+        self.workfile = None
+        self.job = None
+        return logout_response
+
+    async def get_status(self):
+        """
+        Returns information about the currently logged-in user. See :meth:`APIClient.get_status`.
+        """
+        response = await self._request("GET", "{0}/sessions".format(self.base_url))
+        try:
+            return response.json()['response']['user']
+        except:
+            return {}
+
+    async def get_version(self):
+        """
+        Returns the Alpine version. See :meth:`APIClient.get_version`.
+        """
+        response = await self._request("GET", "{0}/VERSION".format(self.base_url))
+        return response.content.strip().decode('utf-8')
+
+    async def get_license(self):
+        """
+        Get the the current license information for Alpine. See :meth:`APIClient.get_license`.
+        """
+        response = await self._request("GET", self.base_url + "/license")
+        try:
+            return response.json()['response']
+        except:
+            return {}
@@ -0,0 +1,301 @@
+from __future__ import absolute_import
+
+import gzip
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache(object):
+    """
+    A thread-safe, size-bounded cache whose entries expire after a time to live. The least recently used entry
+    is evicted once the cache is full. Keys are tuples, so that related entries can be invalidated together by
+    a common key prefix.
+    """
+
+    def __init__(self, ttl=60, max_size=256):
+        """
+        :param float ttl: Default number of seconds an entry stays valid.
+        :param int max_size: Maximum number of entries kept.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored for a key, or `default` if it is missing or expired.
+
+        :param tuple key: Cache key.
+        :param default: Value returned on a miss.
+        :return: Cached value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.time():
+                    # Mark as most recently used.
+                    del self._entries[key]
+                    self._entries[key] = entry
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        :param tuple key: Cache key.
+        :param value: Value to store.
+        :param float ttl: Number of seconds the entry stays valid. Defaults to the cache TTL.
+        :return: None
+        """
+        if ttl is None:
+            ttl = self.ttl
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + ttl, value)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *prefix):
+        """
+        Removes every entry whose key starts with the given elements. Without a prefix, empties the cache.
+
+        :param prefix: Leading elements of the keys to remove.
+        :return: Number of removed entries.
+        :rtype: int
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key[:len(prefix)] == prefix]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        """
+        Removes every entry and resets the hit and miss counters.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """
+        Returns the cache counters.
+
+        :return: Number of hits, misses and entries.
+        :rtype: dict
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class ResponseCache(TTLCache):
+    """
+    A :class:`TTLCache` for API responses, where the first element of each key names the entity type and
+    selects the time to live of the entry.
+    """
+
+    def __init__(self, ttl=30, max_size=512):
+        """
+        :param ttl: Number of seconds a response stays valid, either one value for every entity type or a dict
+                    mapping entity types ("user", "workspace", "workfile", "job", "datasource", "version",
+                    "license") to seconds. The "default" key of the dict applies to the other types.
+        :param int max_size: Maximum number of responses kept.
+        """
+        if isinstance(ttl, dict):
+            self.entity_ttl = dict(ttl)
+            ttl = self.entity_ttl.get("default", 30)
+        else:
+            self.entity_ttl = {}
+        super(ResponseCache, self).__init__(ttl, max_size)
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            ttl = self.entity_ttl.get(key[0], self.ttl)
+        super(ResponseCache, self).set(key, value, ttl)
+
+
+class FileResultCache(object):
+    """
+    A thread-safe, size-bounded cache of workflow results on disk, keyed by workflow ID and process ID. The
+    results of a finished run never change, so entries don't expire. Each result is stored gzip-compressed in its
+    own file of `directory`, and the least recently read results are deleted once the files exceed `max_bytes`.
+    Several clients, including in other processes, can share the same directory.
+    """
+
+    _UNSAFE = re.compile(r'[^A-Za-z0-9_.-]')
+    _SUFFIX = ".json.gz"
+
+    def __init__(self, directory, max_bytes=1024 ** 3, compresslevel=6):
+        """
+        :param str directory: Directory holding the cached results, created if missing.
+        :param int max_bytes: Maximum total size of the compressed results kept.
+        :param int compresslevel: gzip compression level, from 1 (fastest) to 9 (smallest).
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.compresslevel = compresslevel
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        # File sizes, least recently used first.
+        self._files = OrderedDict()
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(self._SUFFIX):
+                stat = os.stat(os.path.join(directory, name))
+                entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+
+    def __len__(self):
+        with self._lock:
+            return len(self._files)
+
+    def _file_name(self, workflow_id, process_id):
+        return "{0}-{1}{2}".format(self._UNSAFE.sub("_", str(workflow_id)), self._UNSAFE.sub("_", str(process_id)),
+                                   self._SUFFIX)
+
+    def get(self, workflow_id, process_id):
+        """
+        Returns the cached result of a workflow run.
+
+        :param workflow_id: ID of the workflow.
+        :param str process_id: ID of the workflow run.
+        :return: The result document, as sent by Alpine, or None on a miss.
+        :rtype: str
+        """
+        name = self._file_name(workflow_id, process_id)
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            try:
+                with gzip.open(path, "rb") as result_file:
+                    raw = result_file.read().decode("utf-8")
+                # Mark as most recently used, also for other clients sharing the directory.
+                os.utime(path, None)
+            except (IOError, OSError, EOFError):
+                self._files.pop(name, None)
+                self.misses += 1
+                return None
+            self._files.pop(name, None)
+            self._files[name] = os.path.getsize(path)
+            self.hits += 1
+            return raw
+
+    def set(self, workflow_id, process_id, raw):
+        """
+        Stores the result of a workflow run, deleting the least recently used results if the cache is full.
+
+        :param workflow_id: ID of the workflow.
+        :param str process_id: ID of the workflow run.
+        :param str raw: The result document, as sent by Alpine.
+        :return: None
+        """
+        name = self._file_name(workflow_id, process_id)
+        path = os.path.join(self.directory, name)
+        # Written under a temporary name and then renamed, so that readers never see a partial file.
+        handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                with gzip.GzipFile(fileobj=temp_file, mode="wb", compresslevel=self.compresslevel) as result_file:
+                    result_file.write(raw.encode("utf-8"))
+            size = os.path.getsize(temp_path)
+            with self._lock:
+                if hasattr(os, "replace"):
+                    os.replace(temp_path, path)
+                else:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    os.rename(temp_path, path)
+                self._files.pop(name, None)
+                self._files[name] = size
+                self._evict()
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _evict(self):
+        total = sum(self._files.values())
+        while total > self.max_bytes and len(self._files) > 1:
+            name, size = self._files.popitem(last=False)
+            total -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                # Already removed by another client.
+                pass
+
+    def invalidate(self, workflow_id, process_id=None):
+        """
+        Removes the cached results of a workflow run, or of every run of a workflow.
+
+        :param workflow_id: ID of the workflow.
+        :param str process_id: ID of the workflow run. None for every run.
+        :return: Number of removed results.
+        :rtype: int
+        """
+        if process_id is not None:
+            names = [self._file_name(workflow_id, process_id)]
+        else:
+            prefix = "{0}-".format(self._UNSAFE.sub("_", str(workflow_id)))
+            names = [name for name in os.listdir(self.directory)
+                     if name.startswith(prefix) and name.endswith(self._SUFFIX)]
+        removed = 0
+        with self._lock:
+            for name in names:
+                self._files.pop(name, None)
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def clear(self):
+        """
+        Removes every cached result and resets the hit and miss counters.
+
+        :return: None
+        """
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name.endswith(self._SUFFIX):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+            self._files.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """
+        Returns the cache counters.
+
+        :return: Number of hits, misses and results, and total size of the results in bytes.
+        :rtype: dict
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._files),
+                    "bytes": sum(self._files.values())}
@@ -34,28 +34,13 @@ class DataSource(AlpineObject):
         """
         db_datasource_list = None
         hd_datasource_list = None
-        self.session.headers.update({"Content-Type": "application/json"})
         if not type == "Hadoop":
             try:
                 url = "{0}/data_sources".format(self.base_url)
                 url = self._add_token_to_url(url)
                 self.logger.debug("Getting list of {0} data sources from {1}".format("database", url))
-                page_current = 0
-                while True:
-                    payload = {
-                        "all": True,
-                        "per_page": per_page,
-                        "page": page_current + 1,
-                    }
-                    datasource_list_response = self.session.get(url, params=payload, verify=False).json()
-                    page_total = datasource_list_response['pagination']['total']
-                    page_current = datasource_list_response['pagination']['page']
-                    if db_datasource_list:
-                        db_datasource_list.extend(datasource_list_response['response'])
-                    else:
-                        db_datasource_list = datasource_list_response['response']
-                    if page_total == page_current:
-                        break
+                payload = {"all": True, "per_page": per_page}
+                db_datasource_list = self._get_all_pages(url, payload, cache_key=("datasource", "list", "Database"))
             except Exception as ex:
                 self.logger.warn("Failed to get {0} data sources, the error is: {1}".format("database", ex.message))
         if not type == "Database":
@@ -63,22 +48,8 @@ class DataSource(AlpineObject):
                 url = "{0}/hdfs_data_sources".format(self.base_url)
                 url = self._add_token_to_url(url)
                 self.logger.debug("Getting list of {0} data sources from {1}".format("Hadoop", url))
-                page_current = 0
-                while True:
-                    payload = {
-                        "all": True,
-                        "per_page": per_page,
-                        "page": page_current + 1,
-                    }
-                    datasource_list_response = self.session.get(url, params=payload, verify=False).json()
-                    page_total = datasource_list_response['pagination']['total']
-                    page_current = datasource_list_response['pagination']['page']
-                    if hd_datasource_list:
-                        hd_datasource_list.extend(datasource_list_response['response'])
-                    else:
-                        hd_datasource_list = datasource_list_response['response']
-                    if page_total == page_current:
-                        break
+                payload = {"all": True, "per_page": per_page}
+                hd_datasource_list = self._get_all_pages(url, payload, cache_key=("datasource", "list", "Hadoop"))
             except Exception as ex:
                 self.logger.warn("Failed to get {0} data sources, the error is: {1}".format("Hadoop", ex.message))
 
@@ -91,6 +62,37 @@ class DataSource(AlpineObject):
         else:
             return None
 
+    def iter_list(self, type=None, per_page=100, prefetch=True):
+        """
+        Iterate over the metadata of all data sources, fetching one page at a time as the records are consumed.
+        Database data sources are returned before Hadoop data sources.
+
+        :param str type: Type of the data source. Select "Database", "Hadoop", or None for both types.
+        :param int per_page: Maximum number to fetch with each API call.
+        :param bool prefetch: Fetch the next page in the background while the current one is consumed.
+        :return: Generator of data source's metadata.
+        :rtype: generator of dict
+
+        Example::
+
+            >>> for datasource_info in session.datasource.iter_list(type = "Database"):
+            >>>     print(datasource_info['name'])
+
+        """
+        payload = {"all": True, "per_page": per_page}
+        for ds_type, ds_path in (("Database", "data_sources"), ("Hadoop", "hdfs_data_sources")):
+            if type is not None and type != ds_type:
+                continue
+            url = "{0}/{1}".format(self.base_url, ds_path)
+            url = self._add_token_to_url(url)
+            self.logger.debug("Getting list of {0} data sources from {1}".format(ds_type, url))
+            try:
+                for datasource_info in self._iter_pages(url, payload, prefetch=prefetch,
+                                                        cache_key=("datasource", "list", ds_type)):
+                    yield datasource_info
+            except Exception as ex:
+                self.logger.warn("Failed to get {0} data sources, the error is: {1}".format(ds_type, ex))
+
     def get(self, ds_id, type):
         """
         Get one data source's metadata.
@@ -117,15 +119,17 @@ class DataSource(AlpineObject):
                             )
         url = self._add_token_to_url(url)
 
-        self.session.headers.update({"Content-Type": "application/json"})
+        cached_response = self._get_cached(("datasource", type, str(ds_id)))
+        if cached_response is not None:
+            return cached_response
 
-        r = self.session.get(url, verify=False)
+        r = self.session.get(url, headers=self._json_headers, verify=False)
         ds_response = r.json()
 
         try:
             if ds_response['response']:
                 self.logger.debug("Found {0} data source with ID: <{1}>".format(type, ds_id))
-                return ds_response['response']
+                return self._set_cached(("datasource", type, str(ds_id)), ds_response['response'])
             else:
                 raise DataSourceNotFoundException("{0} data source ID: <{1}> not found".format(type, ds_id))
         except Exception as err:
@@ -148,10 +152,10 @@ class DataSource(AlpineObject):
             786
 
         """
-        ds_list = self.get_list(type)
-        for ds_info in ds_list:
-            if ds_info['name'] == name:
-                return ds_info['id']
+        ds_id = self._find_id(("datasource", str(type)), name,
+                              lambda: self.iter_list(type, prefetch=False), lambda: self.iter_list(type))
+        if ds_id is not None:
+            return ds_id
         raise DataSourceNotFoundException("{0} data source with name '{1}' not found".format(type, name))
 
     def get_database_list(self, data_source_id, per_page=100):
@@ -170,30 +174,37 @@ class DataSource(AlpineObject):
             3
 
         """
-        database_list = None
         url = "{0}/data_sources/{1}/databases".format(self.base_url, data_source_id)
         url = self._add_token_to_url(url)
         self.logger.debug("Getting list of databases from {0}".format(url))
-        page_current = 0
-
-        self.session.headers.update({"Content-Type": "application/json"})
-
-        while True:
-            payload = {
-                "all": True,
-                "per_page": per_page,
-                "page": page_current + 1,
-            }
-            database_list_response = self.session.get(url, params=payload, verify=False).json()
-            page_total = database_list_response['pagination']['total']
-            page_current = database_list_response['pagination']['page']
-            if database_list:
-                database_list.extend(database_list_response['response'])
-            else:
-                database_list = database_list_response['response']
-            if page_total == page_current:
-                break
-        return database_list
+
+        payload = {"all": True, "per_page": per_page}
+        return self._get_all_pages(url, payload, cache_key=("database", "list", str(data_source_id)))
+
+    def iter_database_list(self, data_source_id, per_page=100, prefetch=True):
+        """
+        Iterate over the metadata of all databases in a data source, fetching one page at a time as the records
+        are consumed.
+
+        :param int data_source_id: ID of the data source.
+        :param int per_page: Maximum number to fetch with each API call.
+        :param bool prefetch: Fetch the next page in the background while the current one is consumed.
+        :return: Generator of database metadata.
+        :rtype: generator of dict
+
+        Example::
+
+            >>> for database in session.datasource.iter_database_list(data_source_id = 1):
+            >>>     print(database['name'])
+
+        """
+        url = "{0}/data_sources/{1}/databases".format(self.base_url, data_source_id)
+        url = self._add_token_to_url(url)
+        self.logger.debug("Getting list of databases from {0}".format(url))
+
+        payload = {"all": True, "per_page": per_page}
+        return self._iter_pages(url, payload, prefetch=prefetch,
+                                cache_key=("database", "list", str(data_source_id)))
 
     class DSType(object):
         """
@@ -137,6 +137,20 @@ class WorkflowVariableException(AlpineException):
     pass
 
 
+class WorkflowGraphException(AlpineException):
+    """
+
+    """
+    pass
+
+
+class DownloadChecksumException(AlpineException):
+    """
+
+    """
+    pass
+
+
 class InvalidResponseCodeException(AlpineException):
     """
 
@@ -0,0 +1,503 @@
+from __future__ import absolute_import
+
+import codecs
+import itertools
+import json
+import re
+try:
+    # For Python 3.3 and later
+    from collections.abc import Mapping
+except ImportError:
+    # Fall back to Python 2.7
+    from collections import Mapping
+
+from .exception import *
+
+# Everything up to the next bracket outside of a string: strings, scalars, commas and colons are skipped
+# by the regex engine, so walking a document only costs a Python step per bracket.
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_NEXT_BRACKET = re.compile(r'[^"\[\]{}]*(?:' + _STRING + r'[^"\[\]{}]*)*([\[\]{}])')
+# Same, but also skipping over arrays and objects that hold no other array or object, such as the rows of a
+# table. Used inside the values that aren't indexed, where only the closing bracket matters.
+_FLAT = r'[\[{][^"\[\]{}]*(?:' + _STRING + r'[^"\[\]{}]*)*[\]}]'
+_NEXT_NESTED_BRACKET = re.compile(r'[^"\[\]{}]*(?:(?:' + _STRING + '|' + _FLAT + r')[^"\[\]{}]*)*([\[\]{}])')
+# Tokens of the text directly inside an object: a string, marked as a key when followed by a colon, or a run
+# of text without strings such as a number, true, false or null and the separators around it.
+_SEGMENT_TOKEN = re.compile(r'(' + _STRING + r')\s*(:)?\s*|[^"]+')
+_BARE_SCALAR = re.compile(r'[-+.\w]+')
+# Text up to a string that isn't complete yet, used once no bracket is left outside of strings.
+_UP_TO_OPEN_STRING = re.compile(r'[^"]*(?:' + _STRING + r'[^"]*)*')
+# Contents of a string up to its closing quote, or up to an escape sequence cut by the end of the text.
+_STRING_CONTENTS = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*')
+
+
+class FlowResult(Mapping):
+    """
+    A downloaded workflow result that is decoded on demand. The raw JSON document is kept as is, and the first
+    access builds an index of where each top-level value and each operator output sits in it, together with
+    the operator names ('out_title') and IDs ('out_id'). Only the values that are then accessed are decoded,
+    so pulling the metadata and one or two operators out of a large result is cheap.
+
+    It can be used like the dict returned by :meth:`Workfile.Process.download_results`, including with
+    `find_operator` and `get_metadata`.
+
+    Example::
+
+        >>> flow_results = session.workfile.process.download_results(workflow_id, process_id, lazy=True)
+        >>> flow_results.get_metadata()['status']
+        'SUCCESS'
+        >>> confusion_matrix = flow_results.find_operator('Confusion Matrix')
+        >>> flow_results.operator_names()
+        ['magic04.csv', 'Random Sampling', 'Test Set', 'Train Set', 'Alpine Forest Classification', 'Confusion Matrix']
+
+    """
+
+    def __init__(self, raw):
+        """
+        :param str raw: JSON document of the workflow result.
+        """
+        self.raw = raw
+        self._spans = None
+        self._outputs = None
+        self._names = None
+        self._ids = None
+        self._values = {}
+        self._operators = {}
+
+    def __getitem__(self, key):
+        self._build_index()
+        if key not in self._values:
+            if key == 'outputs' and self._outputs is not None:
+                # Share the operators already decoded by find_operator.
+                self._values[key] = [self._operator(position) for position in range(0, len(self._outputs))]
+            else:
+                start, end = self._spans[key]
+                self._values[key] = json.loads(self.raw[start:end])
+        return self._values[key]
+
+    def __iter__(self):
+        self._build_index()
+        return iter(self._spans)
+
+    def __len__(self):
+        self._build_index()
+        return len(self._spans)
+
+    def __contains__(self, key):
+        self._build_index()
+        return key in self._spans
+
+    def __repr__(self):
+        return "FlowResult({0} bytes)".format(len(self.raw))
+
+    def get_metadata(self):
+        """
+        Returns the metadata of the workflow run. See :meth:`Workfile.Process.get_metadata`.
+
+        :return: Run metadata.
+        :rtype: dict
+        :exception FlowResultsMalformedException: Workflow result does not contain the key ['flowMetaInfo'].
+        """
+        try:
+            return self['flowMetaInfo']
+        except KeyError:
+            raise FlowResultsMalformedException("Workflow result does not contain the key ['flowMetaInfo']")
+
+    def find_operator(self, operator_name):
+        """
+        Returns the output of the first operator with the given name, decoding only that operator.
+
+        :param str operator_name: Operator name. Must be an exact match to the name in the workflow.
+        :return: Single operator data, or None if there is no such operator.
+        :rtype: dict
+        :exception FlowResultsMalformedException: Workflow result does not contain the key ['outputs'].
+        """
+        self._check_outputs()
+        position = self._names.get(operator_name)
+        return self._operator(position) if position is not None else None
+
+    def find_operator_by_id(self, operator_id):
+        """
+        Returns the output of the operator with the given ID ('out_id'), decoding only that operator.
+
+        :param operator_id: Operator ID.
+        :return: Single operator data, or None if there is no such operator.
+        :rtype: dict
+        :exception FlowResultsMalformedException: Workflow result does not contain the key ['outputs'].
+        """
+        self._check_outputs()
+        position = self._ids.get(operator_id)
+        return self._operator(position) if position is not None else None
+
+    def operator_names(self):
+        """
+        Returns the names of the operators with an output, in workflow result order, without decoding them.
+
+        :return: Operator names.
+        :rtype: list of str
+        :exception FlowResultsMalformedException: Workflow result does not contain the key ['outputs'].
+        """
+        self._check_outputs()
+        return [title for _, title, _ in self._outputs]
+
+    def to_dict(self):
+        """
+        Decodes the whole workflow result, as returned by :meth:`Workfile.Process.download_results`.
+
+        :return: JSON object of workflow results.
+        :rtype: dict
+        """
+        return json.loads(self.raw)
+
+    def _check_outputs(self):
+        self._build_index()
+        if self._outputs is None:
+            raise FlowResultsMalformedException("Workflow result does not contain the key ['outputs']")
+
+    def _operator(self, position):
+        if position not in self._operators:
+            start, end = self._outputs[position][0]
+            self._operators[position] = json.loads(self.raw[start:end])
+        return self._operators[position]
+
+    def _build_index(self):
+        """
+        Used internally to walk the raw document once and record the spans of the top-level values and of the
+        operator outputs.
+        """
+        if self._spans is not None:
+            return
+        indexer = _ResultIndexer()
+        spans = {}
+        outputs = None
+        for event in indexer.feed(self.raw):
+            if event[0] == 'value':
+                spans[event[1]] = event[2]
+            elif event[0] == 'outputs':
+                outputs = []
+            else:
+                outputs.append(event[1:])
+
+        self._outputs = outputs
+        if outputs is not None:
+            self._names = {}
+            self._ids = {}
+            for position, (_, title, out_id) in enumerate(outputs):
+                self._names.setdefault(title, position)
+                self._ids.setdefault(out_id, position)
+        self._spans = spans
+
+
+class _ResultIndexer(object):
+    """
+    Walks a workflow result document, bracket by bracket, and reports where each top-level value and each
+    operator output is. Only the text directly inside the top-level object and inside each operator output is
+    looked at, to read keys, names and IDs. The document can be fed in chunks: scanning stops before anything
+    that may be cut by the end of the chunk and resumes with the next one. The chunks of a long string are only
+    checked for its closing quote, and added to the buffer once it is found, so that the string is scanned once.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        # Document position of buffer[0]
+        self.offset = 0
+        # Buffer position where scanning resumes
+        self.pos = 0
+        # One frame per open bracket: [bracket, document position, key of the container in its parent,
+        #                              name and ID of an operator output]
+        self.stack = []
+        self.pending_key = None
+        self.in_outputs = False
+        self.done = False
+        # Chunks received since the start of a string that isn't complete yet, None when there is no such string
+        self.open_string = None
+        # Whether the chunks of the open string end in the middle of an escape sequence
+        self.open_escape = False
+
+    def text(self, span):
+        """
+        :param tuple span: Document positions of the start and end of a value.
+        :return: The text of the value, which must not have been discarded.
+        :rtype: str
+        """
+        return self.buffer[span[0] - self.offset:span[1] - self.offset]
+
+    def discard(self, position):
+        """
+        Drops the text before a document position, or before the scanning position if that comes first.
+
+        :param int position: Document position of the first character to keep.
+        :return: None
+        """
+        cut = min(position - self.offset, self.pos)
+        if cut > 0:
+            self.buffer = self.buffer[cut:]
+            self.offset += cut
+            self.pos -= cut
+
+    def feed(self, text):
+        """
+        Scans more of the document.
+
+        :param str text: Next chunk of the document.
+        :return: Events in document order: ('value', key, span) for a top-level value, ('outputs',) when the
+                 'outputs' array starts, and ('output', span, title, out_id) for an operator output.
+        :rtype: list of tuple
+        """
+        if self.done:
+            return []
+        if self.open_string is not None:
+            if not self._closes_open_string(text):
+                return []
+            text = "".join(self.open_string) + text
+            self.open_string = None
+        self.buffer += text
+        buffer = self.buffer
+        offset = self.offset
+        stack = self.stack
+        events = []
+        pos = self.pos
+        match = self._next_bracket(pos)
+        while match is not None:
+            bracket = match.group(1)
+            at = match.start(1)
+            depth = len(stack)
+            if self._reads_keys():
+                self._read_segment(pos, at, events, complete=True)
+
+            if bracket in '[{':
+                key = self.pending_key if depth in (1, 3) else None
+                stack.append([bracket, offset + at, key, {}])
+                if depth == 1 and key == 'outputs' and bracket == '[':
+                    self.in_outputs = True
+                    events.append(('outputs',))
+                self.pending_key = None
+            elif stack:
+                frame = stack.pop()
+                depth = len(stack)
+                span = (frame[1], offset + at + 1)
+                if depth == 1 and frame[2] is not None:
+                    events.append(('value', frame[2], span))
+                    if frame[2] == 'outputs':
+                        self.in_outputs = False
+                elif depth == 2 and self.in_outputs and frame[0] == '{':
+                    events.append(('output', span, frame[3].get('out_title'), frame[3].get('out_id')))
+                if not stack:
+                    self.done = True
+                    pos = match.end()
+                    break
+            pos = match.end()
+            match = self._next_bracket(pos)
+
+        if not self.done:
+            # Everything up to a string cut by the end of the chunk is known to hold no bracket, don't scan it again.
+            open_at = _UP_TO_OPEN_STRING.match(buffer, pos).end()
+            if self._reads_keys():
+                pos = self._read_segment(pos, open_at, events, complete=False)
+            else:
+                pos = open_at
+            if open_at < len(buffer):
+                self.open_string = []
+                self.open_escape = _STRING_CONTENTS.match(buffer, open_at + 1).end() < len(buffer)
+        self.pos = pos
+        return events
+
+    def _closes_open_string(self, text):
+        """
+        Checks the next chunk of an open string for its closing quote, carrying on from the end of the previous
+        chunk. A chunk that doesn't close the string is kept aside.
+
+        :return: True if the chunk holds the closing quote.
+        :rtype: bool
+        """
+        if not text:
+            return False
+        contents_end = _STRING_CONTENTS.match(text, 1 if self.open_escape else 0).end()
+        if contents_end < len(text) and text[contents_end] == '"':
+            return True
+        self.open_string.append(text)
+        self.open_escape = contents_end < len(text)
+        return False
+
+    def _read_segment(self, start, end, events, complete):
+        """
+        Reads the keys and scalar values between two buffer positions, directly inside the top-level object or an
+        operator output.
+
+        :param bool complete: Whether the text ends at a bracket. Otherwise the last token may be cut by the end of
+                              the chunk and is left for the next call.
+        :return: Buffer position where reading stopped.
+        :rtype: int
+        """
+        buffer = self.buffer
+        offset = self.offset
+        stack = self.stack
+        depth = len(stack)
+        key = self.pending_key
+        stop = start
+        for token in _SEGMENT_TOKEN.finditer(buffer, start, end):
+            if not complete and token.end() == end:
+                break
+            stop = token.end()
+            if token.group(2):
+                key = json.loads(token.group(1))
+                continue
+            if key is None:
+                continue
+            scalar = token if token.group(1) else _BARE_SCALAR.match(buffer, token.start(), end)
+            if scalar is not None:
+                value_start, value_end = scalar.span(1) if token.group(1) else scalar.span()
+                if depth == 1:
+                    events.append(('value', key, (offset + value_start, offset + value_end)))
+                elif key in ('out_title', 'out_id'):
+                    stack[2][3][key] = json.loads(buffer[value_start:value_end])
+            key = None
+        else:
+            stop = end
+        # A key left without a value here is the key of the array or object that follows.
+        self.pending_key = key
+        return stop
+
+    def _reads_keys(self):
+        # Inside the top-level object or an operator output.
+        depth = len(self.stack)
+        return depth == 1 or (depth == 3 and self.in_outputs and self.stack[2][0] == '{')
+
+    def _reads_segments(self):
+        # Keys and scalars are read directly inside the top-level object and the operator outputs.
+        depth = len(self.stack)
+        return depth <= 1 or (depth <= 3 and self.in_outputs)
+
+    def _next_bracket(self, pos):
+        if self._reads_segments():
+            return _NEXT_BRACKET.match(self.buffer, pos)
+        # Nothing is read inside this value, skip over what can be skipped.
+        return _NEXT_NESTED_BRACKET.match(self.buffer, pos)
+
+
+class _StringLiteralDecoder(object):
+    """
+    Decodes, chunk by chunk, a response body holding the workflow result as a JSON string literal, i.e. the
+    result document with its quotes and backslashes escaped. Escape sequences cut by the end of a chunk are kept
+    for the next one. A body that isn't a string literal is passed through as is.
+    """
+
+    _HIGH_SURROGATE = re.compile(r'\\u[dD][89abAB][0-9a-fA-F]{2}')
+
+    def __init__(self):
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.pending = ""
+        self.literal = None
+        self.done = False
+
+    def feed(self, data, final=False):
+        """
+        :param bytes data: Next chunk of the response body.
+        :param bool final: True for the last chunk.
+        :return: The next part of the result document.
+        :rtype: str
+        """
+        text = self.pending + self.decoder.decode(data, final)
+        self.pending = ""
+        if self.literal is None:
+            stripped = text.lstrip()
+            if not stripped:
+                return ""
+            self.literal = stripped[0] == '"'
+            text = stripped[1:] if self.literal else stripped
+        if self.done:
+            return ""
+        if not self.literal:
+            return text
+
+        # Quotes inside the literal are all escaped, so an unescaped quote can only be the closing one.
+        stripped = text.rstrip()
+        if stripped.endswith('"') and self._escape_start(stripped, len(stripped) - 1) is None:
+            self.done = True
+            end = len(stripped) - 1
+        else:
+            end = self._complete_end(text, final)
+            self.pending = text[end:]
+        return json.loads('"{0}"'.format(text[:end]))
+
+    @staticmethod
+    def _escape_start(text, position):
+        """
+        Returns the start of the escape sequence the character at `position` is part of, or None.
+        """
+        backslash = text.rfind('\\', max(0, position - 5), position)
+        while backslash >= 0:
+            run_start = backslash
+            while run_start > 0 and text[run_start - 1] == '\\':
+                run_start -= 1
+            if (backslash - run_start) % 2 == 0:
+                # An odd run of backslashes: the last one starts an escape sequence.
+                length = 6 if text[backslash + 1:backslash + 2] == 'u' else 2
+                return backslash if backslash + length > position else None
+            if run_start == 0:
+                return None
+            backslash = text.rfind('\\', max(0, position - 5), run_start)
+        return None
+
+    def _complete_end(self, text, final):
+        """
+        Returns where the text stops holding complete characters and escape sequences. An escape sequence cut by
+        the end of the chunk, or the first half of a surrogate pair, is left for the next chunk.
+        """
+        end = len(text)
+        if final or not end:
+            return end
+        start = self._escape_start(text, end)
+        if start is not None:
+            end = start
+        start = self._escape_start(text, end - 1) if end else None
+        if start is not None and start == end - 6 and self._HIGH_SURROGATE.match(text, start):
+            return start
+        return end
+
+
+def stream_flow_result(chunks, operator_names=None, metadata=True):
+    """
+    Decodes the parts of a workflow result needed by the caller while it is being downloaded, and stops as soon
+    as it has them all. Only the operator output being read is held in memory at any time.
+
+    :param chunks: Iterable of the bytes of the response body.
+    :param list operator_names: Names of the operators whose output to return.
+    :param bool metadata: Return the run metadata.
+    :return: A workflow result with only the requested parts: 'flowMetaInfo' if `metadata` is True, and
+             'outputs' with the first output of each of `operator_names` found, in workflow result order.
+    :rtype: dict
+    :exception ResultsNotFoundException: The result is empty.
+    """
+    wanted = set(operator_names or [])
+    flow_results = {}
+    if wanted:
+        flow_results['outputs'] = []
+    literal_decoder = _StringLiteralDecoder()
+    indexer = _ResultIndexer()
+    found_any = False
+
+    for data in itertools.chain(chunks, [None]):
+        text = literal_decoder.feed(data or b"", final=data is None)
+        found_any = found_any or bool(text.strip())
+        for event in indexer.feed(text):
+            if event[0] == 'value' and event[1] == 'flowMetaInfo' and metadata:
+                flow_results['flowMetaInfo'] = json.loads(indexer.text(event[2]))
+            elif event[0] == 'output' and event[2] in wanted:
+                wanted.discard(event[2])
+                flow_results['outputs'].append(json.loads(indexer.text(event[1])))
+        if indexer.done or found_any and not wanted and (not metadata or 'flowMetaInfo' in flow_results):
+            break
+
+        # Keep the text of the value being read if it may be needed, drop the rest.
+        stack = indexer.stack
+        if len(stack) >= 2 and stack[1][2] == 'flowMetaInfo' and metadata:
+            indexer.discard(stack[1][1])
+        elif len(stack) >= 3 and indexer.in_outputs and wanted:
+            indexer.discard(stack[2][1])
+        else:
+            indexer.discard(indexer.offset + indexer.pos)
+
+    if not found_any:
+        raise ResultsNotFoundException("The workflow result is empty")
+    return flow_results
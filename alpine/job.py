@@ -66,8 +66,6 @@ class Job(AlpineObject):
         url = "{0}/workspaces/{1}/jobs".format(self.base_url, workspace_id)
         url = self._add_token_to_url(url)
 
-        self.session.headers.update({"Content-Type": "application/x-www-form-urlencoded"})
-
         # Building the payload information to send with our HTTP POST to create the job
         payload = {"name": job_name,
                    "interval_unit": schedule_type,
@@ -82,6 +80,8 @@ class Job(AlpineObject):
         # Posting the payload via HTTP POST
         self.logger.debug("POSTing payload {0} to URL {1}".format(payload, url))
         response = self.session.post(url, data=payload, verify=False)
+        self._invalidate_id_index("job", str(workspace_id))
+        self._invalidate_cached(("job", "list", str(workspace_id)))
         self.logger.debug("Received response code {0} with reason {1}...".format(response.status_code, response.reason))
         try:
             return response.json()['response']
@@ -115,6 +115,9 @@ class Job(AlpineObject):
                               format(response.status_code, response.reason)
                               )
             if response.status_code == 200:
+                self._invalidate_id_index("job", str(workspace_id))
+                self._invalidate_id_index("task", str(workspace_id), str(job_id))
+                self._invalidate_cached(("job", str(workspace_id), str(job_id)), ("job", "list", str(workspace_id)))
                 self.logger.debug("Job successfully deleted.")
             else:
                 raise InvalidResponseCodeException("Response code invalid, the expected response code is {0}, "
@@ -137,27 +140,32 @@ class Job(AlpineObject):
             >>> all_jobs = session.job.get_list(workspace_id = 1672)
 
         """
-        jobs_list = None
         url = "{0}/workspaces/{1}/jobs".format(self.base_url, workspace_id)
         url = self._add_token_to_url(url)
-        page_current = 0
-        if self.session.headers.get("Content-Type") is not None:
-            self.session.headers.pop("Content-Type")
-        while True:
-            payload = {
-                   "per_page": per_page,
-                   "page": page_current + 1,
-                   }
-            job_list_response = self.session.get(url, data=json.dumps(payload), verify=False).json()
-            page_total = job_list_response['pagination']['total']
-            page_current = job_list_response['pagination']['page']
-            if jobs_list:
-                jobs_list.extend(job_list_response['response'])
-            else:
-                jobs_list = job_list_response['response']
-            if page_total == page_current:
-                break
-        return jobs_list
+        payload = {"per_page": per_page}
+        return self._get_all_pages(url, payload, use_params=False, cache_key=("job", "list", str(workspace_id)))
+
+    def iter_list(self, workspace_id, per_page=50, prefetch=True):
+        """
+        Iterate over all jobs in a workspace, fetching one page at a time as the records are consumed.
+
+        :param int workspace_id: ID of the workspace.
+        :param int per_page: Maximum number to fetch with each API call.
+        :param bool prefetch: Fetch the next page in the background while the current one is consumed.
+        :return: Generator of jobs' metadata.
+        :rtype: generator of dict
+
+        Example::
+
+            >>> for job_info in session.job.iter_list(workspace_id = 1672):
+            >>>     print(job_info['name'])
+
+        """
+        url = "{0}/workspaces/{1}/jobs".format(self.base_url, workspace_id)
+        url = self._add_token_to_url(url)
+        payload = {"per_page": per_page}
+        return self._iter_pages(url, payload, use_params=False, prefetch=prefetch,
+                                cache_key=("job", "list", str(workspace_id)))
 
     def get(self, workspace_id, job_id):
         """
@@ -173,19 +181,20 @@ class Job(AlpineObject):
             >>> job_info = session.job.get(workspace_id = 1672, job_id = 675)
 
         """
+        cached_response = self._get_cached(("job", str(workspace_id), str(job_id)))
+        if cached_response is not None:
+            return cached_response
+
         url = "{0}/workspaces/{1}/jobs/{2}".format(self.base_url, workspace_id, job_id)
         url = self._add_token_to_url(url)
 
-        if self.session.headers.get("Content-Type") is not None:
-            self.session.headers.pop("Content-Type")
-
         r = self.session.get(url, verify=False)
         job_response = r.json()
 
         try:
             if job_response['response']:
                 self.logger.debug("Found job ID: <{0}>".format(job_id))
-                return job_response['response']
+                return self._set_cached(("job", str(workspace_id), str(job_id)), job_response['response'])
             else:
                 raise JobNotFoundException("Job ID: <{0}> not found".format(job_id))
         except Exception as err:
@@ -207,10 +216,11 @@ class Job(AlpineObject):
             675
 
         """
-        job_list = self.get_list(workspace_id)
-        for job_info in job_list:
-            if job_info['name'] == job_name:
-                return job_info['id']
+        job_id = self._find_id(("job", str(workspace_id)), job_name,
+                               lambda: self.iter_list(workspace_id, prefetch=False),
+                               lambda: self.get_list(workspace_id))
+        if job_id is not None:
+            return job_id
         raise JobNotFoundException("Job {0} not found".format(job_name))
 
     def run(self, job_id):
@@ -228,12 +238,9 @@ class Job(AlpineObject):
         """
         url = "{0}/jobs/{1}/run?saveResult=true".format(self.base_url, job_id)
 
-        self.session.headers.update({"x-token": self.token})
-        self.session.headers.update({"Content-Type": "application/json"})
+        response = self.session.post(url, headers={"x-token": self.token, "Content-Type": "application/json"},
+                                     timeout=30)
 
-        response = self.session.post(url, timeout=30)
-
-        self.session.headers.pop("Content-Type")
         self.logger.debug(response.content)
         if response.status_code == 202:
             job = response.json()['response']
@@ -281,13 +288,14 @@ class Job(AlpineObject):
             url = self._add_token_to_url(url)
             self.logger.debug("The URL that we will be posting is: {0}".format(url))
 
-            self.session.headers.update({"Content-Type": "application/x-www-form-urlencoded"})
-
             # constructing the payload for adding a task
             payload = {"action": task_type, "workfile_id": workfile_id}
 
             self.logger.debug("POSTing payload {0} to URL {1}".format(payload, url))
             response = self.session.post(url, data=payload, verify=False)
+            self._invalidate_id_index("task", str(workspace_id), str(job_id))
+            # The job metadata lists its tasks.
+            self._invalidate_cached(("job", str(workspace_id), str(job_id)), ("job", "list", str(workspace_id)))
             self.logger.debug(
                 "Received response code {0} with reason {1}...".format(response.status_code, response.reason))
             try:
@@ -321,6 +329,9 @@ class Job(AlpineObject):
                 self.logger.debug(
                     "Received response code {0} with reason {1}...".format(response.status_code, response.reason))
                 if response.status_code == 200:
+                    self._invalidate_id_index("task", str(workspace_id), str(job_id))
+                    self._invalidate_cached(("job", str(workspace_id), str(job_id)),
+                                            ("job", "list", str(workspace_id)))
                     self.logger.debug("Task successfully deleted.")
                 else:
                     raise InvalidResponseCodeException("Response code invalid. the expected response code is {0}, "
@@ -350,9 +361,6 @@ class Job(AlpineObject):
             url = "{0}/workspaces/{1}/jobs/{2}".format(self.base_url, workspace_id, job_id)
             url = self._add_token_to_url(url)
 
-            if self.session.headers.get("Content-Type") is not None:
-                self.session.headers.pop("Content-Type")
-
             # Doing a HTTP GET
             self.logger.debug("POSTing a HTTP GET to retrieve the tasks on the workspace.")
             response = self.session.get(url)
@@ -400,11 +408,10 @@ class Job(AlpineObject):
                 344
 
             """
-            task_list = self.get_list(workspace_id, job_id)
-            for task in task_list:
-                if task['name'] == task_name:
-                    return int(task['id'])
-            # return None
+            list_tasks = lambda: self.get_list(workspace_id, job_id)
+            task_id = self._find_id(("task", str(workspace_id), str(job_id)), task_name, list_tasks, list_tasks)
+            if task_id is not None:
+                return int(task_id)
             raise TaskNotFoundException("The task with name: {0} does not exist".format(task_name))
 
     class ScheduleType(object):
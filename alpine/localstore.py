@@ -0,0 +1,286 @@
+from __future__ import absolute_import
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+
+class LocalStore(object):
+    """
+    A small SQLite database kept on the client, for what the client remembers across sessions. It holds the
+    workflow runs started for memoization or coalescing: the key of each run, which hashes the workflow, its
+    version and its variables, maps to the process ID of the run. The run is marked ended once a status query
+    finds it over, and finished once its successful results have been downloaded. It also holds the content hash
+    of the workfiles uploaded, so that unchanged workfiles aren't uploaded again.
+
+    The default path, ":memory:", keeps the store for the lifetime of the client only. Several clients, including
+    in other processes, can share the same database file.
+
+    Example::
+
+        >>> store = LocalStore("~/.alpine/store.db")
+        >>> key = store.run_key(375, "2017-10-02T18:45:38Z", [{"name": "@min_credit_line", "value": "7"}])
+        >>> store.find_run(key)
+        'e8cd3d3e-8c6d-4c4d-a5a3-0a8d1d1e2b9f'
+
+    """
+
+    def __init__(self, path=":memory:"):
+        """
+        :param str path: Path of the SQLite database file, created if missing, or ":memory:".
+        """
+        self.path = path if path == ":memory:" else os.path.expanduser(path)
+        self._lock = threading.RLock()
+        # Shared by the threads of the client, every use is under the lock.
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS runs ("
+                                     "key TEXT NOT NULL, "
+                                     "process_id TEXT NOT NULL, "
+                                     "workflow_id TEXT NOT NULL, "
+                                     "started_at REAL NOT NULL, "
+                                     "finished_at REAL, "
+                                     "ended_at REAL, "
+                                     "PRIMARY KEY (key, process_id))")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS runs_process_id ON runs (process_id)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS uploads ("
+                                     "workspace_id TEXT NOT NULL, "
+                                     "file_name TEXT NOT NULL, "
+                                     "content_hash TEXT NOT NULL, "
+                                     "workfile_id TEXT NOT NULL, "
+                                     "version TEXT NOT NULL, "
+                                     "uploaded_at REAL NOT NULL, "
+                                     "PRIMARY KEY (workspace_id, file_name))")
+        # Runs being started by this client, by key.
+        self._starting = {}
+
+    def close(self):
+        """
+        Closes the database.
+
+        :return: None
+        """
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def run_key(workflow_id, version, variables=None):
+        """
+        Returns the key of a run, which is the same for every run of the same version of a workflow with the same
+        variables, whatever their order.
+
+        :param workflow_id: ID of the workflow.
+        :param str version: Version of the workflow, or None to leave it out of the key.
+        :param list variables: Workflow variables in the format of :meth:`Workfile.Process.run`.
+        :return: Hex digest of the run.
+        :rtype: str
+        """
+        canonical_variables = sorted([str(variable["name"]), str(variable["value"])] for variable in variables or [])
+        canonical_run = json.dumps({"workflow_id": str(workflow_id), "version": version,
+                                    "variables": canonical_variables}, sort_keys=True)
+        return hashlib.sha256(canonical_run.encode("utf-8")).hexdigest()
+
+    def find_run(self, key, max_age=None):
+        """
+        Returns the process ID of the latest finished run with a key.
+
+        :param str key: Key of the run, see :meth:`run_key`.
+        :param float max_age: Ignore runs that finished more than this number of seconds ago. None for no limit.
+        :return: Process ID of the run, or None if no run with this key has finished.
+        :rtype: str
+        """
+        finished_after = time.time() - max_age if max_age is not None else 0
+        with self._lock:
+            row = self._connection.execute("SELECT process_id FROM runs WHERE key = ? AND finished_at >= ? "
+                                           "ORDER BY finished_at DESC LIMIT 1", (key, finished_after)).fetchone()
+        return row[0] if row is not None else None
+
+    def start_run(self, key, workflow_id, process_id):
+        """
+        Records a new run. It is reused by :meth:`find_run` once marked finished by :meth:`finish_run`.
+
+        :param str key: Key of the run, see :meth:`run_key`.
+        :param workflow_id: ID of the workflow.
+        :param str process_id: ID of the workflow run.
+        :return: None
+        """
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO runs (key, process_id, workflow_id, started_at) "
+                                     "VALUES (?, ?, ?, ?)", (key, process_id, str(workflow_id), time.time()))
+
+    def finish_run(self, process_id):
+        """
+        Marks a run as finished, making it available to :meth:`find_run`. Runs that weren't recorded by
+        :meth:`start_run` are ignored.
+
+        :param str process_id: ID of the workflow run.
+        :return: None
+        """
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE runs SET finished_at = ? WHERE process_id = ? AND finished_at IS NULL",
+                                     (time.time(), process_id))
+
+    def end_run(self, process_id):
+        """
+        Marks a run as over, so that it isn't joined by :meth:`coalesce_run` anymore. It isn't reused by
+        :meth:`find_run` either until marked finished by :meth:`finish_run`.
+
+        :param str process_id: ID of the workflow run.
+        :return: None
+        """
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE runs SET ended_at = ? WHERE process_id = ? AND ended_at IS NULL",
+                                     (time.time(), process_id))
+
+    def abandon_run(self, process_id):
+        """
+        Removes a run that failed or was stopped, so that it is neither reused nor joined.
+
+        :param str process_id: ID of the workflow run.
+        :return: None
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM runs WHERE process_id = ?", (process_id,))
+
+    def find_running_run(self, key, max_age):
+        """
+        Returns the process ID of the latest run with a key that was started and isn't over.
+
+        :param str key: Key of the run, see :meth:`run_key`.
+        :param float max_age: Ignore runs started more than this number of seconds ago.
+        :return: Process ID of the run, or None.
+        :rtype: str
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT process_id FROM runs WHERE key = ? AND finished_at IS NULL AND "
+                                           "ended_at IS NULL AND started_at >= ? ORDER BY started_at DESC LIMIT 1",
+                                           (key, time.time() - max_age)).fetchone()
+        return row[0] if row is not None else None
+
+    def coalesce_run(self, key, workflow_id, start, max_age):
+        """
+        Starts a run unless a run with the same key is already running, in which case the process ID of that run
+        is returned instead. Callers asking for the same run while it is being started wait for its process ID,
+        so that concurrent identical submissions of the client start a single run. Clients sharing the database
+        file join the run once it has started, until it is marked over by :meth:`end_run`.
+
+        :param str key: Key of the run, see :meth:`run_key`.
+        :param workflow_id: ID of the workflow.
+        :param start: Function that starts the run and returns its process ID.
+        :param float max_age: Don't join runs started more than this number of seconds ago.
+        :return: Process ID of the run.
+        :rtype: str
+        """
+        leader = False
+        with self._lock:
+            starting = self._starting.get(key)
+            if starting is None:
+                process_id = self.find_running_run(key, max_age)
+                if process_id is not None:
+                    return process_id
+                starting = self._starting[key] = Future()
+                leader = True
+        if not leader:
+            # Raises the error of the start as well.
+            return starting.result()
+
+        try:
+            process_id = start()
+            self.start_run(key, workflow_id, process_id)
+        except Exception as err:
+            starting.set_exception(err)
+            raise
+        else:
+            starting.set_result(process_id)
+        finally:
+            with self._lock:
+                del self._starting[key]
+        return process_id
+
+    def forget_runs(self, workflow_id=None):
+        """
+        Removes the recorded runs of a workflow, or of every workflow.
+
+        :param workflow_id: ID of the workflow. None for every workflow.
+        :return: Number of removed runs.
+        :rtype: int
+        """
+        with self._lock, self._connection:
+            if workflow_id is None:
+                cursor = self._connection.execute("DELETE FROM runs")
+            else:
+                cursor = self._connection.execute("DELETE FROM runs WHERE workflow_id = ?", (str(workflow_id),))
+            return cursor.rowcount
+
+    @staticmethod
+    def file_hash(path, extra=None, chunk_size=1024 * 1024):
+        """
+        Returns the content hash of a file, read a chunk at a time.
+
+        :param str path: Path of the file.
+        :param extra: JSON-serializable value hashed along with the file content, e.g. upload options.
+        :param int chunk_size: Number of bytes read at a time.
+        :return: Hex digest of the file.
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as hashed_file:
+            for chunk in iter(lambda: hashed_file.read(chunk_size), b""):
+                digest.update(chunk)
+        if extra is not None:
+            digest.update(json.dumps(extra, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def find_upload(self, workspace_id, file_name):
+        """
+        Returns the last recorded upload of a file to a workspace.
+
+        :param workspace_id: ID of the workspace.
+        :param str file_name: Name of the uploaded file.
+        :return: The 'content_hash' of the file, the 'workfile_id' and 'version' of the workfile created, and the
+                 'uploaded_at' time, or None if the file wasn't uploaded to the workspace.
+        :rtype: dict
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT content_hash, workfile_id, version, uploaded_at FROM uploads "
+                                           "WHERE workspace_id = ? AND file_name = ?",
+                                           (str(workspace_id), file_name)).fetchone()
+        if row is None:
+            return None
+        return {"content_hash": row[0], "workfile_id": row[1], "version": row[2], "uploaded_at": row[3]}
+
+    def record_upload(self, workspace_id, file_name, content_hash, workfile_id, version):
+        """
+        Records the upload of a file to a workspace, replacing the previous upload of the same file.
+
+        :param workspace_id: ID of the workspace.
+        :param str file_name: Name of the uploaded file.
+        :param str content_hash: Content hash of the file, see :meth:`file_hash`.
+        :param workfile_id: ID of the workfile created.
+        :param str version: Version of the workfile created.
+        :return: None
+        """
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO uploads (workspace_id, file_name, content_hash, "
+                                     "workfile_id, version, uploaded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                                     (str(workspace_id), file_name, content_hash, str(workfile_id), version,
+                                      time.time()))
+
+    def forget_uploads(self, workspace_id=None):
+        """
+        Removes the recorded uploads to a workspace, or to every workspace.
+
+        :param workspace_id: ID of the workspace. None for every workspace.
+        :return: Number of removed uploads.
+        :rtype: int
+        """
+        with self._lock, self._connection:
+            if workspace_id is None:
+                cursor = self._connection.execute("DELETE FROM uploads")
+            else:
+                cursor = self._connection.execute("DELETE FROM uploads WHERE workspace_id = ?", (str(workspace_id),))
+            return cursor.rowcount
@@ -0,0 +1,130 @@
+from __future__ import absolute_import
+
+import os
+import uuid
+
+
+class MultipartEncoder(object):
+    """
+    A multipart/form-data request body that is read from the files while it is being sent, instead of being built
+    in memory, so that uploading large files keeps the memory use flat. Pass it as the `data` of a requests call,
+    with its `content_type` as the Content-Type header. Its length is known up front, so the request has a
+    Content-Length and isn't chunked.
+
+    Each file is opened when the body reaches it and closed as soon as it has been read, or when the encoder is
+    closed. Use it as a context manager so that files are closed even if the request fails.
+
+    Example::
+
+        >>> with MultipartEncoder([("workfile[entity_subtype]", "alpine")],
+        >>>                       [("workfile[versions_attributes][0][contents]", "/tmp/flow.afm")],
+        >>>                       progress=lambda sent, total: print(sent, total)) as body:
+        >>>     response = session.post(url, data=body, headers={"Content-Type": body.content_type})
+
+    """
+
+    def __init__(self, fields, files, boundary=None, chunk_size=64 * 1024, progress=None):
+        """
+        :param list fields: Form fields, as (name, value) tuples.
+        :param list files: Files, as (name, path) tuples.
+        :param str boundary: Boundary between the parts. Defaults to a random one.
+        :param int chunk_size: Number of bytes read from the files at a time.
+        :param progress: Function called as the body is read with the number of bytes sent so far and the total
+                         length of the body.
+        """
+        self.boundary = boundary or uuid.uuid4().hex
+        self.content_type = "multipart/form-data; boundary={0}".format(self.boundary)
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.sent = 0
+
+        # Parts are either bytes, or the path of a file and its size.
+        self._parts = []
+        for name, value in fields:
+            self._parts.append(self._part_header(name) + self._encode(value) + b"\r\n")
+        for name, path in files:
+            self._parts.append(self._part_header(name, os.path.basename(path)))
+            self._parts.append((path, os.path.getsize(path)))
+            self._parts.append(b"\r\n")
+        self._parts.append("--{0}--\r\n".format(self.boundary).encode("utf-8"))
+        self.len = sum(part[1] if isinstance(part, tuple) else len(part) for part in self._parts)
+
+        self._chunks = self._iter_chunks()
+        self._buffer = bytearray()
+
+    def __len__(self):
+        return self.len
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, bytes):
+            return value
+        if not isinstance(value, type(u"")):
+            value = str(value)
+        return value.encode("utf-8")
+
+    def _part_header(self, name, filename=None):
+        # Quotes can't be escaped in these headers, they are percent-encoded like browsers do.
+        disposition = 'form-data; name="{0}"'.format(name.replace('"', "%22"))
+        header = "--{0}\r\nContent-Disposition: {1}".format(self.boundary, disposition)
+        if filename is not None:
+            header += '; filename="{0}"\r\nContent-Type: application/octet-stream'.format(filename.replace('"', "%22"))
+        return self._encode(header + "\r\n\r\n")
+
+    def _iter_chunks(self):
+        for part in self._parts:
+            if not isinstance(part, tuple):
+                yield part
+                continue
+            path, size = part
+            with open(path, "rb") as part_file:
+                remaining = size
+                while remaining > 0:
+                    chunk = part_file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        raise IOError("{0} was truncated while it was being uploaded".format(path))
+                    remaining -= len(chunk)
+                    yield chunk
+
+    def read(self, size=-1):
+        """
+        Returns the next bytes of the body.
+
+        :param int size: Maximum number of bytes to return, or -1 for the rest of the body.
+        :return: Up to `size` bytes, or an empty bytes object at the end of the body.
+        :rtype: bytes
+        """
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self.sent += len(data)
+        if self.progress is not None and data:
+            self.progress(self.sent, self.len)
+        return data
+
+    def close(self):
+        """
+        Closes the file being read, if any.
+
+        :return: None
+        """
+        self._chunks.close()
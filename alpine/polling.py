@@ -0,0 +1,291 @@
+from __future__ import absolute_import
+
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from .cache import TTLCache
+from .exception import *
+
+
+class PollSchedule(object):
+    """
+    Delays between the status queries of a running workflow. Polls start fast so that short runs are noticed
+    quickly, then back off exponentially up to a cap so that long runs don't load the server. Each delay is
+    randomized by a small jitter, so that many clients polling at once spread out their queries.
+
+    When the expected duration of the run is known, e.g. from previous runs of the same workflow, the first
+    poll is made around the expected end and fast polling starts from there.
+
+    Example::
+
+        >>> schedule = PollSchedule(initial_delay=0.5, max_delay=10, jitter=0)
+        >>> [round(schedule.next_delay(0), 1) for i in range(0, 6)]
+        [0.5, 1.0, 2.0, 4.0, 8.0, 10.0]
+
+    """
+
+    def __init__(self, initial_delay=0.5, max_delay=10, backoff=2.0, jitter=0.1, expected_duration=None):
+        """
+        :param float initial_delay: Number of seconds before the first poll.
+        :param float max_delay: Maximum number of seconds between two polls.
+        :param float backoff: Factor applied to the delay after each poll.
+        :param float jitter: Relative amount of randomization of each delay, e.g. 0.1 for +/-10%.
+        :param float expected_duration: Expected run time in seconds, or None if unknown.
+        """
+        self.initial_delay = min(initial_delay, max_delay)
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.jitter = jitter
+        self.expected_duration = expected_duration
+        self._delay = self.initial_delay
+
+    def next_delay(self, elapsed):
+        """
+        Returns the number of seconds to wait before the next poll.
+
+        :param float elapsed: Number of seconds since the run started.
+        :return: Delay in seconds.
+        :rtype: float
+        """
+        if self.expected_duration is not None:
+            remaining = self.expected_duration - elapsed
+            if remaining > self.initial_delay:
+                # Sleep until the expected end, then poll fast again.
+                self._delay = self.initial_delay
+                return self._jittered(min(remaining, self.max_delay))
+
+        delay = self._delay
+        self._delay = min(self._delay * self.backoff, self.max_delay)
+        return self._jittered(delay)
+
+    def _jittered(self, delay):
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(0, min(delay, self.max_delay))
+
+
+class RunHistory(TTLCache):
+    """
+    A :class:`TTLCache` of the recent run durations of workflows, used to seed the :class:`PollSchedule` of
+    the next run of the same workflow. Durations are kept as a moving average, so that one unusual run only
+    partly shifts the estimate.
+    """
+
+    def __init__(self, ttl=86400, max_size=256, weight=0.5):
+        """
+        :param float ttl: Number of seconds a workflow's duration is remembered after its last run.
+        :param int max_size: Maximum number of workflows remembered.
+        :param float weight: Weight of the latest run in the moving average, between 0 and 1.
+        """
+        super(RunHistory, self).__init__(ttl, max_size)
+        self.weight = weight
+
+    def record(self, workflow_id, duration):
+        """
+        Adds the duration of a finished run.
+
+        :param workflow_id: ID of the workflow.
+        :param float duration: Run time in seconds.
+        :return: None
+        """
+        with self._lock:
+            previous = self.get(("duration", str(workflow_id)))
+            if previous is not None:
+                duration = self.weight * duration + (1 - self.weight) * previous
+            self.set(("duration", str(workflow_id)), duration)
+
+    def expected_duration(self, workflow_id):
+        """
+        Returns the expected run time of a workflow.
+
+        :param workflow_id: ID of the workflow.
+        :return: Run time in seconds, or None if the workflow hasn't run recently.
+        :rtype: float
+        """
+        return self.get(("duration", str(workflow_id)))
+
+
+class ProcessPoller(object):
+    """
+    Resolves the futures of workflow runs started with :meth:`Workfile.Process.run_async`. A single background
+    thread polls every pending run on its own :class:`PollSchedule` and sets the result of its future to the
+    downloaded results of a successful run, or its exception to a :class:`RunFlowFailureException` or
+    :class:`RunFlowTimeoutException`. The thread exits when no runs are pending and is restarted on demand.
+    The same run can be submitted several times, e.g. when it is joined or reused, and each of its futures is
+    resolved. Cancelling a future stops its run, unless another future of the run is still pending.
+    """
+
+    def __init__(self, process):
+        """
+        :param Workfile.Process process: Object used to query, stop and download the runs.
+        """
+        self.process = process
+        # Pending runs by future, a run submitted several times has one entry per future.
+        self._runs = {}
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def __len__(self):
+        with self._condition:
+            return len(self._runs)
+
+    def submit(self, workflow_id, process_id, query_time=10, timeout=3600, initial_query_time=0.5,
+               results_timeout=30, lazy=False):
+        """
+        Starts tracking a run.
+
+        :param int workflow_id: ID of the workflow.
+        :param str process_id: ID of the workflow run.
+        :param float query_time: Maximum number of seconds between status queries.
+        :param float timeout: Number of seconds after which the run is stopped.
+        :param float initial_query_time: Number of seconds before the first status queries.
+        :param float results_timeout: Number of seconds to wait for the results once the run is over.
+        :param bool lazy: Resolve the future with a :class:`FlowResult` instead of a dict.
+        :return: Future resolved with the workflow results.
+        :rtype: concurrent.futures.Future
+        """
+        run_history = getattr(self.process.session, "run_history", None)
+        expected_duration = run_history.expected_duration(workflow_id) if run_history is not None else None
+        now = time.time()
+        run = {"workflow_id": workflow_id,
+               "process_id": process_id,
+               "future": Future(),
+               "schedule": PollSchedule(initial_delay=initial_query_time, max_delay=max(1, query_time),
+                                        expected_duration=expected_duration),
+               "start": now,
+               # Time of the last query that found the run working.
+               "working_at": None,
+               "next_poll": now,
+               "deadline": now + timeout,
+               "timeout": timeout,
+               "results_timeout": results_timeout,
+               "results_deadline": None,
+               "lazy": lazy,
+               "notified": False}
+        run["future"].process_id = process_id
+
+        with self._condition:
+            self._runs[run["future"]] = run
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll_loop, name="alpine-process-poller")
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+        return run["future"]
+
+    def _poll_loop(self):
+        try:
+            while True:
+                with self._condition:
+                    if not self._runs:
+                        self._thread = None
+                        return
+                    now = time.time()
+                    next_poll = min(run["next_poll"] for run in self._runs.values())
+                    if next_poll > now:
+                        # Woken early by a new submission.
+                        self._condition.wait(next_poll - now)
+                        continue
+                    due = [run for run in self._runs.values() if run["next_poll"] <= now]
+
+                for run in due:
+                    try:
+                        done = self._poll(run["process_id"], run)
+                    except Exception as err:
+                        self._set_exception(run, err)
+                        done = True
+                    if done:
+                        with self._condition:
+                            del self._runs[run["future"]]
+        finally:
+            # Left by an unexpected error: let the next submission start a new thread, and fail the pending runs
+            # instead of leaving their futures unresolved.
+            with self._condition:
+                orphans = []
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                    orphans = list(self._runs.values())
+                    self._runs.clear()
+            for run in orphans:
+                self._set_exception(run, RunFlowFailureException(
+                    "Polling the Workflow with process ID: <{0}> stopped unexpectedly.".format(run["process_id"])))
+
+    def _set_exception(self, run, err):
+        future = run["future"]
+        if future.cancelled():
+            self._notify_cancelled(run)
+        elif not future.done():
+            # A future cancelled in the meantime can't take an exception anymore.
+            if future.running() or future.set_running_or_notify_cancel():
+                future.set_exception(err)
+
+    @staticmethod
+    def _notify_cancelled(run):
+        # Wakes up the callers of concurrent.futures.wait and as_completed, which can only be done once.
+        if not run["notified"]:
+            run["notified"] = True
+            run["future"].set_running_or_notify_cancel()
+
+    def _poll(self, process_id, run):
+        """
+        Advances one run by a status query or a results download.
+
+        :return: True once the future of the run is resolved.
+        :rtype: bool
+        """
+        future = run["future"]
+        now = time.time()
+        if future.cancelled():
+            self._notify_cancelled(run)
+            with self._condition:
+                shared = any(other is not run and other["process_id"] == process_id and not other["future"].cancelled()
+                             for other in self._runs.values())
+            if not shared:
+                self.process.stop(process_id)
+            return True
+
+        if run["results_deadline"] is None:
+            status = self.process.query_status(process_id)
+            if status == "WORKING":
+                if now >= run["deadline"]:
+                    stop_status = self.process.stop(process_id)
+                    self._set_exception(run, RunFlowTimeoutException(
+                        "The Workflow with process ID: <{0}> has exceeded a runtime of {1} seconds."
+                        " It now has status '{2}'.".format(process_id, run["timeout"], stop_status)))
+                    return True
+                run["working_at"] = now
+                run["next_poll"] = now + min(run["schedule"].next_delay(now - run["start"]), run["deadline"] - now)
+                return False
+            if status == "FAILED":
+                self._set_exception(run, RunFlowFailureException("The Workflow with process ID: <{0}> failed."
+                                                                 .format(process_id)))
+                return True
+            run_history = getattr(self.process.session, "run_history", None)
+            if run_history is not None and run["working_at"] is not None:
+                # The run ended between the last two queries.
+                run_history.record(run["workflow_id"], (run["working_at"] + now) / 2 - run["start"])
+            run["results_deadline"] = now + run["results_timeout"]
+            run["schedule"] = PollSchedule(initial_delay=0.1, max_delay=2)
+
+        try:
+            flow_results = self.process.download_results(run["workflow_id"], process_id, lazy=run["lazy"])
+        except ResultsNotFoundException as err:
+            if now >= run["results_deadline"]:
+                self._set_exception(run, RunFlowFailureException(
+                    "The Workflow with process ID: <{0}> finished without results: {1}".format(process_id, err.reason)))
+                return True
+            run["next_poll"] = now + run["schedule"].next_delay(0)
+            return False
+
+        # The status query doesn't tell a failed run from a successful one, the results do.
+        status = flow_results.get('flowMetaInfo', {}).get('status')
+        if status != "SUCCESS":
+            self._set_exception(run, RunFlowFailureException(
+                "The Workflow with process ID: <{0}> ended with status '{1}'.".format(process_id, status)))
+            return True
+
+        if future.set_running_or_notify_cancel():
+            future.set_result(flow_results)
+        return True
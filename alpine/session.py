@@ -0,0 +1,74 @@
+from __future__ import absolute_import
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import TTLCache, ResponseCache, FileResultCache
+from .localstore import LocalStore
+from .polling import RunHistory
+
+
+class AlpineSession(requests.Session):
+    """
+    A requests session that also carries the client-wide settings shared by every API object created from
+    the same :class:`APIClient`.
+    """
+
+    def __init__(self, max_page_workers=4, id_cache_ttl=60, id_cache_size=256, response_cache_ttl=None,
+                 response_cache_size=512, pool_connections=10, pool_maxsize=10, pool_block=False,
+                 results_cache_dir=None, results_cache_size=1024 ** 3, local_store_path=None):
+        """
+        :param int max_page_workers: Maximum number of pages of a paginated list fetched at the same time.
+        :param float id_cache_ttl: Number of seconds a name-to-ID index built by the `get_id` methods is kept.
+                                   Use 0 or None to disable the index.
+        :param int id_cache_size: Maximum number of name-to-ID indexes kept, one per entity type and scope.
+        :param response_cache_ttl: Number of seconds responses of the read-only `get` calls are cached, or a dict
+                                   of seconds per entity type. See :class:`ResponseCache`. None disables caching.
+        :param int response_cache_size: Maximum number of cached responses.
+        :param int pool_connections: Number of hosts whose connection pools are kept.
+        :param int pool_maxsize: Maximum number of idle keep-alive connections kept per host.
+        :param bool pool_block: Make a request wait for a free connection instead of opening an extra one that is
+                                discarded afterwards when all `pool_maxsize` connections are busy.
+        :param str results_cache_dir: Directory of the on-disk cache of workflow results, see
+                                      :class:`FileResultCache`. None disables it.
+        :param int results_cache_size: Maximum number of bytes of compressed results kept on disk.
+        :param str local_store_path: Path of the :class:`LocalStore` database. None keeps it in memory.
+        """
+        super(AlpineSession, self).__init__()
+        self.max_page_workers = max_page_workers
+        self.pool_maxsize = pool_maxsize
+        self.run_history = RunHistory()
+        self.id_index = TTLCache(id_cache_ttl, id_cache_size) if id_cache_ttl else None
+        self.response_cache = ResponseCache(response_cache_ttl, response_cache_size) if response_cache_ttl else None
+        self.results_cache = FileResultCache(results_cache_dir, results_cache_size) if results_cache_dir else None
+        self.local_store = LocalStore(local_store_path or ":memory:")
+
+        for prefix in ("http://", "https://"):
+            self.mount(prefix, HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                           pool_block=pool_block))
+
+    def get_connection_stats(self):
+        """
+        Returns how many connections were opened and how many requests were sent over them, per host.
+        The difference is the number of requests that reused a warm keep-alive connection.
+
+        :return: Totals and per-host counters.
+        :rtype: dict
+        """
+        stats = {"connections": 0, "requests": 0, "reused": 0, "hosts": {}}
+        for prefix in ("http://", "https://"):
+            pools = self.get_adapter(prefix).poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                # A host has one pool per TLS setting, add them up.
+                host = "{0}://{1}:{2}".format(pool.scheme, pool.host, pool.port)
+                host_stats = stats["hosts"].setdefault(host, {"connections": 0, "requests": 0, "reused": 0})
+                host_stats["connections"] += pool.num_connections
+                host_stats["requests"] += pool.num_requests
+                host_stats["reused"] = max(0, host_stats["requests"] - host_stats["connections"])
+                stats["connections"] += pool.num_connections
+                stats["requests"] += pool.num_requests
+        stats["reused"] = max(0, stats["requests"] - stats["connections"])
+        return stats
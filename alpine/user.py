@@ -59,8 +59,6 @@ class User(AlpineObject):
         if app_role is None:
             app_role = User.ApplicationRole.BusinessUser
 
-        self.session.headers.update({"Content-Type": "application/json"})  # Set special header for this post
-
         url = "{0}/users".format(self.base_url)
         url = self._add_token_to_url(url)
         payload = {"username": username,
@@ -76,10 +74,11 @@ class User(AlpineObject):
                    "user_type": app_role,
                    "subscribed_to_emails": email_notification
                    }
-        response = self.session.post(url, data=json.dumps(payload), verify=False)
+        response = self.session.post(url, data=json.dumps(payload), headers=self._json_headers, verify=False)
+        self._invalidate_id_index("user")
+        self._invalidate_cached(("user", "list"))
         self.logger.debug("Adding user, received response code {0} with reason {1}...".format(
             response.status_code, response.reason))
-        # self.session.headers.pop("Content-Type")  # Remove header, as it affects other functions
 
         try:
             return response.json()['response']
@@ -104,12 +103,13 @@ class User(AlpineObject):
             self.get(user_id)
             url = "{0}/users/{1}".format(self.base_url, user_id)
             url = self._add_token_to_url(url)
-            self.session.headers.update({"Content-Type": "application/x-www-form-urlencoded"})
             self.logger.debug("Deleting user with ID: <{0}>".format(user_id))
-            response = self.session.delete(url)
+            response = self.session.delete(url, headers=self._form_headers)
             self.logger.debug("Received response code {0} with reason {1}"
                               .format(response.status_code, response.reason))
             if response.status_code == 200:
+                self._invalidate_id_index("user")
+                self._invalidate_cached(("user", str(user_id)), ("user", "list"), ("member", "list"))
                 self.logger.debug("User successfully deleted")
             else:
                 raise InvalidResponseCodeException("Response code invalid, the expected response code is {0}, "
@@ -146,7 +146,7 @@ class User(AlpineObject):
 
         url = "{0}/users/{1}".format(self.base_url, user_id)
         url = self._add_token_to_url(url)
-        payload = self.get(user_id)
+        payload = self._get_current(user_id)
 
         # get rid of fields that aren't required for PUT
         pop_fields = ['complete_json',
@@ -191,11 +191,12 @@ class User(AlpineObject):
             payload["roles"] = ""
 
         self.logger.debug("Sending the user information {0} to {1}".format(json.dumps(payload), url))
-        self.session.headers.update({"Content-Type": "application/json"})  # Set special header for this post
-        response = self.session.put(url, data=json.dumps(payload), verify=False)
+        response = self.session.put(url, data=json.dumps(payload), headers=self._json_headers, verify=False)
         self.logger.debug("Received response code {0} with reason {1}...".format(response.status_code, response.reason))
-        self.session.headers.pop("Content-Type")  # Remove header, as it affects other tests
-        return response.json()['response']
+        user_info = response.json()['response']
+        # Member lists embed the users' metadata.
+        self._invalidate_cached(("user", "list"), ("member", "list"))
+        return self._set_cached(("user", str(user_id)), user_info)
 
     def get_id(self, username):
         """
@@ -214,11 +215,10 @@ class User(AlpineObject):
 
         """
 
-        users_list = self.get_list()
-        for user_info in users_list:
-            if user_info['username'] == username:
-                return user_info['id']
-        # return None
+        user_id = self._find_id(("user",), username,
+                                lambda: self.iter_list(prefetch=False), self.get_list, name_field='username')
+        if user_id is not None:
+            return user_id
         raise UserNotFoundException("User {0} not found".format(username))
 
     def get(self, user_id):
@@ -234,12 +234,26 @@ class User(AlpineObject):
 
             >>> session.user.get(user_id = 51)
         """
+        cached_response = self._get_cached(("user", str(user_id)))
+        if cached_response is not None:
+            return cached_response
+
+        return self._set_cached(("user", str(user_id)), self._get_current(user_id))
+
+    def _get_current(self, user_id):
+        """
+        Used internally by get, and by update to read the metadata it puts back, from the server and not from the
+        response cache, so that changes made by someone else aren't reverted.
+
+        :param str user_id: A unique user ID.
+        :return: Selected user's metadata.
+        :rtype: dict
+        :exception UserNotFoundException: The user does not exist.
+        """
         url = "{0}/users/{1}".format(self.base_url, user_id)
         url = self._add_token_to_url(url)
 
-        self.session.headers.update({"Content-Type": "application/json"})
-
-        r = self.session.get(url, verify=False)
+        r = self.session.get(url, headers=self._json_headers, verify=False)
         user_response = r.json()
 
         try:
@@ -268,24 +282,31 @@ class User(AlpineObject):
         """
         url = "{0}/users".format(self.base_url)
         url = self._add_token_to_url(url)
-        page_current = 0
-        users_list = None
-
-        self.session.headers.update({"Content-Type": "application/json"})
-
-        while True:
-            payload = {"per_page": per_page, "page": page_current + 1}
-            user_list_response = self.session.get(url, params=payload, verify=False).json()
-            # user_list_response = self.session.get(url, data=json.dumps(payload), verify=False).json()
-            page_total = user_list_response['pagination']['total']
-            page_current = user_list_response['pagination']['page']
-            if users_list:
-                users_list.extend(user_list_response['response'])
-            else:
-                users_list = user_list_response['response']
-            if page_total == page_current:
-                break
-        return users_list
+
+        payload = {"per_page": per_page}
+        return self._get_all_pages(url, payload, cache_key=("user", "list"))
+
+    def iter_list(self, per_page=100, prefetch=True):
+        """
+        Iterate over all users' metadata, fetching one page at a time as the records are consumed.
+
+        :param int per_page: Maximum number to fetch with each API call.
+
+        :param bool prefetch: Fetch the next page in the background while the current one is consumed.
+        :return: Generator of users' data.
+        :rtype: generator of dict
+
+        Example::
+
+            >>> for user_info in session.user.iter_list():
+            >>>     print(user_info['username'])
+
+        """
+        url = "{0}/users".format(self.base_url)
+        url = self._add_token_to_url(url)
+
+        payload = {"per_page": per_page}
+        return self._iter_pages(url, payload, prefetch=prefetch, cache_key=("user", "list"))
 
     class ApplicationRole(object):
         """
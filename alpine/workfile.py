@@ -1,6 +1,10 @@
+import hashlib
+import itertools
 import os
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+import requests
 try:
     # For Python 3.0 and later
     from urllib.parse import urlparse
@@ -12,6 +16,88 @@ except ImportError:
 from .alpineobject import AlpineObject
 from .datasource import DataSource
 from .exception import *
+from .flowresult import FlowResult, stream_flow_result
+from .multipart import MultipartEncoder
+from .polling import PollSchedule, ProcessPoller
+from .workflowgraph import WorkflowGraph
+
+
+# Execution location of each data source type: the suffix of the data source reference, the type of the execution
+# location, and whether the location is the data source itself instead of one of its databases.
+_EXECUTION_LOCATIONS = {
+    DataSource.DSType.GreenplumDatabase: ("GpdbDataSource", "gpdb_database", False),
+    DataSource.DSType.PostgreSQLDatabase: ("PgDataSource", "pg_database", False),
+    DataSource.DSType.HAWQ: ("GpdbDataSource", "gpdb_database", False),
+    DataSource.DSType.OracleDatabase: ("OracleDataSource", "oracle_data_source", False),
+    DataSource.DSType.JDBCDataSource: ("JdbcDataSource", "jdbc_data_source", False),
+    DataSource.DSType.JDBCHiveDataSource: ("JdbcHiveDataSource", "jdbc_hive_data_sources", False),
+    DataSource.DSType.HadoopCluster: ("HdfsDataSource", "hdfs_data_source", True),
+    DataSource.DSType.HadoopHive: ("HdfsDataSource", "hdfs_data_source", True),
+}
+
+
+def _execution_location_fields(data_sources_list):
+    """
+    Used internally to validate the data sources of a workfile upload and turn them into the fields of the upload
+    form. Every data source is checked before any field is returned.
+
+    :param list data_sources_list: Data sources, see :meth:`Workfile.upload`.
+    :return: Form fields, as (name, value) tuples.
+    :rtype: list
+    :exception DataSourceTypeNotFoundException: A data source is malformed or of an unknown type.
+    """
+    fields = []
+    for i, data_source in enumerate(data_sources_list):
+        try:
+            data_source_type = data_source['data_source_type']
+            data_source_id = data_source['data_source_id']
+        except (KeyError, TypeError):
+            raise DataSourceTypeNotFoundException("Data source item <{0}> doesn't contain the expected keys "
+                                                  "'data_source_type' and 'data_source_id'.".format(data_source))
+        if data_source_type not in _EXECUTION_LOCATIONS:
+            raise DataSourceTypeNotFoundException("Data source type <{0}> is not one of: {1}".format(
+                data_source_type, ", ".join(sorted(_EXECUTION_LOCATIONS))))
+        suffix, database_type, is_data_source = _EXECUTION_LOCATIONS[data_source_type]
+        if is_data_source:
+            database_id = data_source_id
+        elif 'database_id' in data_source:
+            database_id = data_source['database_id']
+        else:
+            raise DataSourceTypeNotFoundException("Data source item <{0}> of type <{1}> doesn't contain the expected "
+                                                  "key 'database_id'.".format(data_source, data_source_type))
+
+        fields.append(("data_source", "{0}{1}".format(data_source_id, suffix)))
+        fields.append(("database", "{0}".format(database_id)))
+        fields.append(("workfile[execution_locations][{0}][entity_type]".format(i), database_type))
+        fields.append(("workfile[execution_locations][{0}][id]".format(i), database_id))
+    return fields
+
+
+def _fetch_workfile(alpine_object, workfile_id):
+    """
+    Used internally to request the metadata of a workfile from the server, bypassing the response cache, for the
+    checks that must see the current version of the workfile.
+
+    :param AlpineObject alpine_object: API object whose base URL, session and token are used.
+    :param str workfile_id: ID of workfile.
+    :return: Selected workfile's metadata response.
+    :rtype: dict
+    :exception WorkfileNotFoundException: The workfile does not exist.
+    """
+    url = "{0}/workfiles/{1}".format(alpine_object.base_url, workfile_id)
+    url = alpine_object._add_token_to_url(url)
+
+    r = alpine_object.session.get(url, headers=alpine_object._json_headers, verify=False)
+    workfile_response = r.json()
+
+    try:
+        if workfile_response['response']:
+            alpine_object.logger.debug("Found workfile ID: <{0}> in list...".format(workfile_id))
+            return workfile_response
+        else:
+            raise WorkfileNotFoundException("Workfile ID: <{0}> not found".format(workfile_id))
+    except Exception:
+        raise WorkfileNotFoundException("Workfile ID: <{0}> not found".format(workfile_id))
 
 
 class Workfile(AlpineObject):
@@ -48,29 +134,42 @@ class Workfile(AlpineObject):
             >>> session.workfile.get_list(workspace_id = 1672)
 
         """
-        workfile_list = None
         url = "{0}/workspaces/{1}/workfiles".format(self.base_url, str(workspace_id))
         url = self._add_token_to_url(url)
 
-        self.session.headers.update({"Content-Type": "application/json"})
-
-        page_current = 0
-        while True:
-            payload = {"no_published_worklets": True,
-                       "order": "file_name",
-                       "per_page": per_page,
-                       "page": page_current + 1,
-                       }
-            workfile_list_response = self.session.get(url, data=json.dumps(payload), verify=False).json()
-            page_total = workfile_list_response['pagination']['total']
-            page_current = workfile_list_response['pagination']['page']
-            if workfile_list:
-                workfile_list.extend(workfile_list_response['response'])
-            else:
-                workfile_list = workfile_list_response['response']
-            if page_total == page_current:
-                break
-        return workfile_list
+        payload = {"no_published_worklets": True,
+                   "order": "file_name",
+                   "per_page": per_page,
+                   }
+        return self._get_all_pages(url, payload, use_params=False,
+                                   cache_key=("workfile", "list", str(workspace_id)))
+
+    def iter_list(self, workspace_id, per_page=100, prefetch=True):
+        """
+        Iterate over all workfiles in a workspace, fetching one page at a time as the records are consumed.
+
+        :param int workspace_id: ID of the workspace.
+        :param int per_page: Maximum number to fetch with each API call.
+        :param bool prefetch: Fetch the next page in the background while the current one is consumed.
+        :return: Generator of workfiles' metadata.
+        :rtype: generator of dict
+        :exception WorkspaceNotFoundException: The workspace does not exist.
+
+        Example::
+
+            >>> for workfile_info in session.workfile.iter_list(workspace_id = 1672):
+            >>>     print(workfile_info['file_name'])
+
+        """
+        url = "{0}/workspaces/{1}/workfiles".format(self.base_url, str(workspace_id))
+        url = self._add_token_to_url(url)
+
+        payload = {"no_published_worklets": True,
+                   "order": "file_name",
+                   "per_page": per_page,
+                   }
+        return self._iter_pages(url, payload, use_params=False, prefetch=prefetch,
+                                cache_key=("workfile", "list", str(workspace_id)))
 
     def get(self, workfile_id):
         """
@@ -87,22 +186,11 @@ class Workfile(AlpineObject):
             >>> session.workfile.get(workflow_id = 375)
 
         """
-        url = "{0}/workfiles/{1}".format(self.base_url, workfile_id)
-        url = self._add_token_to_url(url)
+        cached_response = self._get_cached(("workfile", str(workfile_id)))
+        if cached_response is not None:
+            return cached_response
 
-        self.session.headers.update({"Content-Type": "application/json"})
-
-        r = self.session.get(url, verify=False)
-        workfile_response = r.json()
-
-        try:
-            if workfile_response['response']:
-                self.logger.debug("Found workfile ID: <{0}> in list...".format(workfile_id))
-                return workfile_response
-            else:
-                raise WorkfileNotFoundException("Workfile ID: <{0}> not found".format(workfile_id))
-        except Exception:
-            raise WorkfileNotFoundException("Workfile ID: <{0}> not found".format(workfile_id))
+        return self._set_cached(("workfile", str(workfile_id)), _fetch_workfile(self, workfile_id))
 
     def get_id(self, workfile_name, workspace_id):
         """
@@ -121,10 +209,11 @@ class Workfile(AlpineObject):
 
         """
 
-        workfile_list = self.get_list(workspace_id)
-        for workfile in workfile_list:
-            if workfile['file_name'] == workfile_name:
-                return workfile['id']
+        workfile_id = self._find_id(("workfile", str(workspace_id)), workfile_name,
+                                    lambda: self.iter_list(workspace_id, prefetch=False),
+                                    lambda: self.get_list(workspace_id), name_field='file_name')
+        if workfile_id is not None:
+            return workfile_id
         raise WorkfileNotFoundException("The workfile with name '{0}' is not found in workspace ID: <{1}>"
                                         .format(workfile_name, workspace_id))
 
@@ -143,7 +232,7 @@ class Workfile(AlpineObject):
             >>> session.workfile.delete(workflow_id = 375)
         """
         try:
-            self.get(workfile_id)
+            workfile_info = self.get(workfile_id)['response']
             # Construct the URL
             url = "{0}/workfiles/{1}".format(self.base_url, workfile_id)
             url = self._add_token_to_url(url)
@@ -155,6 +244,12 @@ class Workfile(AlpineObject):
             self.logger.debug(
                 "Received response code {0} with reason {1}...".format(response.status_code, response.reason))
             if response.status_code == 200:
+                self._invalidate_id_index("workfile")
+                workspace_id = (workfile_info.get('workspace') or {}).get('id')
+                if workspace_id is None:
+                    self._invalidate_cached(("workfile", str(workfile_id)), ("workfile", "list"))
+                else:
+                    self._invalidate_cached(("workfile", str(workfile_id)), ("workfile", "list", str(workspace_id)))
                 self.logger.debug("Workfile successfully deleted.")
             else:
                 raise InvalidResponseCodeException("Response code invalid, the expected response code is {0}, "
@@ -163,7 +258,7 @@ class Workfile(AlpineObject):
         except WorkfileNotFoundException as err:
             self.logger.debug("Workfile not found, error {0}".format(err))
 
-    def upload(self, workspace_id, afm_file, data_sources_list):
+    def upload(self, workspace_id, afm_file, data_sources_list, progress=None, skip_unchanged=False):
         # TODO: database admins only?
         """
         Uploads an Alpine workfile file (.afm format). Will alter the workfile to use the data source(s)
@@ -177,8 +272,16 @@ class Workfile(AlpineObject):
                 {"data_source_type": DataSource.dsType.JDBCDataSource, "data_source_id": "421", "database_id": ""},
                 {"data_source_type": DataSource.dsType.GreenplumDatabase, "data_source_id": "1", "database_id": "42"}
                 ]
+        :param progress: Function called as the workfile is uploaded with the number of bytes sent so far and the
+                         total size of the request. The workfile is read while it is being sent, a chunk at a time.
+        :param bool skip_unchanged: Don't upload the file again if this client, or another one sharing its
+                                    `local_store_path`, already uploaded the same content with the same data sources
+                                    to the workspace, and the workfile hasn't changed in Alpine since. The metadata of
+                                    the existing workfile is returned instead.
         :return: Selected workfile's metadata.
         :rtype: dict
+        :exception DataSourceTypeNotFoundException: A data source of `data_sources_list` is malformed or of an
+                                                    unknown type. Nothing is uploaded.
 
         Example::
 
@@ -190,63 +293,145 @@ class Workfile(AlpineObject):
             >>> workfile_info = session.workfile.upload(workspace_id, afm_path, datasource_info)
 
         """
+        location_fields = _execution_location_fields(data_sources_list)
+        return self._upload(workspace_id, afm_file, data_sources_list, location_fields, progress, skip_unchanged)[0]
+
+    def _upload(self, workspace_id, afm_file, data_sources_list, location_fields, progress=None,
+                skip_unchanged=False):
+        """
+        Used internally to upload a workfile, see :meth:`upload`. The data sources are already validated into the
+        `location_fields` of the upload form.
+
+        :return: The workfile's metadata, and whether the upload was skipped.
+        :rtype: tuple
+        """
+        local_store = getattr(self.session, "local_store", None)
+        skip_unchanged = skip_unchanged and local_store is not None
+        if skip_unchanged:
+            file_name = os.path.basename(afm_file)
+            content_hash = local_store.file_hash(afm_file, data_sources_list)
+            workfile_info = self._find_unchanged_upload(workspace_id, file_name, content_hash)
+            if workfile_info is not None:
+                self.logger.debug("Skipped the upload of unchanged {0} to workspace ID: <{1}>"
+                                  .format(afm_file, workspace_id))
+                return workfile_info, True
 
         url = "{0}/workspaces/{1}/workfiles".format(self.base_url, workspace_id)
         url = self._add_token_to_url(url)
         # payload is made up of file / destination meta-data (see firebug POST trace for info)
-        payload = []
-        payload.append(("workfile[entity_subtype]", "alpine"))
-        for i in range(0, len(data_sources_list)):
-            data_source = data_sources_list[i]
-            ds = DataSource(self.base_url, self.session, self.token)
-
-            if data_source['data_source_type'] == ds.dsType.GreenplumDatabase:
-                data_source_string = "{0}{1}".format(data_source['data_source_id'], "GpdbDataSource")
-                database_type = "gpdb_database"
-                database_id = data_source['database_id']
-            elif data_source['data_source_type'] == ds.dsType.PostgreSQLDatabase:
-                data_source_string = "{0}{1}".format(data_source['data_source_id'], "PgDataSource")
-                database_type = "pg_database"
-                database_id = data_source['database_id']
-            elif data_source['data_source_type'] == ds.dsType.HAWQ:
-                data_source_string = "{0}{1}".format(data_source['data_source_id'], "GpdbDataSource")
-                database_type = "gpdb_database"
-                database_id = data_source['database_id']
-            elif data_source['data_source_type'] == ds.dsType.OracleDatabase:
-                data_source_string = "{0}{1}".format(data_source['data_source_id'], "OracleDataSource")
-                database_type = "oracle_data_source"
-                database_id = data_source['database_id']
-            elif data_source['data_source_type'] == ds.dsType.JDBCDataSource:
-                data_source_string = "{0}{1}".format(data_source['data_source_id'], "JdbcDataSource")
-                database_type = "jdbc_data_source"
-                database_id = data_source['database_id']
-            elif data_source['data_source_type'] == ds.dsType.JDBCHiveDataSource:
-                data_source_string = "{0}{1}".format(data_source['data_source_id'], "JdbcHiveDataSource")
-                database_type = "jdbc_hive_data_sources"
-                database_id = data_source['database_id']
-            elif data_source['data_source_type'] == ds.dsType.HadoopCluster:
-                data_source_string = "{0}{1}".format(data_source['data_source_id'], "HdfsDataSource")
-                database_type = "hdfs_data_source"
-                database_id = data_source['data_source_id']
-            elif data_source['data_source_type'] == ds.dsType.HadoopHive:
-                data_source_string = "{0}{1}".format(data_source['data_source_id'], "HdfsDataSource")
-                database_type = "hdfs_data_source"
-                database_id = data_source['data_source_id']
-            else:
-                raise DataSourceTypeNotFoundException
+        payload = [("workfile[entity_subtype]", "alpine")] + location_fields
 
-            payload.append(("data_source", data_source_string))
-            payload.append(("database", "{0}".format(database_id)))
-            payload.append(("workfile[execution_locations][{0}][entity_type]".format(i), database_type))
-            payload.append(("workfile[execution_locations][{0}][id]".format(i), database_id))
-
-        # files is used to create a multipart upload content-type with requests, we send in a file object
-        if self.session.headers.get("Content-Type") is not None:
-            self.session.headers.pop("Content-Type")
-        files = {"workfile[versions_attributes][0][contents]": open(afm_file, 'rb')}
+        # The multipart body is streamed from the file, which is closed once sent even if the request fails.
+        files = [("workfile[versions_attributes][0][contents]", afm_file)]
         self.logger.debug("POSTing to: {0}\n With payload: {1}".format(url, payload))
-        response = self.session.post(url, files=files, data=payload, verify=False)
-        return response.json()['response']
+        with MultipartEncoder(payload, files, progress=progress) as body:
+            response = self.session.post(url, data=body, headers={"Content-Type": body.content_type}, verify=False)
+        self._invalidate_id_index("workfile", str(workspace_id))
+        self._invalidate_cached(("workfile", "list", str(workspace_id)))
+        workfile_info = response.json()['response']
+        if skip_unchanged:
+            local_store.record_upload(workspace_id, file_name, content_hash, workfile_info['id'],
+                                      self._version(self.get(workfile_info['id'])['response']))
+        return workfile_info, False
+
+    def _find_unchanged_upload(self, workspace_id, file_name, content_hash):
+        """
+        Used internally to find the workfile of a previous upload of the same content.
+
+        :return: The workfile's metadata, or None if the content changed, or the workfile was edited or deleted.
+        :rtype: dict
+        """
+        upload = self.session.local_store.find_upload(workspace_id, file_name)
+        if upload is None or upload["content_hash"] != content_hash:
+            return None
+        try:
+            # A cached response may predate an edit of the workfile.
+            workfile_info = _fetch_workfile(self, upload["workfile_id"])['response']
+        except WorkfileNotFoundException:
+            return None
+        if self._version(workfile_info) != upload["version"]:
+            return None
+        return workfile_info
+
+    @staticmethod
+    def _version(workfile_info):
+        """
+        Used internally to identify the version of a workfile, from the fields of its metadata that change when
+        it is edited.
+
+        :param dict workfile_info: Workfile's metadata.
+        :return: Version of the workfile.
+        :rtype: str
+        """
+        return json.dumps(dict((field, workfile_info.get(field)) for field in
+                               ("version_info", "latest_version_id", "user_modified_at", "updated_at")),
+                          sort_keys=True)
+
+    def upload_many(self, uploads, max_workers=4, progress=None, skip_unchanged=False):
+        """
+        Uploads many Alpine workfiles (.afm format), with up to `max_workers` uploads at the same time. A workfile
+        that fails to upload doesn't stop the others, its result holds the error instead. Keep `max_workers` at
+        most the `pool_maxsize` of the client so that every upload reuses a keep-alive connection.
+
+        :param list uploads: Workfiles to upload, as (workspace_id, afm_file, data_sources_list) tuples with the
+                             arguments of :meth:`upload`.
+        :param int max_workers: Maximum number of uploads at the same time.
+        :param progress: Function called after each upload with the number of uploads done so far, the total
+                         number of uploads and the result of the upload.
+        :param bool skip_unchanged: Skip the files that didn't change since their last upload, see :meth:`upload`.
+        :return: One result per upload, in the order of `uploads`, with its 'workspace_id' and 'afm_file', the
+                 'workfile' metadata returned by Alpine or None, whether the upload was 'skipped', and the 'error'
+                 message or None.
+        :rtype: list of dict
+
+        Example::
+
+            >>> datasource_info = [{"data_source_type": session.datasource.dsType.GreenplumDatabase,
+            >>>                     "data_source_id": 1,
+            >>>                     "database_id": 42}]
+            >>> results = session.workfile.upload_many([(workspace_id, afm_path, datasource_info)
+            >>>                                         for afm_path in glob.glob("release/*.afm")], max_workers=8,
+            >>>                                        skip_unchanged=True)
+            >>> [result['afm_file'] for result in results if result['error'] is not None]
+            []
+
+        """
+        results = [{"workspace_id": workspace_id, "afm_file": afm_file, "workfile": None, "skipped": False,
+                    "error": None} for workspace_id, afm_file, _ in uploads]
+        self.logger.debug("Uploading {0} workfiles".format(len(results)))
+
+        # Every entry is validated before the first upload starts, an invalid one gets its error in its result.
+        location_fields = {}
+        done = 0
+        for index, (_, _, data_sources_list) in enumerate(uploads):
+            try:
+                location_fields[index] = _execution_location_fields(data_sources_list)
+            except DataSourceTypeNotFoundException as err:
+                results[index]["error"] = str(err)
+                done += 1
+                if progress is not None:
+                    progress(done, len(results), results[index])
+
+        def upload_one(index):
+            workspace_id, afm_file, data_sources_list = uploads[index]
+            try:
+                results[index]["workfile"], results[index]["skipped"] = self._upload(
+                    workspace_id, afm_file, data_sources_list, location_fields[index], skip_unchanged=skip_unchanged)
+            except Exception as err:
+                # Also catches the local errors, e.g. a missing file, so that the batch goes on.
+                self.logger.debug("Uploading {0} failed: {1}".format(afm_file, err))
+                results[index]["error"] = str(err) or repr(err)
+            return results[index]
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        try:
+            futures = [executor.submit(upload_one, index) for index in sorted(location_fields)]
+            for done, future in enumerate(as_completed(futures), done + 1):
+                if progress is not None:
+                    progress(done, len(results), future.result())
+        finally:
+            executor.shutdown(wait=True)
+        return results
 
     def download(self, workfile_id):
         """
@@ -277,6 +462,89 @@ class Workfile(AlpineObject):
         except Exception:
             raise WorkfileNotFoundException("Workfile ID: <{0}> not found or is an Alpine Workflow".format(workfile_id))
 
+    def download_to(self, workfile_id, destination, chunk_size=1024 * 1024, progress=None, checksum=None,
+                    algorithm="sha256"):
+        """
+        Downloads an Alpine workfile to a file, a chunk at a time, so that large workfiles are never held in memory.
+        Will not download Alpine workflows.
+
+        When `destination` is a path, the workfile is first written next to it with a ".part" suffix, then
+        renamed, so that an interrupted or corrupted download never leaves a partial file at `destination`.
+
+        :param int workfile_id: ID of the workfile to download.
+        :param destination: Path of the file to write, or a binary file object opened for writing.
+        :param int chunk_size: Number of bytes read and written at a time.
+        :param progress: Function called after each chunk with the number of bytes downloaded so far and the
+                         size of the workfile, or None if the server doesn't send it.
+        :param str checksum: Expected hex digest of the workfile. None to skip the verification.
+        :param str algorithm: Hash algorithm of the digest, any name accepted by `hashlib.new`.
+        :return: The 'path' written to, or None for a file object, the 'size' in bytes and the 'checksum' hex
+                 digest of the workfile.
+        :rtype: dict
+        :exception WorkfileNotFoundException: Workfile ID does not exist or is an Alpine workflow.
+        :exception DownloadChecksumException: The download is incomplete or doesn't match `checksum`.
+
+        Example::
+
+            >>> session.workfile.download_to(workfile_id = 1351, destination = "/tmp/model.pmml",
+            >>>                              progress = lambda done, total: print(done, total),
+            >>>                              checksum = "5e8d3f...")
+            {'path': '/tmp/model.pmml', 'size': 3452012, 'checksum': '5e8d3f...'}
+
+        """
+        url = "{0}/workfiles/{1}/download".format(self.base_url, workfile_id)
+        url = self._add_token_to_url(url)
+
+        workfile_response = self.session.get(url, verify=False, stream=True)
+        try:
+            if workfile_response.status_code != 200:
+                raise WorkfileNotFoundException("Workfile ID: <{0}> not found or is an Alpine Workflow"
+                                                .format(workfile_id))
+            content_length = workfile_response.headers.get("Content-Length")
+            total = int(content_length) if content_length is not None else None
+            # The length of a compressed response is not the size of the workfile.
+            encoded = workfile_response.headers.get("Content-Encoding", "identity") != "identity"
+            digest = hashlib.new(algorithm)
+            size = 0
+
+            path = None if hasattr(destination, "write") else destination
+            part_path = "{0}.part".format(path) if path is not None else None
+            output_file = open(part_path, "wb") if path is not None else destination
+            try:
+                for chunk in workfile_response.iter_content(chunk_size):
+                    output_file.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                    if progress is not None:
+                        progress(size, total)
+                if path is not None:
+                    output_file.close()
+
+                if total is not None and not encoded and size != total:
+                    raise DownloadChecksumException("Downloaded {0} bytes of workfile ID: <{1}>, expected {2}"
+                                                    .format(size, workfile_id, total))
+                if checksum is not None and digest.hexdigest().lower() != checksum.lower():
+                    raise DownloadChecksumException("The {0} checksum of workfile ID: <{1}> is {2}, expected {3}"
+                                                    .format(algorithm, workfile_id, digest.hexdigest(), checksum))
+                if path is not None:
+                    if hasattr(os, "replace"):
+                        os.replace(part_path, path)
+                    else:
+                        if os.path.exists(path):
+                            os.remove(path)
+                        os.rename(part_path, path)
+            except BaseException:
+                if path is not None:
+                    output_file.close()
+                    if os.path.exists(part_path):
+                        os.remove(part_path)
+                raise
+        finally:
+            workfile_response.close()
+
+        self.logger.debug("Downloaded {0} bytes of workfile ID: <{1}>".format(size, workfile_id))
+        return {"path": path, "size": size, "checksum": digest.hexdigest()}
+
     class Process(AlpineObject):
         """
         A class for interacting with workfiles.
@@ -289,6 +557,18 @@ class Workfile(AlpineObject):
             self.alpine_base_url = urljoin(self.chorus_domain,
                                            "alpinedatalabs/api/{0}/json".format(self._alpine_api_version))
             self.logger.debug("alpine_base_url is: {0}".format(self.alpine_base_url))
+            # Resolves the futures of run_async, with one background thread for all the runs.
+            self._poller = ProcessPoller(self)
+
+        def _alpine_headers(self):
+            """
+            Used internally to build the headers of a request to the Alpine workflow API, which authenticates
+            with an x-token header instead of the session_id URL parameter.
+
+            :return: Request headers.
+            :rtype: dict
+            """
+            return {"x-token": self.token, "Content-Type": "application/json"}
 
         @staticmethod
         def find_operator(operator_name, flow_results):
@@ -296,7 +576,7 @@ class Workfile(AlpineObject):
             Helper method to parse a downloaded workflow result to extract data for a single operator.
 
             :param str operator_name: Operator name to extract. Must be an exact match to the name in the workflow.
-            :param dict flow_results: JSON object of Alpine flow results from download_results.
+            :param dict flow_results: JSON object of Alpine flow results from download_results, or a FlowResult.
             :return: Single operator data.
             :rtype: dict
             :exception FlowResultsMalformedException: Workflow result does not contain the key ['outputs'].
@@ -308,6 +588,9 @@ class Workfile(AlpineObject):
 
             """
 
+            if isinstance(flow_results, FlowResult):
+                # Indexed lookup, only this operator gets decoded.
+                return flow_results.find_operator(operator_name)
             if 'outputs' in flow_results:
                 for operator in flow_results['outputs']:
                     if operator['out_title'] == operator_name:
@@ -321,7 +604,7 @@ class Workfile(AlpineObject):
             Returns the metadata for a particular workflow run including time, number of operators, \
             user, and number of runtime errors.
 
-            :param dict flow_results: JSON object of Alpine flow results from download_results.
+            :param dict flow_results: JSON object of Alpine flow results from download_results, or a FlowResult.
             :return: Run metadata.
             :rtype: dict
             :exception FlowResultsMalformedException: Workflow result does not contain the key ['flowMetaInfo'].
@@ -337,17 +620,35 @@ class Workfile(AlpineObject):
             except:
                 raise FlowResultsMalformedException("Workflow result does not contain the key ['flowMetaInfo']")
 
-        def run(self, workflow_id, variables=None):
+        def run(self, workflow_id, variables=None, memoize=False, memoize_max_age=None, coalesce=False,
+                coalesce_window=600):
             """
             Run a workflow, optionally including a list of workflow variables. Returns a process_id which is needed by \
             other functions which query a run or download results.
 
+            With `memoize`, a successful run of the same version of the workflow with the same variables, whatever
+            their order, whose results were downloaded by this client or another one sharing its `local_store_path`,
+            is reused instead of running the workflow again. Its process ID is returned and its results are
+            downloaded as usual, from the results cache if it is enabled.
+
+            With `coalesce`, a run of the same version of the workflow with the same variables that was started by
+            this client, or another one sharing its `local_store_path`, and is still running, is joined instead of
+            starting another one. Concurrent identical calls from several threads start a single run and all get its
+            process ID.
+
             :param str workflow_id: ID of the workflow.
             :param list variables: A list of workflow variables with the format:
                                  [
                                  {"name": "wfv_name_1", "value": "wfv_value_1"},
                                  {"name": "wfv_name_2", "value": "wfv_value_2"}
                                  ]
+                                 or a dict of values by name, sent as strings.
+            :param bool memoize: Reuse a finished run of the same workflow version with the same variables.
+            :param float memoize_max_age: Only reuse runs that finished less than this number of seconds ago.
+                                          None for no limit.
+            :param bool coalesce: Join a run of the same workflow version with the same variables that is still
+                                  running.
+            :param float coalesce_window: Only join runs started less than this number of seconds ago.
 
             :return: ID for the workflow run process.
             :rtype: str
@@ -358,14 +659,15 @@ class Workfile(AlpineObject):
 
                 >>> work_flow_variables = [{"name": "@row_filter", "value": "13"}]
                 >>> process_id = session.workfile.process.run(workflow_id = 375, variables = work_flow_variables)
+                >>> same_process_id = session.workfile.process.run(workflow_id = 375, variables = work_flow_variables,
+                >>>                                                memoize = True)
+                >>> process_id = session.workfile.process.run(workflow_id = 375, variables = {"@row_filter": 13})
 
             """
 
             url = "{0}/workflows/{1}/run".format(self.alpine_base_url, workflow_id)
-            self.session.headers.update({"x-token": self.token})
-            self.session.headers.update({"Content-Type": "application/json"})
-            querystring = {"saveResult": "true"}
             # Handle WFV:
+            variables = self._variable_list(variables)
             if variables is None:
                 workflow_variables = None
             else:
@@ -380,9 +682,41 @@ class Workfile(AlpineObject):
                 workflow_variables = '{{"meta": {{"version": 1}}, "variables": {0}}}' \
                     .format(json.dumps(variables))
 
-            response = self.session.post(url, data=workflow_variables, params=querystring, timeout=30)
+            local_store = getattr(self.session, "local_store", None)
+            memoize = memoize and local_store is not None
+            coalesce = coalesce and local_store is not None
+            if memoize or coalesce:
+                # Runs of another version of the workflow are neither reused nor joined.
+                run_key = local_store.run_key(workflow_id, self._workflow_version(workflow_id), variables)
+            if memoize:
+                process_id = local_store.find_run(run_key, memoize_max_age)
+                if process_id is not None:
+                    self.logger.debug("Workflow ID: <{0}> already ran with the same version and variables as process "
+                                      "ID: <{1}>".format(workflow_id, process_id))
+                    return process_id
+
+            if coalesce:
+                # Also records the run for memoization, under the same key.
+                process_id = local_store.coalesce_run(run_key, workflow_id,
+                                                      lambda: self._start_run(url, workflow_id, workflow_variables),
+                                                      coalesce_window)
+            else:
+                process_id = self._start_run(url, workflow_id, workflow_variables)
+                if memoize:
+                    local_store.start_run(run_key, workflow_id, process_id)
+            return process_id
+
+        def _start_run(self, url, workflow_id, workflow_variables):
+            """
+            Used internally to start a workflow run.
+
+            :return: ID for the workflow run process.
+            :rtype: str
+            """
+            querystring = {"saveResult": "true"}
+            response = self.session.post(url, data=workflow_variables, params=querystring,
+                                         headers=self._alpine_headers(), timeout=30)
 
-            self.session.headers.pop("Content-Type")
             self.logger.debug(response.content)
 
             if response.status_code == 200:
@@ -394,6 +728,71 @@ class Workfile(AlpineObject):
                 raise RunFlowFailureException(
                     "Running workflow ID: <{0}> failed with status code {1}".format(workflow_id, response.status_code))
 
+        def run_async(self, workflow_id, variables=None, query_time=10, timeout=3600, results_timeout=30,
+                      lazy=False, memoize=False, coalesce=False):
+            """
+            Starts a workflow and returns right away with a future of its results. The run is then followed by a
+            single background thread shared by all the runs started this way, so no thread waits for any one run.
+            The future supports the usual `result`, `exception`, `add_done_callback` and `cancel` methods, and can
+            be used with `concurrent.futures.wait` and `concurrent.futures.as_completed`. Cancelling it stops the
+            run, unless the run is shared with another pending future through `coalesce` or `memoize`.
+
+            :param str workflow_id: ID of the workflow.
+            :param list variables: A list of workflow variables, or a dict of values by name, see `run`.
+            :param float query_time: Maximum number of seconds between status queries. Minimum of 1 second.
+            :param float timeout: Amount of time in seconds to wait for workflow to finish. Will stop if exceeded.
+            :param float results_timeout: Number of seconds to wait for the results once the run is over.
+            :param bool lazy: Resolve the future with a :class:`FlowResult`, see `download_results`.
+            :param bool memoize: Reuse a finished run of the same workflow version with the same variables, see
+                                 `run`.
+            :param bool coalesce: Join a running run of the same workflow version with the same variables, see
+                                  `run`.
+            :return: Future resolved with the JSON object of the workflow results. Its exception is a
+                     RunFlowFailureException if the run failed or has no results, and a RunFlowTimeoutException if
+                     `timeout` was exceeded. The process ID of the run is in its `process_id` attribute.
+            :rtype: concurrent.futures.Future
+            :exception WorkflowVariableException: A workflow variable is malformed.
+            :exception RunFlowFailureException: The workflow could not be started.
+
+            Example::
+
+                >>> future = session.workfile.process.run_async(workflow_id = 375, variables = work_flow_variables)
+                >>> future.add_done_callback(lambda f: print(f.process_id, f.exception()))
+                >>> downloaded_flow_results = future.result()
+
+            """
+            process_id = self.run(workflow_id, variables, memoize=memoize, coalesce=coalesce)
+            return self._poller.submit(workflow_id, process_id, query_time=query_time, timeout=timeout,
+                                       results_timeout=results_timeout, lazy=lazy)
+
+        def _workflow_version(self, workflow_id):
+            """
+            Used internally to identify the current version of a workflow for memoized runs, from the fields of its
+            metadata that change when it is edited. The metadata is requested from the server, since a cached
+            response may predate an edit.
+
+            :return: Version of the workflow.
+            :rtype: str
+            """
+            return Workfile._version(_fetch_workfile(self, workflow_id)['response'])
+
+        def _end_run(self, process_id):
+            """
+            Used internally to keep a run that is over from being joined. It is reused once its results are
+            downloaded.
+            """
+            local_store = getattr(self.session, "local_store", None)
+            if local_store is not None:
+                local_store.end_run(process_id)
+
+        def _abandon_run(self, process_id):
+            """
+            Used internally to keep a failed or stopped run from being reused or joined.
+            """
+            local_store = getattr(self.session, "local_store", None)
+            if local_store is not None:
+                local_store.abandon_run(process_id)
+
         def query_status(self, process_id):
             """
             Returns the status of a running workflow.
@@ -409,9 +808,7 @@ class Workfile(AlpineObject):
 
             """
             url = "{0}/processes/{1}/query".format(self.alpine_base_url, process_id)
-            self.session.headers.update({"Content-Type": "application/json"})
-            response = self.session.get(url, timeout=60)
-            self.session.headers.pop("Content-Type")
+            response = self.session.get(url, headers=self._alpine_headers(), timeout=60)
             self.logger.debug(response.text)
 
             in_progress_states = ["IN_PROGRESS", "NODE_STARTED", "STARTED", "NODE_FINISHED"]
@@ -422,20 +819,25 @@ class Workfile(AlpineObject):
                 except ValueError:
                     if response.text == 'Workflow not started or already stopped.\n' or \
                                     response.text == "invalid processID or workflow already stopped.\n":
+                        self._end_run(process_id)
                         return "FINISHED"
                     else:
+                        self._abandon_run(process_id)
                         return "FAILED"
             else:
                 raise RunFlowFailureException("Workflow process ID: <{0}> not found".format(process_id))
 
-        def download_results(self, workflow_id, process_id):
+        def download_results(self, workflow_id, process_id, lazy=False):
             """
             Downloads a workflow run result.
 
             :param int workflow_id: ID of the workflow.
             :param str process_id: ID of a particular workflow run.
-            :return: JSON object of workflow results.
-            :rtype: dict
+            :param bool lazy: Return a :class:`FlowResult`, which only decodes the parts of the result that are
+                              accessed. Much lighter when only the metadata or a few operators are needed.
+            :return: JSON object of workflow results. Read from the results cache of the client, if enabled with
+                     `results_cache_dir`, once downloaded.
+            :rtype: dict or FlowResult
             :exception WorkspaceNotFoundException: The workspace does not exist.
             :exception WorkfileNotFoundException: The workflow does not exist.
             :exception ResultsNotFoundException: Results not found or does not match expected structure.
@@ -447,20 +849,81 @@ class Workfile(AlpineObject):
 
             """
 
+            results_cache = getattr(self.session, "results_cache", None)
+            raw_results = results_cache.get(workflow_id, process_id) if results_cache is not None else None
+            if raw_results is not None:
+                self.logger.debug("Read the results of process ID: <{0}> from the results cache".format(process_id))
+                return FlowResult(raw_results) if lazy else json.loads(raw_results)
+
             url = "{0}/workflows/{1}/results/{2}".format(self.alpine_base_url, workflow_id, process_id)
-            response = self.session.get(url)
+            response = self.session.get(url, headers=self._alpine_headers())
             self.logger.debug(response.content)
 
             if response.status_code == 200:
-                if response.content == "\"\"":
+                if response.text == "\"\"":
                     raise ResultsNotFoundException("Could not find run results for process ID: <{0}>"
                                                    .format(process_id))
-                else:
-                    return json.loads(response.json())
+                raw_results = response.json()
+                if results_cache is not None:
+                    results_cache.set(workflow_id, process_id, raw_results)
+                flow_results = FlowResult(raw_results) if lazy else json.loads(raw_results)
+                local_store = getattr(self.session, "local_store", None)
+                if local_store is not None:
+                    if flow_results.get('flowMetaInfo', {}).get('status') == "SUCCESS":
+                        # The run can now be reused by memoized runs.
+                        local_store.finish_run(process_id)
+                    else:
+                        self._abandon_run(process_id)
+                return flow_results
             else:
                 raise ResultsNotFoundException("Download results failed with status {0}: {1}"
                                                .format(response.status_code, response.reason))
 
+        def stream_results(self, workflow_id, process_id, operator_names=None, metadata=True, chunk_size=65536):
+            """
+            Downloads only the requested parts of a workflow run result. The result is decoded while it is being
+            downloaded, and the download stops as soon as every requested part has been read, so that large
+            results don't need to be fully transferred nor held in memory.
+
+            :param int workflow_id: ID of the workflow.
+            :param str process_id: ID of a particular workflow run.
+            :param list operator_names: Names of the operators whose output to return.
+            :param bool metadata: Return the run metadata.
+            :param int chunk_size: Number of bytes read from the connection at a time.
+            :return: JSON object of workflow results, with 'flowMetaInfo' if `metadata` is True and 'outputs'
+                     holding the output of each of `operator_names` found.
+            :rtype: dict
+            :exception ResultsNotFoundException: Results not found or does not match expected structure.
+
+            Example::
+
+                >>> flow_results = session.workfile.process.stream_results(workflow_id = 375,
+                >>>                                                        process_id = process_id,
+                >>>                                                        operator_names = ["Row Filter"])
+                >>> row_filter = session.workfile.process.find_operator("Row Filter", flow_results)
+
+            """
+
+            results_cache = getattr(self.session, "results_cache", None)
+            raw_results = results_cache.get(workflow_id, process_id) if results_cache is not None else None
+            if raw_results is not None:
+                return stream_flow_result([raw_results.encode("utf-8")], operator_names, metadata)
+
+            url = "{0}/workflows/{1}/results/{2}".format(self.alpine_base_url, workflow_id, process_id)
+            response = self.session.get(url, headers=self._alpine_headers(), stream=True)
+            try:
+                if response.status_code != 200:
+                    raise ResultsNotFoundException("Download results failed with status {0}: {1}"
+                                                   .format(response.status_code, response.reason))
+                try:
+                    return stream_flow_result(response.iter_content(chunk_size), operator_names, metadata)
+                except ResultsNotFoundException:
+                    raise ResultsNotFoundException("Could not find run results for process ID: <{0}>"
+                                                   .format(process_id))
+            finally:
+                # Closing the response before the end of the body drops the connection instead of reading the rest.
+                response.close()
+
         def stop(self, process_id):
             """
             Attempts to stop a running workflow.
@@ -476,10 +939,11 @@ class Workfile(AlpineObject):
 
             """
             url = "{0}/processes/{1}/stop".format(self.alpine_base_url, process_id)
-            response = self.session.post(url, timeout=60)
+            response = self.session.post(url, headers=self._alpine_headers(), timeout=60)
             self.logger.debug(response.text)
             if response.status_code == 200:
                 if response.json()['status'] == "Flow stopped.\n":
+                    self._abandon_run(process_id)
                     return "STOPPED"
                 else:
                     return "STOP FAILED"
@@ -487,19 +951,28 @@ class Workfile(AlpineObject):
                 raise StopFlowFailureException("Stopping the workflow failed with status {0}: {1}"
                                                .format(response.status_code, response.reason))
 
-        def wait_until_finished(self, workflow_id, process_id, verbose=False, query_time=10, timeout=3600):
+        def wait_until_finished(self, workflow_id, process_id, verbose=False, query_time=10, timeout=3600,
+                                initial_query_time=0.5, expected_duration=None, results_timeout=30):
             """
-            Waits for a running workflow to finish.
+            Waits for a running workflow to finish. The status is first queried every `initial_query_time` seconds,
+            then less and less often up to every `query_time` seconds. When the workflow ran before on this client,
+            the first query is made around the time the previous runs took. Once the run is over, the results are
+            downloaded as soon as the server has them.
 
             :param int workflow_id: ID of a particular workflow run.
             :param str process_id: ID of a particular workflow run.
             :param bool verbose: Optionally print approximate run time.
-            :param float query_time: Number of seconds between status queries. Minimum of 1 second.
+            :param float query_time: Maximum number of seconds between status queries. Minimum of 1 second.
             :param float timeout: Amount of time in seconds to wait for workflow to finish. Will stop if exceeded.
+            :param float initial_query_time: Number of seconds before the first status queries.
+            :param float expected_duration: Expected run time in seconds, to use instead of the duration of
+                                            previous runs.
+            :param float results_timeout: Number of seconds to wait for the results once the run is over.
             :return: Workflow run status.
             :rtype: str
             :exception RunFlowTimeoutException: Workflow runtime has exceeded timeout.
             :exception RunFlowFailureException: Status of FAILURE is detected.
+            :exception ResultsNotFoundException: Results are still missing after `results_timeout` seconds.
 
             Example::
 
@@ -507,12 +980,18 @@ class Workfile(AlpineObject):
 
             """
             query_time = max(1, query_time)
+            run_history = getattr(self.session, "run_history", None)
+            if expected_duration is None and run_history is not None:
+                expected_duration = run_history.expected_duration(workflow_id)
+            schedule = PollSchedule(initial_delay=initial_query_time, max_delay=query_time,
+                                    expected_duration=expected_duration)
 
             start = time.time()
 
             self.logger.debug("Waiting for process ID: <{0}> to complete...".format(process_id))
 
-            # workflow_status = self.query_status2(workflow_id, process_id)
+            # Time of the last query that found the run working, None while it hasn't been seen working.
+            working_at = None
             workflow_status = self.query_status(process_id)
 
             while workflow_status == "WORKING":  # loop while waiting for workflow to complete
@@ -528,16 +1007,330 @@ class Workfile(AlpineObject):
                 if verbose:
                     print("\rWorkflow in progress for ~{0:.1f} seconds.".format(wait_total)),
 
-                time.sleep(query_time)
+                working_at = time.time()
+                time.sleep(min(schedule.next_delay(wait_total), max(0, timeout - wait_total)))
 
                 workflow_status = self.query_status(process_id)
 
             if verbose:
                 print("")
 
-            # If workflow is finished - find the final status, otherwise return status in progress.
-            time.sleep(1)
-            final_results = self.download_results(workflow_id, process_id)
+            if run_history is not None and working_at is not None:
+                # The run ended between the last two queries. A run over by the first query says nothing of its
+                # duration.
+                run_history.record(workflow_id, (working_at + time.time()) / 2 - start)
+
+            final_results = self._wait_for_results(workflow_id, process_id, results_timeout, workflow_status)
             status = self.get_metadata(final_results)['status']
 
             return status
+
+        def _wait_for_results(self, workflow_id, process_id, results_timeout, workflow_status="FINISHED"):
+            """
+            Used internally to download the results of a run that just ended. The server may take a moment to
+            publish them, so a missing result is retried with a short backoff until `results_timeout` runs out.
+            The results of a failed run are only tried once, since they may never be published.
+
+            :param int workflow_id: ID of the workflow.
+            :param str process_id: ID of a particular workflow run.
+            :param float results_timeout: Number of seconds to keep retrying.
+            :param str workflow_status: Final state of the run returned by `query_status`.
+            :return: JSON object of workflow results.
+            :rtype: dict
+            :exception ResultsNotFoundException: Results are still missing after `results_timeout` seconds.
+            :exception RunFlowFailureException: The run failed without results.
+            """
+            if workflow_status == "FAILED":
+                try:
+                    return self.download_results(workflow_id, process_id)
+                except ResultsNotFoundException:
+                    raise RunFlowFailureException("The Workflow with process ID: <{0}> failed.".format(process_id))
+
+            schedule = PollSchedule(initial_delay=0.1, max_delay=2)
+            deadline = time.time() + results_timeout
+            while True:
+                try:
+                    return self.download_results(workflow_id, process_id)
+                except ResultsNotFoundException:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise
+                    self.logger.debug("Results of process ID: <{0}> are not ready yet".format(process_id))
+                    time.sleep(min(schedule.next_delay(0), remaining))
+
+        def as_completed(self, processes, query_time=10, timeout=3600, initial_query_time=0.5, max_workers=4):
+            """
+            Waits for many running workflows at once and yields each one as soon as it finishes, in the order they
+            finish. A single polling loop queries the status of every unfinished run, following the same schedule
+            as `wait_until_finished`. When `timeout` runs out, the unfinished runs are stopped.
+
+            :param list processes: (workflow_id, process_id) pairs of the runs to wait for.
+            :param float query_time: Maximum number of seconds between status queries. Minimum of 1 second.
+            :param float timeout: Amount of time in seconds to wait for all the workflows to finish.
+            :param float initial_query_time: Number of seconds before the first status queries.
+            :param int max_workers: Maximum number of status queries sent at the same time.
+            :return: Generator of (workflow_id, process_id, status) tuples, where status is the final state
+                     returned by `query_status`, 'FINISHED' or 'FAILED'.
+            :rtype: generator of tuple
+            :exception RunFlowTimeoutException: Some workflows were still running after `timeout` seconds. They
+                                                have been stopped.
+
+            Example::
+
+                >>> processes = [(workflow_id, session.workfile.process.run(workflow_id, variables))
+                >>>              for variables in variable_sets]
+                >>> for workflow_id, process_id, status in session.workfile.process.as_completed(processes):
+                >>>     results = session.workfile.process.download_results(workflow_id, process_id)
+
+            """
+            query_time = max(1, query_time)
+            pending = list(processes)
+            if not pending:
+                return
+
+            run_history = getattr(self.session, "run_history", None)
+            expected_duration = None
+            if run_history is not None:
+                # Poll fast from the moment the quickest of the workflows is expected to end.
+                expected_durations = [run_history.expected_duration(workflow_id) for workflow_id, _ in pending]
+                if None not in expected_durations:
+                    expected_duration = min(expected_durations)
+            schedule = PollSchedule(initial_delay=initial_query_time, max_delay=query_time,
+                                    expected_duration=expected_duration)
+
+            start = time.time()
+            # Time of the last queries, once the runs still pending have been seen working.
+            working_at = None
+            self.logger.debug("Waiting for {0} processes to complete...".format(len(pending)))
+
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+                while True:
+                    statuses = list(executor.map(lambda process: self.query_status(process[1]), pending))
+                    still_running = []
+                    for process, status in zip(pending, statuses):
+                        if status == "WORKING":
+                            still_running.append(process)
+                        else:
+                            if run_history is not None and working_at is not None:
+                                # The run ended between the last two queries.
+                                run_history.record(process[0], (working_at + time.time()) / 2 - start)
+                            yield process[0], process[1], status
+                    pending = still_running
+                    if not pending:
+                        return
+
+                    wait_total = time.time() - start
+                    if wait_total >= timeout:
+                        stop_statuses = list(executor.map(lambda process: self.stop(process[1]), pending))
+                        process_ids = ", ".join(str(process_id) for _, process_id in pending)
+                        raise RunFlowTimeoutException(
+                            "The Workflows with process IDs: <{0}> have exceeded a runtime of {1} seconds."
+                            " They now have status {2}.".format(process_ids, timeout, stop_statuses))
+
+                    working_at = time.time()
+                    time.sleep(min(schedule.next_delay(wait_total), max(0, timeout - wait_total)))
+
+        def wait_all(self, processes, query_time=10, timeout=3600, initial_query_time=0.5, max_workers=4):
+            """
+            Waits for many running workflows to finish. See `as_completed`.
+
+            :param list processes: (workflow_id, process_id) pairs of the runs to wait for.
+            :param float query_time: Maximum number of seconds between status queries. Minimum of 1 second.
+            :param float timeout: Amount of time in seconds to wait for all the workflows to finish.
+            :param float initial_query_time: Number of seconds before the first status queries.
+            :param int max_workers: Maximum number of status queries sent at the same time.
+            :return: Final state of each run, 'FINISHED' or 'FAILED', by process ID.
+            :rtype: dict
+            :exception RunFlowTimeoutException: Some workflows were still running after `timeout` seconds. They
+                                                have been stopped.
+
+            Example::
+
+                >>> session.workfile.process.wait_all([(375, process_id_1), (376, process_id_2)])
+                {'a5c4e1d3-...': 'FINISHED', '9f1b2c07-...': 'FINISHED'}
+
+            """
+            return dict((process_id, status) for _, process_id, status
+                        in self.as_completed(processes, query_time, timeout, initial_query_time, max_workers))
+
+        def sweep(self, workflow_id, variable_sets=None, grid=None, operators=None, max_concurrent=4, query_time=10,
+                  timeout=3600, memoize=False):
+            """
+            Runs a workflow once per set of workflow variables, with at most `max_concurrent` runs at the same time,
+            and gathers the run metadata and the output of chosen operators into one table. A run that fails doesn't
+            stop the sweep, its row holds the error instead.
+
+            :param int workflow_id: ID of the workflow.
+            :param list variable_sets: Sets of workflow variables, each either a dict of variable values by name or a
+                                       list in the format of `run`.
+            :param dict grid: Lists of values by variable name, to run every combination of them. Used instead of
+                              `variable_sets`.
+            :param list operators: Names of the operators whose output to collect, see `find_operator`.
+            :param int max_concurrent: Maximum number of runs at the same time.
+            :param float query_time: Maximum number of seconds between status queries. Minimum of 1 second.
+            :param float timeout: Amount of time in seconds to wait for each run. Will stop if exceeded.
+            :param bool memoize: Reuse the finished runs of the same workflow version with the same variables
+                                 instead of running them again, see `run`.
+            :return: One row per variable set, in the order of the sets. A row maps each variable name to its value,
+                     'process_id', 'flowMetaInfo' and each of `operators` to the data of the run, and 'error' to the
+                     error message of a failed run or None.
+            :rtype: list of dict
+            :exception WorkflowVariableException: A workflow variable is malformed.
+
+            Example::
+
+                >>> rows = session.workfile.process.sweep(375, grid={"@min_credit_line": [5, 6, 7],
+                >>>                                                  "@outlook": ["'sunny'", "'rain'"]},
+                >>>                                       operators=["Row Filter"], max_concurrent=8)
+                >>> rows[0]['@min_credit_line'], rows[0]['flowMetaInfo']['status']
+                ('5', 'SUCCESS')
+
+            """
+            if grid is not None:
+                names = list(grid)
+                variable_sets = [dict(zip(names, values))
+                                 for values in itertools.product(*[grid[name] for name in names])]
+            variable_lists = [self._variable_list(variables) for variables in variable_sets or []]
+            operators = operators or []
+
+            rows = []
+            for variables in variable_lists:
+                row = dict((variable['name'], variable['value']) for variable in variables)
+                row.update({"process_id": None, "flowMetaInfo": None, "error": None})
+                row.update((operator_name, None) for operator_name in operators)
+                rows.append(row)
+
+            self.logger.debug("Sweeping workflow ID: <{0}> over {1} variable sets".format(workflow_id, len(rows)))
+            running = {}
+            remaining = iter(range(0, len(rows)))
+            try:
+                while True:
+                    # Keep up to max_concurrent runs going, a run that can't be started gets its error in its row.
+                    for index in remaining:
+                        try:
+                            # Only the metadata and a few operators are kept, no need to decode whole results.
+                            future = self.run_async(workflow_id, variable_lists[index], query_time=query_time,
+                                                    timeout=timeout, lazy=True, memoize=memoize)
+                        except (AlpineException, requests.exceptions.RequestException) as err:
+                            rows[index]["error"] = str(err)
+                            continue
+                        rows[index]["process_id"] = future.process_id
+                        running[future] = index
+                        if len(running) >= max_concurrent:
+                            break
+                    if not running:
+                        return rows
+
+                    done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        row = rows[running.pop(future)]
+                        try:
+                            flow_results = future.result()
+                            row["flowMetaInfo"] = self.get_metadata(flow_results)
+                            for operator_name in operators:
+                                row[operator_name] = self.find_operator(operator_name, flow_results)
+                        except Exception as err:
+                            row["error"] = str(err)
+            finally:
+                # Left only by an unexpected error, cancelling stops the runs still going.
+                for future in running:
+                    future.cancel()
+
+        @staticmethod
+        def _variable_list(variables):
+            """
+            Used internally to turn a dict of workflow variable values by name into the list format of `run`.
+            Values are sent as strings. Lists and None are returned as is.
+            """
+            if isinstance(variables, dict):
+                return [{"name": name, "value": str(value)} for name, value in variables.items()]
+            return variables
+
+        def group(self):
+            """
+            Returns an empty :class:`ProcessGroup`, to start workflows and wait for all of them together.
+
+            :return: Process group.
+            :rtype: ProcessGroup
+
+            Example::
+
+                >>> group = session.workfile.process.group()
+                >>> for variables in variable_sets:
+                >>>     group.run(workflow_id, variables)
+                >>> group.wait_all(timeout=600)
+
+            """
+            return ProcessGroup(self)
+
+        def graph(self, max_parallel=4, fail_fast=True):
+            """
+            Returns an empty :class:`WorkflowGraph`, to run workflows that depend on each other.
+
+            :param int max_parallel: Maximum number of workflows running at the same time.
+            :param bool fail_fast: When a workflow fails, stop the running ones and start no other. Otherwise only
+                                   the workflows depending on the failed one are skipped.
+            :return: Workflow graph.
+            :rtype: WorkflowGraph
+
+            Example::
+
+                >>> graph = session.workfile.process.graph(max_parallel=8)
+                >>> graph.add("extract", 375)
+                >>> graph.add("score", 380, depends_on=["extract"])
+                >>> report = graph.run()
+
+            """
+            return WorkflowGraph(self, max_parallel, fail_fast)
+
+
+class ProcessGroup(object):
+    """
+    A set of workflow runs that are waited for together, with a single polling loop.
+    Create one with :meth:`Workfile.Process.group`.
+    """
+
+    def __init__(self, process):
+        """
+        :param Workfile.Process process: Object used to start the runs and query their status.
+        """
+        self.process = process
+        self.processes = []
+
+    def __len__(self):
+        return len(self.processes)
+
+    def add(self, workflow_id, process_id):
+        """
+        Adds a run that was already started.
+
+        :param int workflow_id: ID of the workflow.
+        :param str process_id: ID of the workflow run.
+        :return: None
+        """
+        self.processes.append((workflow_id, process_id))
+
+    def run(self, workflow_id, variables=None):
+        """
+        Starts a workflow and adds its run to the group. See :meth:`Workfile.Process.run`.
+
+        :param int workflow_id: ID of the workflow.
+        :param list variables: Workflow variables.
+        :return: ID for the workflow run process.
+        :rtype: str
+        """
+        process_id = self.process.run(workflow_id, variables)
+        self.add(workflow_id, process_id)
+        return process_id
+
+    def as_completed(self, **kwargs):
+        """
+        Yields each run of the group as it finishes. See :meth:`Workfile.Process.as_completed`.
+        """
+        return self.process.as_completed(self.processes, **kwargs)
+
+    def wait_all(self, **kwargs):
+        """
+        Waits for every run of the group to finish. See :meth:`Workfile.Process.wait_all`.
+        """
+        return self.process.wait_all(self.processes, **kwargs)
@@ -0,0 +1,192 @@
+from __future__ import absolute_import
+
+import time
+from collections import OrderedDict
+from concurrent.futures import wait, FIRST_COMPLETED
+
+from .exception import *
+
+
+class WorkflowGraph(object):
+    """
+    Runs workflows that depend on each other, each one as soon as the workflows it depends on have succeeded,
+    with up to `max_parallel` workflows running at the same time. Unlike the tasks of a job, which run one
+    after the other, independent workflows of the graph run side by side.
+
+    Example::
+
+        >>> graph = WorkflowGraph(session.workfile.process, max_parallel=4)
+        >>> graph.add("extract", 375, variables={"@year": 2017})
+        >>> graph.add("clean", 376)
+        >>> graph.add("score", 380, depends_on=["extract", "clean"],
+        >>>           variables=lambda results: {"@rows": results["clean"]['flowMetaInfo']['noOfOps']})
+        >>> report = graph.run()
+        >>> report['status'], report['critical_path']
+        ('SUCCESS', ['extract', 'score'])
+
+    """
+
+    def __init__(self, process, max_parallel=4, fail_fast=True):
+        """
+        :param Workfile.Process process: Object used to run the workflows.
+        :param int max_parallel: Maximum number of workflows running at the same time.
+        :param bool fail_fast: When a workflow fails, stop the running ones and start no other. Otherwise only
+                               the workflows depending on the failed one are skipped.
+        """
+        self.process = process
+        self.max_parallel = max_parallel
+        self.fail_fast = fail_fast
+        self.nodes = OrderedDict()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def add(self, name, workflow_id, variables=None, depends_on=None):
+        """
+        Adds a workflow to the graph.
+
+        :param str name: Name of the node, unique in the graph. A workflow can be added more than once under
+                         different names.
+        :param int workflow_id: ID of the workflow.
+        :param variables: Workflow variables, as a dict of values by name or a list in the format of
+                          :meth:`Workfile.Process.run`. Can also be a callable that receives the results of the
+                          workflows this one depends on, as a dict by node name, and returns the variables.
+        :param list depends_on: Names of the nodes that must succeed before this one starts.
+        :return: None
+        :exception WorkflowGraphException: The name is already used or a dependency isn't in the graph.
+        """
+        if name in self.nodes:
+            raise WorkflowGraphException("The workflow graph already has a node named <{0}>".format(name))
+        depends_on = list(depends_on or [])
+        for dependency in depends_on:
+            if dependency not in self.nodes:
+                raise WorkflowGraphException("Node <{0}> depends on <{1}>, which is not in the workflow graph. "
+                                             "Add the nodes in dependency order.".format(name, dependency))
+        self.nodes[name] = {"workflow_id": workflow_id, "variables": variables, "depends_on": depends_on}
+
+    def run(self, query_time=10, timeout=3600):
+        """
+        Runs every workflow of the graph and waits for them to finish.
+
+        :param float query_time: Maximum number of seconds between status queries. Minimum of 1 second.
+        :param float timeout: Amount of time in seconds to wait for each workflow. Will stop if exceeded.
+        :return: Run report with the overall 'status' ('SUCCESS' or 'FAILED'), the 'elapsed' seconds, the
+                 'critical_path' (names of the chain of nodes that set the total run time) and its 'critical_time'
+                 in seconds, the flow 'results' by node name, and by node name in 'nodes', the 'workflow_id',
+                 'process_id', 'status' ('SUCCESS', 'FAILED', 'CANCELLED' or 'SKIPPED'), the 'start' and 'end'
+                 offsets in seconds from the start of the graph, the 'duration', the 'queued' seconds spent
+                 waiting for a free slot once ready, and the 'error' message.
+        :rtype: dict
+        """
+        start = time.time()
+        report = OrderedDict((name, {"workflow_id": node["workflow_id"], "process_id": None, "status": None,
+                                     "start": None, "end": None, "duration": None, "queued": None, "error": None})
+                             for name, node in self.nodes.items())
+        results = {}
+        running = {}
+        ready_at = {}
+        stopping = False
+
+        while True:
+            # Start every workflow whose dependencies succeeded, as long as there is a free slot.
+            for name, node in self.nodes.items():
+                node_report = report[name]
+                if node_report["status"] is not None or name in running.values():
+                    continue
+                dependency_statuses = [report[dependency]["status"] for dependency in node["depends_on"]]
+                if stopping or any(status in ("FAILED", "CANCELLED", "SKIPPED") for status in dependency_statuses):
+                    node_report["status"] = "SKIPPED"
+                    continue
+                if any(status != "SUCCESS" for status in dependency_statuses):
+                    continue
+                ready_at.setdefault(name, time.time())
+                if len(running) >= self.max_parallel:
+                    continue
+
+                try:
+                    variables = node["variables"]
+                    if callable(variables):
+                        variables = variables(dict((dependency, results[dependency])
+                                                   for dependency in node["depends_on"]))
+                    future = self.process.run_async(node["workflow_id"], variables, query_time=query_time,
+                                                    timeout=timeout)
+                except Exception as err:
+                    self._finish(report, name, start, "FAILED", error=err)
+                    if self.fail_fast and not stopping:
+                        stopping = True
+                        self._cancel(running)
+                    continue
+                node_report["process_id"] = future.process_id
+                node_report["start"] = time.time() - start
+                node_report["queued"] = time.time() - ready_at[name]
+                running[future] = name
+
+            if not running:
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                if future.cancelled():
+                    self._finish(report, name, start, "CANCELLED")
+                elif future.exception() is not None:
+                    self._finish(report, name, start, "FAILED", error=future.exception())
+                    if self.fail_fast and not stopping:
+                        stopping = True
+                        self._cancel(running)
+                else:
+                    results[name] = future.result()
+                    self._finish(report, name, start, "SUCCESS")
+
+        critical_path = self._critical_path(report)
+        failed = any(node_report["status"] != "SUCCESS" for node_report in report.values())
+        return {"status": "FAILED" if failed else "SUCCESS",
+                "elapsed": time.time() - start,
+                "critical_path": critical_path,
+                "critical_time": report[critical_path[-1]]["end"] if critical_path else 0,
+                "results": results,
+                "nodes": report}
+
+    @staticmethod
+    def _cancel(running):
+        """
+        Used internally to stop the running workflows when failing fast.
+        """
+        for future in running:
+            # Cancelling the future of a run stops it.
+            future.cancel()
+
+    @staticmethod
+    def _finish(report, name, start, status, error=None):
+        """
+        Used internally to record the final status of a node.
+        """
+        node_report = report[name]
+        node_report["status"] = status
+        node_report["end"] = time.time() - start
+        if node_report["start"] is not None:
+            node_report["duration"] = node_report["end"] - node_report["start"]
+        if error is not None:
+            node_report["error"] = str(error)
+
+    def _critical_path(self, report):
+        """
+        Used internally to find the chain of nodes that set the run time of the graph: starting from the node
+        that ended last, each step goes back to the dependency that ended last.
+
+        :return: Node names, first to last.
+        :rtype: list of str
+        """
+        ended = [name for name, node_report in report.items() if node_report["start"] is not None]
+        if not ended:
+            return []
+        name = max(ended, key=lambda node_name: report[node_name]["end"])
+        path = [name]
+        while True:
+            dependencies = [dependency for dependency in self.nodes[name]["depends_on"]
+                            if report[dependency]["end"] is not None]
+            if not dependencies:
+                break
+            name = max(dependencies, key=lambda node_name: report[node_name]["end"])
+            path.append(name)
+        return list(reversed(path))
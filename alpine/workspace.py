@@ -48,12 +48,12 @@ class Workspace(AlpineObject):
         if public:
             str_public = "true"
 
-        self.session.headers.update({"Content-Type": "application/x-www-form-urlencoded"})
-
         payload = {"name": workspace_name,
                    "public": str_public,
                    "summary": summary}
         response = self.session.post(url, data=payload, verify=False)
+        self._invalidate_id_index("workspace")
+        self._invalidate_cached(("workspace", "list"))
         self.logger.debug("Received response code {0} with reason {1}...".format(response.status_code, response.reason))
 
         try:
@@ -86,6 +86,10 @@ class Workspace(AlpineObject):
             self.logger.debug("Received response code {0} with reason {1}"
                               .format(response.status_code, response.reason))
             if response.status_code == 200:
+                self._invalidate_id_index("workspace")
+                self._invalidate_cached(("workspace", str(workspace_id)), ("workspace", "list"),
+                                        ("member", "list", str(workspace_id)), ("workfile", "list", str(workspace_id)),
+                                        ("job", str(workspace_id)), ("job", "list", str(workspace_id)))
                 self.logger.debug("Workspace successfully deleted.")
             else:
                 raise InvalidResponseCodeException("Response code invalid, the expected response code is {0}, "
@@ -120,35 +124,48 @@ class Workspace(AlpineObject):
         else:
             active_state = None
 
-        workspace_list = None
         url = "{0}/workspaces".format(self.base_url)
         url = self._add_token_to_url(url)
 
-        self.session.headers.update({"Content-Type": "application/json"})
-
         payload = {"user_id": user_id,
                    "active": active_state,
                    "per_page": per_page,
                    }
+        return self._get_all_pages(url, payload, cache_key=("workspace", "list"))
 
-        page_current = 0
-        while True:
-            payload['page'] = page_current + 1
+    def iter_list(self, user_id=None, active=None, per_page=50, prefetch=True):
+        """
+        Iterate over the metadata of each workspace, fetching one page at a time as the records are consumed.
+        If a user ID is provided, only workspaces that the user is a member of will be returned.
 
-            r = self.session.get(url, params=payload, verify=False)
-            workspace_list_response = r.json()
+        :param str user_id: ID of the user.
+        :param bool active: Return only active workspaces (optional). True will only return the active spaces.
+        :param int per_page: Maximum number to fetch with each API call.
+        :param bool prefetch: Fetch the next page in the background while the current one is consumed.
 
-            page_total = workspace_list_response['pagination']['total']
-            page_current = workspace_list_response['pagination']['page']
+        :return: Generator of workspace metadata.
+        :rtype: generator of dict
 
-            if workspace_list:
-                workspace_list.extend(workspace_list_response['response'])
-            else:
-                workspace_list = workspace_list_response['response']
-            if page_total == page_current:
-                break
+        Example::
 
-        return workspace_list
+            >>> for workspace_info in session.workspace.iter_list(user_id = my_user_id):
+            >>>     print(workspace_info['name'])
+
+        """
+
+        if active is True:
+            active_state = "true"
+        else:
+            active_state = None
+
+        url = "{0}/workspaces".format(self.base_url)
+        url = self._add_token_to_url(url)
+
+        payload = {"user_id": user_id,
+                   "active": active_state,
+                   "per_page": per_page,
+                   }
+        return self._iter_pages(url, payload, prefetch=prefetch, cache_key=("workspace", "list"))
 
     def get(self, workspace_id):
         """
@@ -165,12 +182,26 @@ class Workspace(AlpineObject):
 
         """
 
+        cached_response = self._get_cached(("workspace", str(workspace_id)))
+        if cached_response is not None:
+            return cached_response
+
+        return self._set_cached(("workspace", str(workspace_id)), self._get_current(workspace_id))
+
+    def _get_current(self, workspace_id):
+        """
+        Used internally by get, and by update to read the metadata it puts back, from the server and not from the
+        response cache, so that changes made by someone else aren't reverted.
+
+        :param str workspace_id: ID of the workspace.
+        :return: Selected workspace's data
+        :rtype: dict
+        :exception WorkspaceNotFoundException: The workspace does not exist.
+        """
         url = "{0}/workspaces/{1}".format(self.base_url, workspace_id)
         url = self._add_token_to_url(url)
 
-        self.session.headers.update({"Content-Type": "application/json"})
-
-        r = self.session.get(url, verify=False)
+        r = self.session.get(url, headers=self._json_headers, verify=False)
         workspace_response = r.json()
         try:
             if workspace_response['response']:
@@ -197,11 +228,10 @@ class Workspace(AlpineObject):
             1672
 
         """
-        workspace_list = self.get_list(user_id)
-        for workspace in workspace_list:
-            if workspace['name'] == workspace_name:
-                return workspace['id']
-        # return None
+        workspace_id = self._find_id(("workspace", str(user_id)), workspace_name,
+                                     lambda: self.iter_list(user_id, prefetch=False), lambda: self.get_list(user_id))
+        if workspace_id is not None:
+            return workspace_id
         raise WorkspaceNotFoundException("The workspace with name '{0}' is not found for user ID: <{1}>".format(
             workspace_name, user_id))
 
@@ -228,7 +258,7 @@ class Workspace(AlpineObject):
         """
         url = "{0}/workspaces/{1}".format(self.base_url, workspace_id)
         url = self._add_token_to_url(url)
-        payload = self.get(workspace_id)
+        payload = self._get_current(workspace_id)
 
         # get rid of fields that aren't required for PUT to reduce request size.
         pop_fields = ['complete_json',
@@ -254,7 +284,7 @@ class Workspace(AlpineObject):
             payload["workspace_stage_id"] = stage
         if owner_id:
             is_member = False
-            members = self.member.get_list(workspace_id)
+            members = self.member._get_current_list(workspace_id)
             for member in members:
                 if member['id'] == owner_id:
                     is_member = True
@@ -270,11 +300,13 @@ class Workspace(AlpineObject):
         for field in pop_fields:
             payload.pop(field)
 
-        self.session.headers.update({"Content-Type": "application/json"})  # Set special header for this post
-        response = self.session.put(url, data=json.dumps(payload), verify=False)
+        response = self.session.put(url, data=json.dumps(payload), headers=self._json_headers, verify=False)
         self.logger.debug("Received response code {0} with reason {1}...".format(response.status_code, response.reason))
-        self.session.headers.pop("Content-Type")  # Remove header, as it affects other tests
-        return response.json()['response']
+        if name:
+            self._invalidate_id_index("workspace")
+        workspace_info = response.json()['response']
+        self._invalidate_cached(("workspace", "list"))
+        return self._set_cached(("workspace", str(workspace_id)), workspace_info)
 
     class Member(AlpineObject):
         """
@@ -305,25 +337,39 @@ class Workspace(AlpineObject):
 
             url = "{0}/workspaces/{1}/members".format(self.base_url, workspace_id)
             url = self._add_token_to_url(url)
-            member_list = None
-            page_current = 0
-
-            self.session.headers.update({"Content-Type": "application/json"})
-
-            while True:
-                payload = {"per_page": per_page,
-                           "page": page_current + 1,
-                           }
-                member_list_response = self.session.get(url, data=json.dumps(payload), verify=False).json()
-                page_total = member_list_response['pagination']['total']
-                page_current = member_list_response['pagination']['page']
-                if member_list:
-                    member_list.extend(member_list_response['response'])
-                else:
-                    member_list = member_list_response['response']
-                if page_total == page_current:
-                    break
-            return member_list
+
+            payload = {"per_page": per_page}
+            return self._get_all_pages(url, payload, use_params=False,
+                                       cache_key=("member", "list", str(workspace_id)))
+
+        def iter_list(self, workspace_id, per_page=100, prefetch=True):
+            """
+            Iterate over metadata about the users who are members of the workspace, fetching one page at a time
+            as the records are consumed.
+
+            :param str workspace_id: ID of the workspace.
+            :param int per_page: Maximum number to fetch with each API call.
+            :param bool prefetch: Fetch the next page in the background while the current one is consumed.
+            :return: Generator of user data.
+            :rtype: generator of dict
+            :exception WorkspaceNotFoundException: The workspace does not exist.
+
+            Example::
+
+                >>> for member in session.workspace.member.iter_list(workspace_id = 1672):
+                >>>     print(member['username'])
+
+            """
+
+            # Check that workspace exists.
+            Workspace(self.base_url, self.session, self.token).get(workspace_id)
+
+            url = "{0}/workspaces/{1}/members".format(self.base_url, workspace_id)
+            url = self._add_token_to_url(url)
+
+            payload = {"per_page": per_page}
+            return self._iter_pages(url, payload, use_params=False, prefetch=prefetch,
+                                    cache_key=("member", "list", str(workspace_id)))
 
         def add(self, workspace_id, user_id, role=None):
             """
@@ -345,7 +391,7 @@ class Workspace(AlpineObject):
             """
             if role is None:
                 role = Workspace.MemberRole.ProjectMember
-            members = self.get_list(workspace_id)
+            members = self._get_current_list(workspace_id)
             user_info = User(self.base_url, self.session, self.token).get(user_id)
             members.append(user_info)
             member_list = []
@@ -377,7 +423,7 @@ class Workspace(AlpineObject):
             # Check that user exists.
             User(self.base_url, self.session, self.token).get(user_id)
 
-            members = self.get_list(workspace_id)
+            members = self._get_current_list(workspace_id)
             new_members = []
             for member in members:
                 if member['id'] == user_id:
@@ -408,7 +454,7 @@ class Workspace(AlpineObject):
                 >>>                                 new_role = session.workspace.memberRole.DataScientist)
 
             """
-            members = self.get_list(workspace_id)
+            members = self._get_current_list(workspace_id)
             updated_members = []
 
             # Update the membership list
@@ -420,6 +466,27 @@ class Workspace(AlpineObject):
 
             return self.__update(workspace_id, updated_members)
 
+        def _get_current_list(self, workspace_id, per_page=100):
+            """
+            Used internally by add, remove and update to read the member list they post back, from the server and
+            not from the response cache, so that members changed by someone else aren't reverted. Also used by
+            `Workspace.update` to check the new owner.
+
+            :param int workspace_id: ID of the workspace.
+            :param int per_page: Maximum number to fetch with each API call.
+            :return: A list of user data.
+            :rtype: list of dict
+            :exception WorkspaceNotFoundException: The workspace does not exist.
+            """
+            # Check that workspace exists.
+            Workspace(self.base_url, self.session, self.token).get(workspace_id)
+
+            url = "{0}/workspaces/{1}/members".format(self.base_url, workspace_id)
+            url = self._add_token_to_url(url)
+
+            payload = {"per_page": per_page}
+            return self._get_all_pages(url, payload, use_params=False)
+
         def __update(self, workspace_id, members):
             """
             General update member method. Mostly for internal use. Used by add, remove, and update.
@@ -431,9 +498,11 @@ class Workspace(AlpineObject):
             url = "{0}/workspaces/{1}/members".format(self.base_url, workspace_id)
             url = self._add_token_to_url(url)
             payload = {"collection": {}, "members": members}
-            self.session.headers.update({"Content-Type": "application/json"})
-            response = self.session.post(url, data=json.dumps(payload), verify=False)
-            self.session.headers.pop("Content-Type")
+            response = self.session.post(url, data=json.dumps(payload), headers=self._json_headers, verify=False)
+            # Workspace lists scoped to a user depend on membership, the workspace itself counts its members.
+            self._invalidate_id_index("workspace")
+            self._invalidate_cached(("member", "list", str(workspace_id)), ("workspace", str(workspace_id)),
+                                    ("workspace", "list"))
             self.logger.debug("Received response code {0} with reason {1}...".
                               format(response.status_code, response.reason))
 
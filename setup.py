@@ -40,6 +40,7 @@ if sys.version_info <= (2, 6):
 install_requires = [
     'requests >= 2.13.0',
     'pytz',
+    'futures; python_version < "3.0"',
     ]
 
 def readme():
@@ -65,6 +66,9 @@ setup(
     },
 
     install_requires=install_requires,
+    extras_require={
+        'async': ['aiohttp >= 3.3'],
+    },
 
     license="MIT License",
     platforms="Linux; MacOS X; Windows",
@@ -0,0 +1,48 @@
+import asyncio
+import unittest
+
+from alpine import APIClient
+from alpine.exception import *
+try:
+    from alpine.asyncclient import AsyncAPIClient
+except ImportError:
+    # aiohttp is not installed.
+    AsyncAPIClient = None
+
+from ..alpineunittest import AlpineTestCase
+
+
+@unittest.skipIf(AsyncAPIClient is None, "aiohttp is not installed")
+class TestAsyncAPIClient(AlpineTestCase):
+
+    def setUp(self):
+        super(TestAsyncAPIClient, self).setUp()
+        # Creating Alpine Client in setUp Function for tests
+        global alpine_client
+        global login_info
+        alpine_client = APIClient(self.host, self.port)
+        login_info = alpine_client.login(self.username, self.password)
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_login(self):
+        async def login():
+            async with AsyncAPIClient(self.host, self.port, self.username, self.password) as async_client:
+                return async_client.user_id
+        self.assertEqual(self.run_async(login()), login_info['id'])
+
+    def test_get_users_list(self):
+        async def get_list():
+            async with AsyncAPIClient(self.host, self.port, self.username, self.password) as async_client:
+                return await async_client.user.get_list(per_page=10)
+        self.assertEqual(self.run_async(get_list()), alpine_client.user.get_list(per_page=10))
+
+    def test_get_workspace_id(self):
+        workspace_list = alpine_client.workspace.get_list()
+
+        async def get_ids():
+            async with AsyncAPIClient(self.host, self.port, self.username, self.password) as async_client:
+                return await asyncio.gather(*[async_client.workspace.get_id(workspace['name'])
+                                              for workspace in workspace_list])
+        self.assertEqual(self.run_async(get_ids()), [workspace['id'] for workspace in workspace_list])
@@ -33,6 +33,13 @@ class TestAlpine(AlpineTestCase):
         chorus_version_string = alpine_client.get_version()
         self.assertRegexpMatches(chorus_version_string, self.regex_alpine_version_string)
 
+    def test_get_version_cached(self):
+        cached_client = APIClient(self.host, self.port, response_cache_ttl=60)
+        cached_client.login(self.username, self.password)
+        chorus_version_string = cached_client.get_version()
+        self.assertEqual(cached_client.get_version(), chorus_version_string)
+        self.assertEqual(cached_client.get_cache_stats()['response_cache']['hits'], 1)
+
     def test_get_license_info(self):
         chorus_license_info = alpine_client.get_license()
         self.assertEqual(chorus_license_info['limit_api'], False)
@@ -41,6 +48,22 @@ class TestAlpine(AlpineTestCase):
         self.assertEqual(chorus_license_info['correct_mac_address'], True)
         self.assertRegexpMatches(chorus_license_info['version'], self.regex_alpine_version_string)
 
+    def test_get_connection_stats(self):
+        pooled_client = APIClient(self.host, self.port, pool_maxsize=4)
+        pooled_client.login(self.username, self.password)
+        for i in range(0, 5):
+            pooled_client.get_version()
+        connection_stats = pooled_client.get_connection_stats()
+        self.assertEqual(connection_stats['requests'], 6)
+        self.assertGreater(connection_stats['reused'], 0)
+
+    def test_login_warm_connections(self):
+        warm_client = APIClient(self.host, self.port, pool_maxsize=4, warm_connections=4)
+        warm_client.login(self.username, self.password)
+        self.assertEqual(warm_client.get_connection_stats()['connections'], 4)
+        self.assertEqual(warm_client.warm_up(8), 4)
+        self.assertEqual(warm_client.get_connection_stats()['connections'], 4)
+
     def test_setup_logging(self):
         alpine_client._setup_logging()
         alpine_client.logger.info("Info")
@@ -0,0 +1,13 @@
+import sys
+import unittest
+
+if sys.version_info >= (3, 7):
+    # The tests use async syntax and asyncio.run. They live in a directory that isn't a package, which the test
+    # loader doesn't scan, so that older Pythons don't even compile them.
+    from .async_cases.asyncclient import TestAsyncAPIClient
+else:
+    @unittest.skip("The async client tests need Python 3.7 or above")
+    class TestAsyncAPIClient(unittest.TestCase):
+
+        def test_async_client(self):
+            pass
@@ -89,3 +89,15 @@ class TestUser(AlpineTestCase):
         self.assertIsNotNone(users_list1)
         self.assertEqual(users_list1, users_list2)
 
+    def test_get_users_list_serial_pages(self):
+        serial_client = APIClient(self.host, self.port, max_page_workers=1)
+        serial_client.login(self.username, self.password)
+        users_list1 = serial_client.user.get_list(per_page=1)
+        users_list2 = alpine_client.user.get_list(per_page=1)
+        self.assertEqual(users_list1, users_list2)
+
+    def test_iter_users_list(self):
+        users_list = alpine_client.user.get_list(per_page=10)
+        users_iter = alpine_client.user.iter_list(per_page=1)
+        self.assertEqual(users_list, list(users_iter))
+
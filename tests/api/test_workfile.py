@@ -1,10 +1,16 @@
+import json
 import os
+import shutil
+import tempfile
 import time
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
 
 from alpine import APIClient
 from alpine.exception import *
 from alpine.workfile import *
 from alpine.datasource import DataSource
+from alpine.flowresult import stream_flow_result
 
 
 from .alpineunittest import AlpineTestCase
@@ -115,6 +121,15 @@ class TestWorkfile(AlpineTestCase):
         self.assertIsNotNone(get_id)
         self.assertEqual(workfile_id, get_id)
 
+    def test_download_workfile_to_workflow(self):
+        download_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(download_dir, "workflow.afm")
+            self.assertRaises(WorkfileNotFoundException, alpine_client.workfile.download_to, workfile_id, path)
+            self.assertEqual(os.listdir(download_dir), [])
+        finally:
+            shutil.rmtree(download_dir)
+
     def test_run_workflow(self):
         variables = [{"name": "@min_credit_line", "value": "7"}]
         workfile_id = alpine_client.workfile.get_id(workfile_name, workspace_id)
@@ -127,6 +142,77 @@ class TestWorkfile(AlpineTestCase):
         process_id = alpine_client.workfile.process.run(workfile_id, variables)
         alpine_client.workfile.process.wait_until_finished(workfile_id, process_id)
 
+    def test_wait_until_finished_from_run_history(self):
+        variables = [{"name": "@min_credit_line", "value": "7"}]
+        workfile_id = alpine_client.workfile.get_id(workfile_name, workspace_id)
+        process_id = alpine_client.workfile.process.run(workfile_id, variables)
+        first_status = alpine_client.workfile.process.wait_until_finished(workfile_id, process_id)
+        self.assertIsNotNone(alpine_client.session.run_history.expected_duration(workfile_id))
+        process_id = alpine_client.workfile.process.run(workfile_id, variables)
+        second_status = alpine_client.workfile.process.wait_until_finished(workfile_id, process_id)
+        self.assertEqual(first_status, second_status)
+
+    def test_wait_all_workflows(self):
+        group = alpine_client.workfile.process.group()
+        for min_credit_line in range(5, 9):
+            group.run(workfile_id, [{"name": "@min_credit_line", "value": str(min_credit_line)}])
+        completed = list(group.as_completed(timeout=600))
+        self.assertEqual(len(completed), 4)
+        self.assertEqual(set(process for _, process, _ in completed),
+                         set(process_id for _, process_id in group.processes))
+        for _, process_id, status in completed:
+            self.assertEqual(status, "FINISHED")
+
+    def test_wait_all_workflows_timeout(self):
+        variables = [{"name": "@min_credit_line", "value": "7"}]
+        process_id = alpine_client.workfile.process.run(workfile_id, variables)
+        self.assertRaises(RunFlowTimeoutException, alpine_client.workfile.process.wait_all,
+                          [(workfile_id, process_id)], timeout=0)
+
+    def test_run_workflow_async(self):
+        variables = [{"name": "@min_credit_line", "value": "7"}]
+        done_process_ids = []
+        futures = [alpine_client.workfile.process.run_async(workfile_id, variables) for i in range(0, 3)]
+        for future in futures:
+            future.add_done_callback(lambda f: done_process_ids.append(f.process_id))
+        for future in futures:
+            flow_results = future.result(timeout=600)
+            self.assertIn('flowMetaInfo', flow_results)
+        self.assertEqual(set(done_process_ids), set(future.process_id for future in futures))
+
+    def test_run_workflow_async_cancel(self):
+        variables = [{"name": "@min_credit_line", "value": "7"}]
+        future = alpine_client.workfile.process.run_async(workfile_id, variables)
+        self.assertTrue(future.cancel())
+        self.assertTrue(future.cancelled())
+
+    def test_sweep_workflow_variables(self):
+        rows = alpine_client.workfile.process.sweep(workfile_id, grid={"@min_credit_line": [5, 6, 7],
+                                                                       "@outlook": ["'sunny'", "'rain'"]},
+                                                    operators=["Row Filter"], max_concurrent=3, timeout=600)
+        self.assertEqual(len(rows), 6)
+        self.assertEqual([row["@min_credit_line"] for row in rows], ["5", "5", "6", "6", "7", "7"])
+        for row in rows:
+            self.assertIsNone(row["error"])
+            self.assertIsNotNone(row["process_id"])
+            self.assertIn("status", row["flowMetaInfo"])
+
+    def test_run_workflow_graph(self):
+        graph = alpine_client.workfile.process.graph(max_parallel=2)
+        graph.add("first", workfile_id, variables={"@min_credit_line": 5})
+        graph.add("second", workfile_id, variables={"@min_credit_line": 6})
+        graph.add("last", workfile_id, depends_on=["first", "second"],
+                  variables=lambda results: {"@min_credit_line": 7})
+        report = graph.run(timeout=600)
+        self.assertEqual(report['status'], "SUCCESS")
+        self.assertEqual(report['critical_path'][-1], "last")
+        self.assertGreaterEqual(report['nodes']['last']['start'],
+                                max(report['nodes']['first']['end'], report['nodes']['second']['end']))
+
+    def test_workflow_graph_unknown_dependency(self):
+        graph = alpine_client.workfile.process.graph()
+        self.assertRaises(WorkflowGraphException, graph.add, "last", workfile_id, depends_on=["first"])
+
     def test_query_workflow_status(self):
         valid_workfile_status = ["WORKING", "FINISHED"]
         variables = [{"name": "@min_credit_line", "value": "7"}]
@@ -153,6 +239,68 @@ class TestWorkfile(AlpineTestCase):
             workfile_status = alpine_client.workfile.process.query_status(process_id)
         response = alpine_client.workfile.process.download_results(workfile_id, process_id)
 
+    def test_download_workflow_results_lazy(self):
+        variables = [{"name": "@min_credit_line", "value": "7"}]
+        process_id = alpine_client.workfile.process.run(workfile_id, variables)
+        alpine_client.workfile.process.wait_until_finished(workfile_id, process_id)
+        flow_results = alpine_client.workfile.process.download_results(workfile_id, process_id)
+        lazy_flow_results = alpine_client.workfile.process.download_results(workfile_id, process_id, lazy=True)
+        self.assertEqual(alpine_client.workfile.process.get_metadata(lazy_flow_results),
+                         alpine_client.workfile.process.get_metadata(flow_results))
+        for operator_name in lazy_flow_results.operator_names():
+            self.assertEqual(alpine_client.workfile.process.find_operator(operator_name, lazy_flow_results),
+                             alpine_client.workfile.process.find_operator(operator_name, flow_results))
+        self.assertEqual(lazy_flow_results.to_dict(), flow_results)
+        self.assertEqual(dict(lazy_flow_results), flow_results)
+
+    def test_download_workflow_results_cached(self):
+        results_cache_dir = tempfile.mkdtemp()
+        try:
+            cached_client = APIClient(self.host, self.port, results_cache_dir=results_cache_dir)
+            cached_client.login(self.username, self.password)
+            variables = [{"name": "@min_credit_line", "value": "7"}]
+            process_id = cached_client.workfile.process.run(workfile_id, variables)
+            cached_client.workfile.process.wait_until_finished(workfile_id, process_id)
+            flow_results = cached_client.workfile.process.download_results(workfile_id, process_id)
+            self.assertEqual(cached_client.workfile.process.download_results(workfile_id, process_id), flow_results)
+            self.assertEqual(cached_client.get_cache_stats()['results_cache']['hits'], 1)
+        finally:
+            shutil.rmtree(results_cache_dir)
+
+    def test_stream_workflow_results(self):
+        variables = [{"name": "@min_credit_line", "value": "7"}]
+        process_id = alpine_client.workfile.process.run(workfile_id, variables)
+        alpine_client.workfile.process.wait_until_finished(workfile_id, process_id)
+        flow_results = alpine_client.workfile.process.download_results(workfile_id, process_id, lazy=True)
+        operator_name = flow_results.operator_names()[-1]
+        streamed_results = alpine_client.workfile.process.stream_results(workfile_id, process_id,
+                                                                         operator_names=[operator_name])
+        self.assertEqual(alpine_client.workfile.process.get_metadata(streamed_results),
+                         alpine_client.workfile.process.get_metadata(flow_results))
+        self.assertEqual(alpine_client.workfile.process.find_operator(operator_name, streamed_results),
+                         alpine_client.workfile.process.find_operator(operator_name, flow_results))
+
+    def test_run_workflow_memoized(self):
+        variables = [{"name": "@min_credit_line", "value": "7"}]
+        process_id = alpine_client.workfile.process.run(workfile_id, variables, memoize=True)
+        alpine_client.workfile.process.wait_until_finished(workfile_id, process_id)
+        self.assertEqual(alpine_client.workfile.process.run(workfile_id, variables, memoize=True), process_id)
+        other_variables = [{"name": "@min_credit_line", "value": "8"}]
+        other_process_id = alpine_client.workfile.process.run(workfile_id, other_variables, memoize=True)
+        self.assertNotEqual(other_process_id, process_id)
+        alpine_client.workfile.process.wait_until_finished(workfile_id, other_process_id)
+
+    def test_run_workflow_coalesced(self):
+        variables = [{"name": "@min_credit_line", "value": "7"}]
+        with ThreadPoolExecutor(4) as executor:
+            process_ids = list(executor.map(lambda i: alpine_client.workfile.process.run(workfile_id, variables,
+                                                                                        coalesce=True), range(4)))
+        self.assertEqual(len(set(process_ids)), 1)
+        alpine_client.workfile.process.wait_until_finished(workfile_id, process_ids[0])
+        next_process_id = alpine_client.workfile.process.run(workfile_id, variables, coalesce=True)
+        self.assertNotEqual(next_process_id, process_ids[0])
+        alpine_client.workfile.process.wait_until_finished(workfile_id, next_process_id)
+
     def test_stop_workflow(self):
         variables = [{"name": "@min_credit_line", "value": "7"}]
         workfile_id = alpine_client.workfile.get_id(workfile_name, workspace_id)
@@ -198,3 +346,91 @@ class TestWorkfile(AlpineTestCase):
                             "database_id": database_id}]
         workfile_info = alpine_client.workfile.upload(workspace_id, afm_path, datasource_info)
         self.assertEqual(workfile_info['file_name'], "db_bat_row_fil")
+
+    def test_upload_db_afm_progress(self):
+        base_dir = os.getcwd()
+        afm_path = "{0}/data/afm/db_bat_row_fil.afm".format(base_dir)
+        try:
+            workfile_id = alpine_client.workfile.get_id("db_bat_row_fil", workspace_id)
+            alpine_client.workfile.delete(workfile_id)
+        except WorkfileNotFoundException:
+            pass
+
+        datasource_info = [{"data_source_type": alpine_client.datasource.dsType.GreenplumDatabase,
+                            "data_source_id": db_datasource_id,
+                            "database_id": database_id}]
+        progress = []
+        workfile_info = alpine_client.workfile.upload(workspace_id, afm_path, datasource_info,
+                                                      progress=lambda sent, total: progress.append((sent, total)))
+        self.assertEqual(workfile_info['file_name'], "db_bat_row_fil")
+        self.assertGreater(progress[-1][1], os.path.getsize(afm_path))
+        self.assertEqual(progress[-1][0], progress[-1][1])
+
+    def test_upload_many_afm(self):
+        base_dir = os.getcwd()
+        afm_path = "{0}/data/afm/db_bat_row_fil.afm".format(base_dir)
+        missing_afm_path = "{0}/data/afm/missing.afm".format(base_dir)
+        try:
+            workfile_id = alpine_client.workfile.get_id("db_bat_row_fil", workspace_id)
+            alpine_client.workfile.delete(workfile_id)
+        except WorkfileNotFoundException:
+            pass
+
+        datasource_info = [{"data_source_type": alpine_client.datasource.dsType.GreenplumDatabase,
+                            "data_source_id": db_datasource_id,
+                            "database_id": database_id}]
+        results = alpine_client.workfile.upload_many([(workspace_id, afm_path, datasource_info),
+                                                      (workspace_id, missing_afm_path, datasource_info)])
+        self.assertEqual(results[0]['workfile']['file_name'], "db_bat_row_fil")
+        self.assertIsNone(results[0]['error'])
+        self.assertIsNone(results[1]['workfile'])
+        self.assertIsNotNone(results[1]['error'])
+
+    def test_upload_db_afm_skip_unchanged(self):
+        base_dir = os.getcwd()
+        afm_path = "{0}/data/afm/db_bat_row_fil.afm".format(base_dir)
+        try:
+            workfile_id = alpine_client.workfile.get_id("db_bat_row_fil", workspace_id)
+            alpine_client.workfile.delete(workfile_id)
+        except WorkfileNotFoundException:
+            pass
+
+        datasource_info = [{"data_source_type": alpine_client.datasource.dsType.GreenplumDatabase,
+                            "data_source_id": db_datasource_id,
+                            "database_id": database_id}]
+        workfile_info = alpine_client.workfile.upload(workspace_id, afm_path, datasource_info, skip_unchanged=True)
+        results = alpine_client.workfile.upload_many([(workspace_id, afm_path, datasource_info)], skip_unchanged=True)
+        self.assertTrue(results[0]['skipped'])
+        self.assertEqual(results[0]['workfile']['id'], workfile_info['id'])
+
+    def test_upload_afm_unknown_data_source_type(self):
+        base_dir = os.getcwd()
+        afm_path = "{0}/data/afm/db_bat_row_fil.afm".format(base_dir)
+        datasource_info = [{"data_source_type": alpine_client.datasource.dsType.GreenplumDatabase,
+                            "data_source_id": db_datasource_id,
+                            "database_id": database_id},
+                           {"data_source_type": "unknown_data_source", "data_source_id": db_datasource_id}]
+        self.assertRaises(DataSourceTypeNotFoundException,
+                          alpine_client.workfile.upload, workspace_id, afm_path, datasource_info)
+        results = alpine_client.workfile.upload_many([(workspace_id, afm_path, datasource_info)])
+        self.assertIsNone(results[0]['workfile'])
+        self.assertIn("unknown_data_source", results[0]['error'])
+
+
+class TestStreamFlowResult(TestCase):
+
+    def test_stream_large_output_in_small_chunks(self):
+        # An 8 MB string output received 8 KB at a time, read in linear time.
+        visual_data = '{"column": "value \\"quoted\\" [1, 2]"}, ' * (8 * 1024 * 1024 // 40)
+        flow_results = {"flowMetaInfo": {"status": "SUCCESS"},
+                        "outputs": [{"out_title": "Large", "visualData": visual_data},
+                                    {"out_title": "Small", "visualData": [1, 2]}]}
+        body = json.dumps(json.dumps(flow_results)).encode("utf-8")
+        chunks = [body[start:start + 8192] for start in range(0, len(body), 8192)]
+        for operator_name in ("Small", "Large"):
+            start = time.time()
+            streamed_results = stream_flow_result(chunks, operator_names=[operator_name])
+            self.assertLess(time.time() - start, 10)
+            self.assertEqual(streamed_results['flowMetaInfo'], flow_results['flowMetaInfo'])
+            self.assertEqual(streamed_results['outputs'],
+                             [output for output in flow_results['outputs'] if output['out_title'] == operator_name])
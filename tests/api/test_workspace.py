@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from alpine import APIClient
 from alpine.exception import *
 from alpine.workspace import *
@@ -198,6 +200,41 @@ class TestWorkspace(AlpineTestCase):
         self.assertEqual(workspace_info['name'], test_workspace_name_new)
         alpine_client.workspace.delete(workspace_info['id'])
 
+    def test_update_workspace_details_cached(self):
+        cached_client = APIClient(self.host, self.port, response_cache_ttl=600)
+        cached_client.login(self.username, self.password)
+        try:
+            workspace_id = cached_client.workspace.get_id("test_workspace6")
+            cached_client.workspace.delete(workspace_id)
+        except WorkspaceNotFoundException:
+            pass
+        workspace_info = cached_client.workspace.create(workspace_name="test_workspace6", summary="Summary")
+        cached_client.workspace.get(workspace_info['id'])
+        cached_client.workspace.update(workspace_info['id'], summary="New Summary")
+        self.assertEqual(cached_client.workspace.get(workspace_info['id'])['summary'], "New Summary")
+        member_count = len(cached_client.workspace.member.get_list(workspace_info['id']))
+        user_id = cached_client.user.create("apitest6", "password", "test6", "test6", "apitest6@alpinenow.com")['id']
+        cached_client.workspace.member.add(workspace_info['id'], user_id)
+        self.assertEqual(len(cached_client.workspace.member.get_list(workspace_info['id'])), member_count + 1)
+        cached_client.user.delete(user_id)
+        cached_client.workspace.delete(workspace_info['id'])
+
+    def test_get_workspace_id_after_rename(self):
+        test_workspace_name = "test_workspace5"
+        test_workspace_name_new = "test_workspace5_new"
+        for name in [test_workspace_name, test_workspace_name_new]:
+            try:
+                workspace_id = alpine_client.workspace.get_id(name)
+                alpine_client.workspace.delete(workspace_id)
+            except WorkspaceNotFoundException:
+                pass
+        workspace_info = alpine_client.workspace.create(workspace_name=test_workspace_name)
+        self.assertEqual(alpine_client.workspace.get_id(test_workspace_name), workspace_info['id'])
+        alpine_client.workspace.update(workspace_info['id'], name=test_workspace_name_new)
+        self.assertEqual(alpine_client.workspace.get_id(test_workspace_name_new), workspace_info['id'])
+        self.assertRaises(WorkspaceNotFoundException, alpine_client.workspace.get_id, test_workspace_name)
+        alpine_client.workspace.delete(workspace_info['id'])
+
     def test_update_workspace_owner(self):
         test_workspace_name = "test_workspace0"
         new_user = "new_user1"
@@ -297,3 +334,9 @@ class TestWorkspace(AlpineTestCase):
             self.fail("Failed to Delete the alpine_client.workspace {0}".format(test_workspace_name))
         alpine_client.workspace.delete(workspace_info['id'])
 
+    def test_get_workspace_details_from_threads(self):
+        workspace_list = alpine_client.workspace.get_list()
+        workspace_ids = [workspace['id'] for workspace in workspace_list]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            workspace_details = list(executor.map(alpine_client.workspace.get, workspace_ids))
+        self.assertEqual([workspace['id'] for workspace in workspace_details], workspace_ids)